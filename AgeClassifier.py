@@ -0,0 +1,264 @@
+# ----------------------------------------------------------------------------------
+# A .py script that tells aged (recycled) SRAM chips from fresh ones by the
+# block statistics of their power-up state.
+#
+# Every read becomes one feature vector: the average of all block averages
+# and the standard deviation of the block averages, for every grid size from
+# 2x2 to 20x20 blocks (38 features), the same numbers FixedBlockStats.py
+# writes into TRAINING_DATA (at full precision, with the chip they were read
+# from, in '<label>Features.json').
+#
+# The classifier is a Gaussian likelihood ratio: each feature of each class
+# is fitted with norm.fit, and a read is scored with
+#     sum over features of log N(feature | Aged) - log N(feature | Fresh)
+# A score above the threshold (0 by default) means Aged. Scoring is a single
+# array expression over the whole (reads, features) matrix.
+#
+# Usage:
+#   python AgeClassifier.py train [--training-dir TRAINING_DATA] [--aged INPUT ...] [--fresh INPUT ...] [--model AgeModel.json] [--chip 8kB]
+#   python AgeClassifier.py score INPUT [...] [--model AgeModel.json] [--output AgeScores.csv]
+#
+# Training uses every '<label>Features.json' found under the training
+# directory, plus any dumps, campaign directories or packed .bscd files given
+# with --aged / --fresh. Scoring accepts the same kinds of input. Each class
+# needs at least 2 training reads; a flat TRAINING_DATA directory only holds
+# the last dump of each label, so make it with 'FixedBlockStats.py batch',
+# which gives every dump its own directory.
+#
+# This script defaults to a memory device of size 8kB; pass --chip to train
+# for the others (see ChipProfile.py). Training data of another chip is
+# refused. The model remembers its chip, so scoring always uses the geometry
+# it was trained on.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import argparse
+import csv
+import json
+import os
+import numpy as np
+from DumpLoader import load_dump
+from BlockEngine import GRID_SIZES, block_means, block_summary
+from CampaignPack import load_words, count_reads, campaign_profile
+from ChipProfile import DEFAULT_PROFILE, PROFILES, get_profile
+from Instrument import add_profile_option, run_main
+
+CLASSES = ['Aged', 'Fresh']
+MODEL_FILE = 'AgeModel.json'
+
+# Reads turned into features at a time
+CHUNK_READS = 256
+
+# Floor on a fitted standard deviation, so a feature that never varied in training cannot dominate the score
+MIN_SIGMA = 1e-4
+
+
+def feature_names(grid_sizes=GRID_SIZES):
+    names = []
+    for x in grid_sizes:
+        names += ['Average '+str(x*x)+' Blocks', 'Standard Deviation '+str(x*x)+' Blocks']
+    return names
+
+
+# Feature matrix of a (N, 65536) stack of bits: per read, the average and standard deviation of the block averages for every grid size
+def block_features(bits, grid_sizes=GRID_SIZES, profile=DEFAULT_PROFILE):
+    means = block_means(bits, grid_sizes, profile.width, profile.height)
+    columns = []
+    for x in grid_sizes:
+        avgtotal, stddev = block_summary(means[x])
+        columns += [avgtotal, stddev]
+    return np.stack(columns, axis=1)
+
+
+# Feature matrix of one input: a single dump (.csv file) or every read of a campaign directory / packed .bscd file
+def input_features(input_file, profile=DEFAULT_PROFILE):
+    if os.path.isfile(input_file) and input_file.endswith('.csv'):
+        dump = load_dump(input_file, profile.width, profile.height, profile.word_size)
+        return block_features(dump.bits.reshape(1, -1), profile=profile)
+
+    # If directory doesn't exist, throw error
+    if not os.path.exists(input_file):
+        raise FileNotFoundError("This file or directory does not exist.")
+
+    # A packed file must hold reads of the chip the model is for
+    packed_profile = campaign_profile(input_file, profile)
+    if (packed_profile.width, packed_profile.height) != (profile.width, profile.height):
+        raise ValueError(input_file+" holds "+packed_profile.name+" reads, expected "+profile.name+".")
+
+    words = load_words(input_file, count_reads(input_file), profile=profile)
+    if words.shape[0] == 0:
+        raise FileNotFoundError("No reads found in "+input_file+".")
+
+    # Unpacked a chunk of reads at a time, so memory stays bounded for long campaigns
+    features = []
+    for start in range(0, words.shape[0], CHUNK_READS):
+        features.append(block_features(np.unpackbits(np.asarray(words[start:start + CHUNK_READS]), axis=1), profile=profile))
+    return np.concatenate(features)
+
+
+# Feature rows found in a FixedBlockStats.py output directory tree, as {label: (N, features) array}.
+# Every directory holding a '<label>Features.json' gives one row, which must come from the chip the model is for.
+def load_training_data(training_dir='TRAINING_DATA', grid_sizes=GRID_SIZES, profile=DEFAULT_PROFILE):
+    profile = get_profile(profile)
+    rows = {}
+    for dirpath, dirnames, filenames in sorted(os.walk(training_dir)):
+        for label in CLASSES:
+            name = label+'Features.json'
+            if name not in filenames:
+                # Older FixedBlockStats.py runs left only the rounded .csv files, with no chip
+                if label+'Stats'+str(grid_sizes[0]**2)+'Blocks.csv' in filenames:
+                    raise ValueError(dirpath+" has no "+name+". Run FixedBlockStats.py on its dump again.")
+                continue
+
+            with open(os.path.join(dirpath, name), 'r') as f:
+                data = json.load(f)
+            if data['chip'] != profile.name:
+                raise ValueError(os.path.join(dirpath, name)+" holds "+data['chip']+" reads, expected "+profile.name+".")
+            if data['grid_sizes'] != list(grid_sizes):
+                raise ValueError(os.path.join(dirpath, name)+" has other grid sizes than the model.")
+            rows.setdefault(label, []).append(data['features'])
+
+    return {label: np.array(rows[label]) for label in rows}
+
+
+# Gaussian likelihood-ratio model fitted to labelled feature matrices
+class AgeModel:
+    def __init__(self, mu, sigma, threshold=0.0, names=None, profile=DEFAULT_PROFILE):
+        self.mu = np.asarray(mu, dtype=float)           # (2, features): Aged row, Fresh row
+        self.sigma = np.asarray(sigma, dtype=float)
+        self.threshold = threshold
+        self.names = names if names is not None else feature_names()
+        self.profile = get_profile(profile)
+
+    # Fits every feature of each class with norm.fit. 'features' is {label: (N, features) array}, with N >= 2 per class.
+    @classmethod
+    def fit(cls, features, threshold=0.0, profile=DEFAULT_PROFILE):
+        for label in CLASSES:
+            if label not in features or len(features[label]) == 0:
+                raise ValueError("No '"+label+"' training data.")
+            if len(features[label]) < 2:
+                raise ValueError("Only 1 '"+label+"' training read; at least 2 are needed to fit its spread.")
+
+        # scipy is only needed for training, so it is not loaded until a model is fitted
+        from scipy.stats import norm
+
+        mu = np.zeros((len(CLASSES), features[CLASSES[0]].shape[1]))
+        sigma = np.zeros_like(mu)
+        for c, label in enumerate(CLASSES):
+            for f in range(mu.shape[1]):
+                mu[c, f], sigma[c, f] = norm.fit(features[label][:, f])
+        return cls(mu, np.maximum(sigma, MIN_SIGMA), threshold, profile=profile)
+
+    # Log-likelihood ratio (Aged over Fresh) of every row of a (N, features) matrix
+    def score(self, features):
+        z = (np.asarray(features, dtype=float)[:, None, :] - self.mu) / self.sigma
+        log_likelihood = -0.5 * (z * z).sum(axis=2) - np.log(self.sigma).sum(axis=1)
+        return log_likelihood[:, 0] - log_likelihood[:, 1]
+
+    # 'Aged' or 'Fresh' for every row
+    def classify(self, features):
+        return np.where(self.score(features) > self.threshold, CLASSES[0], CLASSES[1])
+
+    def save(self, filename=MODEL_FILE):
+        with open(filename, 'w') as f:
+            json.dump({'classes': CLASSES, 'chip': self.profile.name, 'features': self.names, 'threshold': self.threshold,
+                       'mu': self.mu.tolist(), 'sigma': self.sigma.tolist()}, f, indent=1)
+
+    @classmethod
+    def load(cls, filename=MODEL_FILE):
+        # If model doesn't exist, throw error
+        if not os.path.exists(filename):
+            raise FileNotFoundError("Model "+filename+" does not exist. Run 'train' first.")
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        return cls(data['mu'], data['sigma'], data['threshold'], data['features'], data.get('chip', DEFAULT_PROFILE.name))
+
+
+# Fits a model to the training directory and the labelled inputs, and saves it. Returns the model and the number of rows per class.
+def train(training_dir='TRAINING_DATA', aged=(), fresh=(), model_file=MODEL_FILE, threshold=0.0, profile=DEFAULT_PROFILE):
+    profile = get_profile(profile)
+    features = {}
+    if os.path.exists(training_dir):
+        features = load_training_data(training_dir, profile=profile)
+    for label, inputs in zip(CLASSES, [aged, fresh]):
+        rows = [input_features(input_file, profile) for input_file in inputs]
+        if label in features:
+            rows.insert(0, features[label])
+        if rows:
+            features[label] = np.concatenate(rows)
+
+    model = AgeModel.fit(features, threshold, profile)
+    model.save(model_file)
+    return model, {label: len(features[label]) for label in CLASSES}
+
+
+def write_scores_csv(filename, results):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['Input', 'Read', 'Score', 'Class'])
+
+        # Loop through data and write each row
+        for input_file, scores, classes in results:
+            for i, (score, label) in enumerate(zip(scores.tolist(), classes.tolist()), 1):
+                csvwriter.writerow([input_file, i, '{:.4f}'.format(score), label])
+
+
+# Scores every read of every input with a saved model and writes the scores. Returns [(input, scores, classes)].
+def score(inputs, model_file=MODEL_FILE, output_file='AgeScores.csv'):
+    model = AgeModel.load(model_file)
+    results = []
+    for input_file in inputs:
+        features = input_features(input_file, model.profile)
+        scores = model.score(features)
+        results.append((input_file, scores, np.where(scores > model.threshold, CLASSES[0], CLASSES[1])))
+
+    write_scores_csv(output_file, results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aged vs fresh classification from block statistics.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help="fit a model to labelled data")
+    train_parser.add_argument('--training-dir', default='TRAINING_DATA', help="FixedBlockStats.py output tree (default TRAINING_DATA)")
+    train_parser.add_argument('--aged', nargs='+', default=[], metavar='INPUT', help="dumps / campaigns of aged chips")
+    train_parser.add_argument('--fresh', nargs='+', default=[], metavar='INPUT', help="dumps / campaigns of fresh chips")
+    train_parser.add_argument('--threshold', type=float, default=0.0, help="score above which a read is Aged (default 0)")
+    train_parser.add_argument('--model', default=MODEL_FILE)
+    train_parser.add_argument('--chip', choices=list(PROFILES), default=DEFAULT_PROFILE.name, help="chip the training dumps were read from")
+
+    score_parser = subparsers.add_parser('score', help="score dumps / campaigns with a fitted model")
+    score_parser.add_argument('inputs', nargs='+', metavar='INPUT', help="dump file, campaign directory or packed .bscd file")
+    score_parser.add_argument('--model', default=MODEL_FILE)
+    score_parser.add_argument('--output', default='AgeScores.csv', help="scores file to write (default AgeScores.csv)")
+
+    # --report / --profile are handled by run_main; accept them before or after the subcommand
+    for p in (parser, train_parser, score_parser):
+        add_profile_option(p)
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'train':
+            model, counts = train(args.training_dir, args.aged, args.fresh, args.model, args.threshold, args.chip)
+            print("Model fitted to "+str(counts['Aged'])+" aged and "+str(counts['Fresh'])+" fresh reads, saved as "+args.model)
+        else:
+            for input_file, scores, classes in score(args.inputs, args.model, args.output):
+                print(input_file+": "+str(int((classes == 'Aged').sum()))+" of "+str(len(classes))+" reads Aged")
+            print("Scores written to "+args.output)
+
+    # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'AgeClassifier')
@@ -1,178 +1,215 @@
-# ----------------------------------------------------------------------------------
-# A .py script that takes one .csv file deliminated into
-# "Address,Word" format, splits the bit data into equal and even 
-# square-shaped divisions as cleanly as possible, and determines the average
-# incidence of 1s in each division, the average of all averages, and the 
-# standard deviation of the averages. This statistics are therein dumped
-# into .csv files of their own.
-#
-# This script is currently configured for a memory device of size 8kB.
-# It is intended to be used after "PreProcess.py".
-#
-# The program will create a directory under the working directory,
-# titled 'TRAINING_DATA', and store the file into it. If this directory already
-# exists, it will just store the file into the existing directory.
-#
-# Author : Gaines Odom
-# Email : gaines.a.odom@gmail.com
-# Inst. : Auburn University
-# Advisor : Dr. Ujjwal Guin
-#
-# Created On : 08/24/2023
-# Last Edited On: 08/28/2023
-# ----------------------------------------------------------------------------------
-import statistics
-import csv
-import os
-import math
-
-FIRST_BANDING_LIMITER = 16384
-LAST_BANDING_LIMITER = 49150
-
-
-def pre_processing(bitlist) :
-    blist = []
-    inverter = {1:0, 0:1}
-
-    # Invert banded section
-    for i in range(len(bitlist)) :
-        if i < FIRST_BANDING_LIMITER or i > LAST_BANDING_LIMITER:
-            blist.append(bitlist[i])
-        else :
-            blist.append(inverter[bitlist[i]])
-
-    return blist
-
-def write_to_csv(filename, avglist, numblocks):
-    # Open the CSV file for writing
-    with open(filename, 'w', newline='') as csvfile:
-        csvwriter = csv.writer(csvfile)
-
-        # Write the header row
-        csvwriter.writerow(['NumBlocks', 'Average'])
-        
-        # Loop through data and write each row
-        for i in range (len(avglist)) : 
-            csvwriter.writerow([str(numblocks[i]), '{:.4f}'.format(avglist[i])])
-
-# .csv Decoding function. Takes .csv files of the format "Address,Word" and returns int list of addresses and int list of binary values.
-def read_csv(filename):
-    addresses = []
-    bit_list = []
-    bits = []
-    with open(filename, 'r') as csvfile:
-        csvreader = csv.reader(csvfile)
-        next(csvreader)
-        for row in csvreader:
-            address, byte = row
-            addresses.append(int(address, 16))  # Turns 4 digit hex address into decimal int value list
-            bit_list.append(bin(int(byte, 16))[2:].zfill(8))    # Turns 2 digit hex byte into 8 bit binary string list
-
-    # Create a list of 1-bit strings from 8-bit binary strings        
-    for byte in bit_list:
-        for bit in byte:  
-            bits.append(bit)
-    
-    # Turn 1-bit strings into 1-bit ints
-    bits = [int(bit) for bit in bits]
-
-    return addresses, bits
-
-def calculate_mean_and_dev(bitlist, num_of_blocks) : # num_of_blocks should be a squared product of an int, ex. 4, 9, 16 etc.
-    
-    chunk_size = int(math.sqrt(len(bitlist) // num_of_blocks)) # round down: 65536 // 81 = 809 -> int(sqrt(809)) = 28 -> chunks are 28x28
-    excess_bits = len(bitlist) - (num_of_blocks * chunk_size * chunk_size) # 65536 - (81 * 28 * 28) = 2032
-    row_size = 256 * chunk_size   # 256 * 28 = 7168 (start at addr 0, incrementing by 28, until next row -> addr is 0 + 7168)
-    chunks_per_row = int(math.sqrt(num_of_blocks)) # chunks_per_row = sqrt(81) = 9
-    chunks_per_column = int(math.sqrt(num_of_blocks))
-    x_offset = math.ceil((excess_bits // 511) / 2)   # keeps it off the wall for purposes of evenness. Centremost divisions are used
-    y_offset = x_offset * 256
-
-    chunk_averages = []
-    chunk = []
-
-    for i in range(chunks_per_column):
-        for j in range(chunks_per_row):
-            start_idx = i * row_size + j * chunk_size + x_offset + y_offset
-            for k in range (chunk_size) : 
-                vert_addr  = start_idx + k * 256
-                end_idx = vert_addr + chunk_size
-                chunk.append(bitlist[vert_addr:end_idx])
-            
-            chunk = [item for sublist in chunk for item in sublist]
-
-            average = statistics.mean(chunk)
-            
-            chunk_averages.append(average)
-            chunk.clear()
-
-    avgtotal = statistics.mean(chunk_averages)
-    stddev = statistics.stdev(chunk_averages)
-    
-    return chunk_averages, stddev, avgtotal
-
-def main():
-    try:
-        
-        avglist = []
-        bitlists = []
-        proclists = []
-        numblocks = []
-
-        prevdir = os.getcwd() # Purely for clarity of use
-
-        # Get directory
-        input_dir = input("Enter the input directory: ")
-        one_or_two = input("2 chips? Y/N (N == one chip) ")
-        if (one_or_two == 'Y') :
-            iterations = 201
-        else : 
-            iterations = 101
-        # If directory doesn't exist, throw error
-        if not os.path.exists(input_dir):
-            raise FileNotFoundError("This directory does not exist.")
-        os.chdir(input_dir)
-
-        for i in range(1, iterations) :
-            if not os.path.exists(input_dir+'_'+str(i)+'.csv'):
-                raise FileNotFoundError("File '"+input_dir+"_"+str(i)+".csv' does not exist.")
-            
-            a, b = read_csv(input_dir+'_'+str(i)+'.csv')
-            bitlists.append(b)
-            proclists.append(pre_processing(bitlists[i-1]))            
-
-        os.chdir(prevdir)
-        if not os.path.exists(input_dir+'Stats'):
-            os.mkdir(input_dir+'Stats')
-        os.chdir(input_dir+'Stats')
-
-        for i in range(1,iterations) :
-            
-            for x in range(2,21) :
-                averages, stddev, avgtotal = calculate_mean_and_dev(proclists[i-1], (x*x)) # SET NUMBERS LATER
-                
-                if (i == 1) :
-                    for j in range(x*x) :
-                        numblocks.append(x*x)
-
-                avglist.append(averages)
-            
-            avglist = [item for sublist in avglist for item in sublist]
-
-            filename = input_dir+'_'+str(i)+'AvgList.csv'
-            write_to_csv(filename, avglist, numblocks)
-            
-            avglist.clear()        
-
-        print("All statistics files created and placed in directory "+prevdir+"/"+input_dir+"Stats")
-        
-            # Error Handler
-    except Exception as e:
-        print("An error occurred: {e}")
-
-    # Return to program directory, create training data directory and save training data to it
-    finally:
-        os.chdir(prevdir)    
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+# ----------------------------------------------------------------------------------
+# A .py script that takes one .csv file deliminated into
+# "Address,Word" format, splits the bit data into equal and even 
+# square-shaped divisions as cleanly as possible, and determines the average
+# incidence of 1s in each division, the average of all averages, and the 
+# standard deviation of the averages. This statistics are therein dumped
+# into .csv files of their own.
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py).
+# It is intended to be used after "PreProcess.py".
+#
+# The program will create a directory under the working directory,
+# titled 'TRAINING_DATA', and store the file into it. If this directory already
+# exists, it will just store the file into the existing directory.
+#
+# With --columnar npz (or parquet), the block averages of every read go into
+# one table, '<name>_BlockAverages.npz', at full precision instead (see
+# ColumnarStats.py); add --legacy-csv to keep the per-read files as well.
+#
+# With --follow, the campaign directory is watched while read100.c / read200.c
+# are still writing it, and every --refresh seconds the outputs are brought up
+# to date with the dumps complete so far (only the new reads are processed).
+#
+# Run with no arguments to be prompted for the parameters, or see
+# 'python AvgListMaker.py -h' for the 'run' and 'batch' subcommands.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 08/24/2023
+# Last Edited On: 08/28/2023
+# ----------------------------------------------------------------------------------
+import csv
+import os
+import numpy as np
+from CampaignPack import campaign_name, campaign_profile, chip_labels, follow_reads
+from Streaming import stream_reads
+from BlockEngine import GRID_SIZES
+from ParallelRunner import run_reads
+from Instrument import stage, count, run_main
+from CommandLine import build_parser, add_two_chips_option, add_workers_option, add_force_option, add_band_option, add_chip_option, add_columnar_option, add_follow_option, bands_from_args, profile_from_args, run_batch
+from PreProcess import normalize_bands
+from ChipProfile import DEFAULT_PROFILE
+from StatsCache import StatsManifest, input_hashes
+from ColumnarStats import make_table, concat_tables, table_name, update_table
+
+STATS_VERSION = 1   # Bump whenever a change alters the contents of the output files
+
+
+def write_to_csv(filename, avglist, numblocks):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['NumBlocks', 'Average'])
+        
+        # Loop through data and write each row
+        for i in range (len(avglist)) : 
+            csvwriter.writerow([str(numblocks[i]), '{:.4f}'.format(avglist[i])])
+
+# Name of the output file of read i
+def output_name(name, i):
+    return name+'_'+str(i)+'AvgList.csv'
+
+# Parameters that affect the output files. A change to any of them invalidates every output in the manifest.
+def output_params(bands, profile=DEFAULT_PROFILE):
+    return {'grid_sizes': [GRID_SIZES[0], GRID_SIZES[-1]], 'bands': [list(band) for band in normalize_bands(bands)], 'chip': profile.to_dict(), 'version': STATS_VERSION}
+
+# Worker: computes the block averages of reads first..last and writes their AvgList files into output_dir.
+# With columnar set, the averages are also sent back as table rows (one per block).
+def process_reads(input_dir, output_dir, bands, profile, write_csv, columnar, first, last):
+    avglist = []
+    numblocks = []
+    tables = []
+    name = campaign_name(input_dir)
+
+    for x in GRID_SIZES :
+        for j in range(x*x) :
+            numblocks.append(x*x)
+
+    # Stream the dumps one at a time (pre-processed, with their block averages for every grid size), so memory stays flat.
+    # If missing even one, error is thrown.
+    for result in stream_reads(input_dir, last, first, bands, profile=profile) :
+        i = result.index
+        
+        for x in GRID_SIZES :
+            avglist.append(result.means[x])
+        
+        if columnar :
+            grids = np.repeat(GRID_SIZES, np.array(GRID_SIZES) ** 2)
+            blocks = np.concatenate([np.arange(x*x) for x in GRID_SIZES])
+            tables.append(make_table(np.full(grids.size, i), grids, blocks, np.concatenate(avglist), np.full(grids.size, np.nan)))
+
+        avglist = [item for sublist in avglist for item in sublist]
+
+        if write_csv :
+            filename = os.path.join(output_dir, output_name(name, i))
+            with stage('write_csv'):
+                write_to_csv(filename, avglist, numblocks)
+            count('files_written')
+        
+        avglist.clear()        
+
+    if not columnar :
+        return None
+    return concat_tables(tables)
+
+# Processes every read of one campaign (directory or packed file) into '<name>Stats'. Returns that directory.
+# Reads whose outputs are up to date according to the manifest are skipped, unless force is set.
+# bands=None inverts the chip's own banding.
+# columnar ('npz' or 'parquet') writes '<name>_BlockAverages.<format>' instead of the per-read files, or as well with legacy_csv.
+# num_reads limits the outputs to the first reads of the campaign, e.g. those written so far of a followed campaign (default: all of them).
+def run_campaign(input_dir, two_chips=False, workers=1, force=False, bands=None, profile=DEFAULT_PROFILE, columnar=None, legacy_csv=False, num_reads=None):
+    if (two_chips) :
+        iterations = 201
+    else : 
+        iterations = 101
+    # If directory doesn't exist, throw error
+    if not os.path.exists(input_dir):
+        raise FileNotFoundError("This directory does not exist.")
+
+    # Geometry and banding of the chip (a packed file carries its own)
+    profile = campaign_profile(input_dir, profile)
+    if bands is None:
+        bands = profile.bands
+
+    name = campaign_name(input_dir)
+    stats_dir = os.path.abspath(name+'Stats')
+    if not os.path.exists(stats_dir):
+        os.mkdir(stats_dir)
+
+    if num_reads is None:
+        num_reads = iterations - 1
+
+    # Outputs: the per-read .csv files and/or one table for the whole campaign, each with its own manifest section
+    write_csv = columnar is None or legacy_csv
+    outputs = []
+    if write_csv:
+        outputs.append(('AvgListMaker', lambda i: output_name(name, i)))
+    if columnar is not None:
+        table_file = table_name(name, 'BlockAverages', columnar)
+        outputs.append(('AvgListMaker:'+columnar, lambda i: table_file))
+
+    # Only reads whose dump, output file or parameters changed since the last run are recomputed
+    with stage('hash'):
+        hashes = input_hashes(input_dir, 1, num_reads)
+    manifests = [(StatsManifest(stats_dir, section, output_params(bands, profile)), output) for section, output in outputs]
+    if force:
+        reads = sorted(hashes)
+    else:
+        reads = sorted(set().union(*[manifest.stale_reads(hashes, output) for manifest, output in manifests]))
+
+    # Process the reads, split over the worker processes
+    tables = run_reads(process_reads, (os.path.abspath(input_dir), stats_dir, bands, profile, write_csv, columnar is not None), reads, workers)
+    if columnar is not None:
+        labels = chip_labels(iterations - 1, 2 if two_chips else 1)[:num_reads]
+        with stage('write_table'):
+            update_table(os.path.join(stats_dir, table_file), tables, hashes, labels)
+        count('files_written')
+
+    for manifest, output in manifests:
+        manifest.record(hashes, output)
+
+    return stats_dir
+
+def add_options(parser):
+    add_two_chips_option(parser)
+    add_workers_option(parser)
+    add_force_option(parser)
+    add_band_option(parser)
+    add_chip_option(parser)
+    add_columnar_option(parser)
+    add_follow_option(parser)
+
+def main():
+    args = build_parser("Block averages for every read of a campaign.", add_options).parse_args()
+
+    try:
+        # Batch mode: every campaign matching the pattern(s), no prompts
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: run_campaign(path, args.two_chips, args.workers, args.force, bands_from_args(args), profile_from_args(args),
+                                                         args.columnar, args.legacy_csv))
+
+        # Get directory
+        if args.command == 'run':
+            input_dir = args.input
+            two_chips = args.two_chips
+        else:
+            input_dir = input("Enter the input directory (or packed .bscd file): ")
+            one_or_two = input("2 chips? Y/N (N == one chip) ")
+            two_chips = (one_or_two == 'Y')
+
+        def run(num_reads=None):
+            return run_campaign(input_dir, two_chips, args.workers, args.force, bands_from_args(args), profile_from_args(args),
+                                args.columnar, args.legacy_csv, num_reads)
+
+        # Following: the outputs are refreshed with the reads written so far, and left with every read that came in
+        if args.follow:
+            follow_reads(input_dir, 200 if two_chips else 100, run, profile_from_args(args), args.poll, args.refresh, args.idle_timeout)
+            stats_dir = os.path.abspath(campaign_name(input_dir)+'Stats')
+        else:
+            stats_dir = run()
+
+        print("All statistics files created and placed in directory "+stats_dir)
+        
+            # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'AvgListMaker')
\ No newline at end of file
@@ -1,190 +1,299 @@
-# ----------------------------------------------------------------------------------
-# A .py script that takes one (or multiple) .csv file(s) deliminated into
-# "Address,Word" format and creates a bitmap from them.
-#
-# This script is currently configured for a memory device of size 8kB.
-# It creates a 256 by 256 bitmap in Single-Full & Distribution-Full Modes.
-# It creates a 256 by 156 bitmap in Single-Image & Distribution-Image Modes.
-#
-# To use in Single Mode: Place singular file in the same directory as program.
-# Select 'SF' as mode, and provide name of file, sans '.csv'.
-# The program will create a directory under the current working directory,
-# titled 'BITMAPS', and store the bitmap into it. If this directory already
-# exists, it will just store the bitmap into the existing directory.
-#
-# To use in Distribution Mode: Place file directory under the working directory.
-# Select 'F' as mode, and provide name of file directory.
-# The program will create a directory under the working directory,
-# titled 'BITMAPS', and store the bitmap into it. If this directory already
-# exists, it will just store the bitmap into the existing directory.
-#
-# Author : Gaines Odom
-# Email : gaines.a.odom@gmail.com
-# Inst. : Auburn University
-# Advisor : Dr. Ujjwal Guin
-#
-# Created On : 08/05/2023
-# Last Edited On: 08/31/2023
-# ----------------------------------------------------------------------------------
-
-import csv
-import os
-from PIL import Image
-
-# Constants (Change if necessary, currently set for 8kB chip)
-CHIP_WIDTH = 256
-CHIP_HEIGHT = 256
-IMAGE_HEIGHT = 156
-SINGLE = 1
-SUM = 100
-WORD_SIZE = 8
-DOUBLE = 200
-
-# Bitmap Type Dictionary. Sets appropriate parameters for single run and distribution bitmaps.
-bitmap_type = {
-    'I': [CHIP_WIDTH, IMAGE_HEIGHT, SUM],
-    'F': [CHIP_WIDTH, CHIP_HEIGHT, SUM],
-    'SI': [CHIP_WIDTH, IMAGE_HEIGHT, SINGLE],
-    'SF': [CHIP_WIDTH, CHIP_HEIGHT, SINGLE],
-    '2CI': [CHIP_WIDTH, IMAGE_HEIGHT, DOUBLE],
-    '2CF': [CHIP_WIDTH, CHIP_HEIGHT, DOUBLE],
-    'default': [0,0,0],
-}
-
-# .csv Decoding function. Takes .csv files of the format "Address,Word" and returns int list of addresses and int list of binary values.
-def read_csv(filename):
-    addresses = []
-    bit_list = []
-    bits = []
-    with open(filename, 'r') as csvfile:
-        csvreader = csv.reader(csvfile)
-        next(csvreader)
-        for row in csvreader:
-            address, byte = row
-            addresses.append(int(address, 16))  # Turns 4 digit hex address into decimal int value list
-            bit_list.append(bin(int(byte, 16))[2:].zfill(WORD_SIZE))    # Turns 2 digit hex byte into 8 bit binary string list
-
-    # Create a list of 1-bit strings from 8-bit binary strings        
-    for byte in bit_list:
-        for bit in byte:  
-            bits.append(bit)
-    
-    # Turn 1-bit strings into 1-bit ints
-    bits = [int(bit) for bit in bits]
-
-    return addresses, bits
-
-# Bit Distribution Creator. Uses "weight" list to determine how dark a pixel is (darker pixels imply more frequent occurence of 1's).
-def create_bit_distribution(weight,width,height,iterations): 
-    img = Image.new('RGB', (width, height), color='white')
-    for y in range(height):
-        for x in range(width):
-            pixel_index = y * width + x
-            pixel_value = 255 - int(weight[pixel_index] * 255/iterations)
-            img.putpixel((x, y), (pixel_value,pixel_value,pixel_value))
-    return img
-
-# Bitmap Creator. Uses raw bit data list to determine whether or not a pixel will be black or white.
-def create_bitmap(bits, width, height): # deal with this
-    img = Image.new('1', (width, height), color=0)
-    for y in range(height):
-        for x in range(width):
-            pixel_index = y * width + x
-            pixel_value = 1 - bits[pixel_index]
-            img.putpixel((x, y), pixel_value)
-    return img
-
-def main():
-    try:
-        weight = []
-        lists = []
-        prevdir = os.getcwd()
-        input_text = '''
-    Enter the bitmap type.
-    Your options are: 
-    'I' ["Image" -- A bit distribution map of binary image, 100 reads.]
-    'F' ["Full" -- A bit distribution map of full chip, 100 reads.]
-    'SI' ["Single Image" -- A purely B&W bitmap of one image read.]
-    'SF' ["Single Full" -- A purely B&W bitmap of one full read.]
-    '2CI' ["2 Chip Image" -- A bit distribution map of binary image, 200 reads.]
-    '2CF' ["2 Chip Full" -- A bit distribution map of full chip, 200 reads.]
-    '''
-        print(input_text)
-        type = input().strip()
-
-        # Set the type
-        bitmap_width, bitmap_height, iterations = bitmap_type.get(type, bitmap_type['default'])
-
-        # Create bitmap directory (if necessary)
-        if not os.path.exists('BITMAPS'):
-            os.mkdir('BITMAPS')
-
-        # SI or SF execution block
-        if iterations == SINGLE : 
-            # Get file
-            input_file = input("Enter the file name (File MUST be in this directory): ")
-
-            # If file does not exist, throw error
-            if not os.path.exists(input_file+'.csv'):
-                raise FileNotFoundError("This file does not exist.")
-
-            # Read .csv file
-            addresses, bytelist = read_csv(input_file+'.csv')
-            
-            # Create bitmap and name output file
-            bitmap = create_bitmap(bytelist, bitmap_width, bitmap_height) 
-            output_file = input_file+'-bitmap.png'
-            
-            # Enter bitmap directory and save output file
-            os.chdir('BITMAPS')
-            bitmap.save(output_file)
-            print("Bitmap generated and saved as "+output_file+" in "+prevdir+"\BITMAPS.")
-
-        # I or F execution block
-        else :
-            # Get directory
-            input_file = input("Enter the file directory (e.g. 'JUL4' for JUL4_1.csv to JUL4_100.csv): ")
-            
-            # If directory doesn't exist, throw error
-            if not os.path.exists(input_file):
-                raise FileNotFoundError("This directory does not exist.")
-            
-            # Go to directory 
-            os.chdir(input_file)
-            
-            # Read all files. If missing even one, error is thrown.
-            for i in range(1, iterations + 1) :
-                if not os.path.exists(input_file+'_'+str(i)+'.csv'):
-                    raise FileNotFoundError("File '"+input_file+"_"+str(i)+".csv' does not exist.")
-                
-                a, b = read_csv(input_file+'_'+str(i)+'.csv')
-                lists.append(b)
-
-            # Compute weight for bit distribution
-            for nums in zip(*lists):
-                total = sum(nums)
-                weight.append(total)
-            #print(weight)     # For use in debugging
-
-            # Create bit distribution and name output file
-            bit_distribution = create_bit_distribution(weight, bitmap_width, bitmap_height, iterations)
-            output_file = input_file+'-bitdistribution.png'
-
-            # Leave directory full of .csv files
-            os.chdir(prevdir)
-
-            # Enter bitmap directory and save output file
-            os.chdir('BITMAPS')
-            bit_distribution.save(output_file)
-            print("Bit distribution generated and saved as "+output_file+" in "+prevdir+"\BITMAPS.")
-
-    # Error Handler
-    except Exception as e:
-        print("An error occurred: {e}")
-
-    # Return to program directory
-    finally:
-        os.chdir(prevdir)    
-
-if __name__ == "__main__":
-    main()
+# ----------------------------------------------------------------------------------
+# A .py script that takes one (or multiple) .csv file(s) deliminated into
+# "Address,Word" format and creates a bitmap from them.
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py). The bitmap has one pixel per bit of the chip.
+# It creates a 256 by 256 bitmap in Single-Full & Distribution-Full Modes.
+# It creates a 256 by 156 bitmap in Single-Image & Distribution-Image Modes
+# (Image modes only exist for chips the binary image has been written onto).
+#
+# To use in Single Mode: Place singular file in the same directory as program.
+# Select 'SF' as mode, and provide name of file, sans '.csv'.
+# The program will create a directory under the current working directory,
+# titled 'BITMAPS', and store the bitmap into it. If this directory already
+# exists, it will just store the bitmap into the existing directory.
+#
+# To use in Distribution Mode: Place file directory (or its packed .bscd file,
+# see CampaignPack.py) under the working directory.
+# Select 'F' as mode, and provide name of file directory.
+# The program will create a directory under the working directory,
+# titled 'BITMAPS', and store the bitmap into it. If this directory already
+# exists, it will just store the bitmap into the existing directory.
+#
+# In the 2 Chip modes, reads 1..100 are chip 1 (/dev/spidev0.0) and reads
+# 101..200 are chip 2 (/dev/spidev0.1). With --per-chip, a bit distribution of
+# each chip on its own is saved next to the pooled one.
+#
+# The Heat map modes (SH, H, 2CH) slide a window of --window bits (default
+# 16x16) over the full chip in steps of --stride bits (default 1) and colour
+# every step by the share of 1s under the window, from blue (lowest on the
+# chip) through white to red (highest), so aging hot spots stand out. Next to
+# '<name>-heatmap<R>x<C>.png' the window averages are saved in
+# '<name>-heatmap<R>x<C>.npz' (see sliding_means in BlockEngine.py).
+#
+# With --follow, the distribution and heat map modes watch the campaign
+# directory while read100.c / read200.c are still writing it, take in each
+# dump as soon as it is complete, and save the image of the reads so far every
+# --refresh seconds.
+#
+# Run with no arguments to be prompted for the parameters, or see
+# 'python BitmapMaker.py -h' for the 'run' and 'batch' subcommands.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 08/05/2023
+# Last Edited On: 08/31/2023
+# ----------------------------------------------------------------------------------
+
+import os
+import numpy as np
+from PIL import Image, ImageOps
+from DumpLoader import load_dump
+from CampaignPack import iter_campaign, follow_reads, campaign_name, campaign_profile, chip_labels, chip_reads
+from BlockEngine import summed_area_table, sliding_means
+from ChipProfile import DEFAULT_PROFILE
+from CommandLine import build_parser, add_chip_option, add_follow_option, profile_from_args, run_batch
+from Instrument import stage, count, run_main
+
+# Constants (Default chip is the 8kB one)
+CHIP_WIDTH = DEFAULT_PROFILE.width
+CHIP_HEIGHT = DEFAULT_PROFILE.height
+IMAGE_HEIGHT = DEFAULT_PROFILE.image_height
+SINGLE = 1
+SUM = 100
+WORD_SIZE = DEFAULT_PROFILE.word_size
+DOUBLE = 200
+HEAT_MAP_TYPES = ['SH', 'H', '2CH']
+WINDOW = (16, 16)
+STRIDE = (1, 1)
+
+# Bitmap Type Dictionary of a chip. Sets appropriate parameters for single run and distribution bitmaps.
+# A chip without an image height has no Image modes.
+def bitmap_types(profile):
+    types = {
+        'I': [profile.width, profile.image_height, SUM],
+        'F': [profile.width, profile.height, SUM],
+        'SI': [profile.width, profile.image_height, SINGLE],
+        'SF': [profile.width, profile.height, SINGLE],
+        '2CI': [profile.width, profile.image_height, DOUBLE],
+        '2CF': [profile.width, profile.height, DOUBLE],
+        'SH': [profile.width, profile.height, SINGLE],
+        'H': [profile.width, profile.height, SUM],
+        '2CH': [profile.width, profile.height, DOUBLE],
+        'default': [0,0,0],
+    }
+    if profile.image_height is None:
+        for type in ['I', 'SI', '2CI']:
+            del types[type]
+    return types
+
+bitmap_type = bitmap_types(DEFAULT_PROFILE)
+
+# Weight Accumulator. Counts, per bit, how many of the dumps powered up as 1. Only one dump is held in memory at a time.
+def accumulate_weight(dumps, num_bits):
+    weight = np.zeros(num_bits, dtype=np.uint16)
+    for dump in dumps:
+        with stage('accumulate'):
+            weight += dump.flat_bits[:num_bits]
+        count('bits_processed', num_bits)
+    return weight
+
+# Bit Distribution Creator. Uses "weight" array to determine how dark a pixel is (darker pixels imply more frequent occurence of 1's).
+def create_bit_distribution(weight,width,height,iterations): 
+    weight = np.asarray(weight[:width * height], dtype=np.int64).reshape(height, width)
+    pixel_values = (255 - (weight * 255 / iterations).astype(np.int64)).astype(np.uint8)
+    return Image.fromarray(np.repeat(pixel_values[:, :, None], 3, axis=2), 'RGB')
+
+# Bitmap Creator. Uses raw bit data to determine whether or not a pixel will be black or white.
+def create_bitmap(bits, width, height):
+    pixel_values = 1 - np.asarray(bits[:width * height], dtype=np.uint8).reshape(height, width)
+    return Image.frombytes('1', (width, height), np.packbits(pixel_values, axis=1).tobytes())
+
+# Heat Map Creator. Slides a window over the "weight" array and colours each step by its share of 1s, stretched from the lowest (blue) to the highest (red).
+# Each step is drawn stride pixels wide, so the map keeps roughly the proportions of the chip. Returns the image and the (steps down, steps across) window averages.
+def create_heat_map(weight, width, height, iterations, window=WINDOW, stride=STRIDE):
+    weight = np.asarray(weight[:width * height]).reshape(1, height, width)
+    means = sliding_means(summed_area_table(weight), window, stride)[0] / iterations
+    low, high = means.min(), means.max()
+    if high > low:
+        scaled = (means - low) / (high - low)
+    else:
+        scaled = np.zeros(means.shape)
+    image = ImageOps.colorize(Image.fromarray((scaled * 255).astype(np.uint8), 'L'), 'blue', 'red', mid='white')
+    return image.resize((means.shape[1] * stride[1], means.shape[0] * stride[0]), Image.NEAREST), means
+
+# Parses a window or stride given as 'ROWSxCOLS' (or 'N' for NxN)
+def parse_window(text):
+    rows, _, cols = text.lower().partition('x')
+    return int(rows), int(cols or rows)
+
+# Creates the bitmap (SI, SF), bit distribution (I, F, 2CI, 2CF) or heat map (SH, H, 2CH) of one input and saves it into output_dir. Returns the saved file.
+# With per_chip, the 2 Chip modes also save '<name>-chip<c>-bitdistribution.png' (or heat map) for each chip.
+# follow = (poll, refresh, idle_timeout) follows a campaign directory still being written (see CampaignPack.follow_reads),
+# saving the distribution of the reads so far every 'refresh' seconds.
+def make_bitmap(input_file, type, output_dir='BITMAPS', per_chip=False, profile=DEFAULT_PROFILE, window=WINDOW, stride=STRIDE, follow=None):
+    # Set the type (a packed file carries its own chip profile)
+    if type in bitmap_type and bitmap_type[type][2] != SINGLE and os.path.isfile(input_file):
+        profile = campaign_profile(input_file, profile)
+    types = bitmap_types(profile)
+    if type not in types or type == 'default':
+        raise ValueError("Unknown bitmap type '"+str(type)+"' for the "+profile.name+" chip.")
+    bitmap_width, bitmap_height, iterations = types[type]
+    if follow is not None and (iterations == SINGLE or per_chip):
+        raise ValueError("Only the distribution and heat map modes, without --per-chip, can follow a campaign.")
+
+    # Distribution images are bit distributions, or heat maps in the Heat map modes (their window averages are saved too)
+    suffix = '-bitdistribution'
+    if type in HEAT_MAP_TYPES :
+        suffix = '-heatmap'+str(window[0])+'x'+str(window[1])
+    def save_distribution(weight, reads, output_name) :
+        with stage('render'):
+            if type not in HEAT_MAP_TYPES :
+                create_bit_distribution(weight, bitmap_width, bitmap_height, reads).save(os.path.join(output_dir, output_name+'.png'))
+                count('files_written')
+                return
+            image, means = create_heat_map(weight, bitmap_width, bitmap_height, reads, window, stride)
+            image.save(os.path.join(output_dir, output_name+'.png'))
+            np.savez(os.path.join(output_dir, output_name+'.npz'), means=means, window=window, stride=stride, reads=reads)
+        count('files_written', 2)
+
+    # Create bitmap directory (if necessary)
+    if not os.path.exists(output_dir):
+        os.mkdir(output_dir)
+
+    # SI or SF execution block
+    if iterations == SINGLE : 
+        if input_file.endswith('.csv'):
+            input_file = input_file[:-len('.csv')]
+
+        # If file does not exist, throw error
+        if not os.path.exists(input_file+'.csv'):
+            raise FileNotFoundError("This file does not exist.")
+
+        # Read .csv file
+        dump = load_dump(input_file+'.csv', profile.width, profile.height, profile.word_size)
+        
+        # Heat map of the one read
+        if type in HEAT_MAP_TYPES :
+            output_file = os.path.basename(input_file)+suffix+'.png'
+            save_distribution(dump.flat_bits.astype(np.uint16), 1, os.path.basename(input_file)+suffix)
+            return os.path.join(output_dir, output_file)
+
+        # Create bitmap and name output file
+        with stage('render'):
+            image = create_bitmap(dump.flat_bits, bitmap_width, bitmap_height) 
+        output_file = os.path.basename(input_file)+'-bitmap.png'
+
+    # I or F execution block
+    else :
+        # If directory doesn't exist, throw error
+        if not os.path.exists(input_file):
+            raise FileNotFoundError("This directory does not exist.")
+        
+        # Following: the weight grows one dump at a time as they are written, and is saved as it stands every refresh
+        if follow is not None :
+            weight = np.zeros(profile.num_bits, dtype=np.uint16)
+            def take(dump) :
+                with stage('accumulate'):
+                    weight[:] += dump.flat_bits[:profile.num_bits]
+                count('bits_processed', profile.num_bits)
+            def update(reads) :
+                save_distribution(weight, reads, campaign_name(input_file)+suffix)
+            follow_reads(input_file, iterations, update, profile, *follow, take=take)
+            return os.path.join(output_dir, campaign_name(input_file)+suffix+'.png')
+
+        # Read all files and compute weight for bit distribution. If missing even one, error is thrown.
+        if per_chip and iterations == DOUBLE :
+            # One weight per chip; the pooled weight is their sum
+            weight = np.zeros(profile.num_bits, dtype=np.uint16)
+            for chip, reads in chip_reads(chip_labels(iterations, 2)).items():
+                chip_weight = accumulate_weight(iter_campaign(input_file, reads[-1], reads[0], profile), profile.num_bits)
+                save_distribution(chip_weight, len(reads), campaign_name(input_file)+'-chip'+chip+suffix)
+                weight += chip_weight
+        else :
+            weight = accumulate_weight(iter_campaign(input_file, iterations, profile=profile), profile.num_bits)
+        #print(weight)     # For use in debugging
+
+        # Create bit distribution, name output file and save it into bitmap directory
+        output_file = campaign_name(input_file)+suffix+'.png'
+        save_distribution(weight, iterations, campaign_name(input_file)+suffix)
+        return os.path.join(output_dir, output_file)
+
+    # Save output file into bitmap directory
+    with stage('render'):
+        image.save(os.path.join(output_dir, output_file))
+    count('files_written')
+    return os.path.join(output_dir, output_file)
+
+def add_options(parser):
+    parser.add_argument('--type', choices=[key for key in bitmap_type if key != 'default'],
+                        help="bitmap type (asked for if not given; required in batch mode)")
+    parser.add_argument('--per-chip', action='store_true', help="2CI, 2CF, 2CH: also save a bit distribution (or heat map) of each chip on its own")
+    parser.add_argument('--window', type=parse_window, default=WINDOW, metavar='ROWSxCOLS', help="heat map modes: window size in bits (default 16x16)")
+    parser.add_argument('--stride', type=parse_window, default=STRIDE, metavar='ROWSxCOLS', help="heat map modes: step between windows in bits (default 1)")
+    add_chip_option(parser)
+    add_follow_option(parser)
+
+def main():
+    parser = build_parser("Bitmaps and bit distributions of SRAM dumps.", add_options,
+                          input_help="dump file (SI, SF) or campaign directory / packed .bscd file (I, F, 2CI, 2CF)")
+    args = parser.parse_args()
+    # Batch mode runs unattended, so the bitmap type cannot be asked for
+    if args.command == 'batch' and args.type is None:
+        parser.error("batch mode needs --type")
+
+    try:
+        prevdir = os.getcwd()
+        input_text = '''
+    Enter the bitmap type.
+    Your options are: 
+    'I' ["Image" -- A bit distribution map of binary image, 100 reads.]
+    'F' ["Full" -- A bit distribution map of full chip, 100 reads.]
+    'SI' ["Single Image" -- A purely B&W bitmap of one image read.]
+    'SF' ["Single Full" -- A purely B&W bitmap of one full read.]
+    '2CI' ["2 Chip Image" -- A bit distribution map of binary image, 200 reads.]
+    '2CF' ["2 Chip Full" -- A bit distribution map of full chip, 200 reads.]
+    'SH' ["Single Heat map" -- A sliding-window heat map of one full read.]
+    'H' ["Heat map" -- A sliding-window heat map of full chip, 100 reads.]
+    '2CH' ["2 Chip Heat map" -- A sliding-window heat map of full chip, 200 reads.]
+    '''
+        if args.type is not None :
+            type = args.type
+        else :
+            print(input_text)
+            type = input().strip()
+
+        # Batch mode: every input matching the pattern(s), no prompts
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: make_bitmap(path, type, per_chip=args.per_chip, profile=profile_from_args(args), window=args.window, stride=args.stride))
+
+        # Get file or directory
+        if args.command == 'run':
+            input_file = args.input
+        elif bitmap_type.get(type, bitmap_type['default'])[2] == SINGLE :
+            input_file = input("Enter the file name (File MUST be in this directory): ")
+        else :
+            input_file = input("Enter the file directory or packed .bscd file (e.g. 'JUL4' for JUL4_1.csv to JUL4_100.csv): ")
+
+        follow = None
+        if args.follow :
+            follow = (args.poll, args.refresh, args.idle_timeout)
+        output_file = make_bitmap(input_file, type, per_chip=args.per_chip, profile=profile_from_args(args), window=args.window, stride=args.stride, follow=follow)
+
+        if type in HEAT_MAP_TYPES :
+            print("Heat map generated and saved as "+os.path.basename(output_file)+" in "+prevdir+"\\BITMAPS.")
+        elif bitmap_type[type][2] == SINGLE :
+            print("Bitmap generated and saved as "+os.path.basename(output_file)+" in "+prevdir+"\\BITMAPS.")
+        else :
+            print("Bit distribution generated and saved as "+os.path.basename(output_file)+" in "+prevdir+"\\BITMAPS.")
+
+    # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'BitmapMaker')
\ No newline at end of file
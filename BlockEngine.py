@@ -0,0 +1,152 @@
+# ----------------------------------------------------------------------------------
+# Vectorized block-statistics engine.
+#
+# Takes a stack of bit grids of shape (N, height, width) and returns the average
+# incidence of 1s in every block, for every requested grid size, in one pass.
+# A summed-area table (2-D cumulative sum) is built once per stack, after
+# which the sum of any block costs four lookups no matter how big it is.
+#
+# The blocks are laid out exactly as the original calculate_mean_and_dev did
+# it: x*x square blocks of chunk_size bits a side, pushed off the wall by
+# x_offset rows and columns so the centremost divisions are used.
+#
+# The same table also answers queries the fixed grids cannot: the average of
+# any rectangle of the full grid (rect_means), and of a window of any size
+# slid over it with any stride (sliding_means), for hot-spot heat maps. A
+# table built over a per-bit count of 1s across reads (a bit distribution)
+# works the same way as one built over single reads.
+#
+# Any grid works; the defaults are for a memory device of size 8kB (see
+# ChipProfile.py for the others).
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import math
+import numpy as np
+
+# Constants (Change if necessary, currently set for 8kB chip)
+CHIP_WIDTH = 256
+CHIP_HEIGHT = 256
+GRID_SIZES = range(2, 21)
+
+
+# Block layout for a grid of num_of_blocks blocks. num_of_blocks should be a squared product of an int, ex. 4, 9, 16 etc.
+# Returns (chunk_size, chunks_per_row, x_offset), the same numbers calculate_mean_and_dev always used.
+def block_layout(num_of_blocks, width=CHIP_WIDTH, height=CHIP_HEIGHT):
+    num_bits = width * height
+    chunk_size = int(math.sqrt(num_bits // num_of_blocks)) # round down: 65536 // 81 = 809 -> int(sqrt(809)) = 28 -> chunks are 28x28
+    excess_bits = num_bits - (num_of_blocks * chunk_size * chunk_size) # 65536 - (81 * 28 * 28) = 2032
+    chunks_per_row = int(math.sqrt(num_of_blocks)) # chunks_per_row = sqrt(81) = 9
+    x_offset = math.ceil((excess_bits // (2 * width - 1)) / 2)   # keeps it off the wall for purposes of evenness (511 on a 256 wide chip). Centremost divisions are used
+    return chunk_size, chunks_per_row, x_offset
+
+
+# Summed-area table of a (N, height, width) bit stack. Entry [n, r, c] is the number of 1s above and left of (r, c).
+def summed_area_table(stack):
+    stack = np.asarray(stack)
+    table = np.zeros((stack.shape[0], stack.shape[1] + 1, stack.shape[2] + 1), dtype=np.int32)
+    np.cumsum(stack, axis=1, dtype=np.int32, out=table[:, 1:, 1:])
+    np.cumsum(table[:, 1:, 1:], axis=2, out=table[:, 1:, 1:])
+    return table
+
+
+# Number of 1s in the rectangle of rows x cols bits whose top-left bit is (top, left), for every read of a summed-area table.
+# top, left, rows and cols may be arrays of any (broadcastable) shape; the result is (N,) + that shape. O(1) per rectangle.
+def rect_sums(table, top, left, rows, cols):
+    top, left, bottom, right = np.broadcast_arrays(top, left, np.add(top, rows), np.add(left, cols))
+    height = table.shape[1] - 1
+    width = table.shape[2] - 1
+    if (top < 0).any() or (left < 0).any() or (bottom > height).any() or (right > width).any() or (bottom <= top).any() or (right <= left).any():
+        raise ValueError("Rectangle outside the "+str(width)+"x"+str(height)+" grid.")
+    return table[:, bottom, right] - table[:, top, right] - table[:, bottom, left] + table[:, top, left]
+
+
+# Average of the rectangle(s) of rect_sums
+def rect_means(table, top, left, rows, cols):
+    return rect_sums(table, top, left, rows, cols) / (np.asarray(rows) * np.asarray(cols))
+
+
+# Top-left corners of a window of (rows, cols) bits slid by (row stride, col stride) over a height x width grid, as (tops, lefts).
+# The window never hangs over the edge; bits past the last full step are left out.
+def window_positions(window, stride=(1, 1), width=CHIP_WIDTH, height=CHIP_HEIGHT):
+    rows, cols = window
+    if rows < 1 or cols < 1 or rows > height or cols > width:
+        raise ValueError("Window of "+str(rows)+"x"+str(cols)+" bits does not fit the "+str(width)+"x"+str(height)+" grid.")
+    if stride[0] < 1 or stride[1] < 1:
+        raise ValueError("Stride must be at least 1.")
+    return np.arange(0, height - rows + 1, stride[0]), np.arange(0, width - cols + 1, stride[1])
+
+
+# Average of a sliding window of (rows, cols) bits at every (row stride, col stride) step over the grid of a summed-area table.
+# Returns an (N, steps down, steps across) float array: entry [n, i, j] is the window with top-left bit (i * row stride, j * col stride).
+def sliding_means(table, window, stride=(1, 1)):
+    tops, lefts = window_positions(window, stride, table.shape[2] - 1, table.shape[1] - 1)
+    return rect_means(table, tops[:, None], lefts[None, :], window[0], window[1])
+
+
+# Per-block 1 counts of one grid size, read off a summed-area table. Returns an (N, x*x) int array in row-major block order.
+def block_sums(table, x):
+    height = table.shape[1] - 1
+    width = table.shape[2] - 1
+    chunk_size, chunks_per_row, x_offset = block_layout(x * x, width, height)
+
+    edges = x_offset + chunk_size * np.arange(chunks_per_row + 1)
+    corners = table[:, edges[:, None], edges[None, :]]
+    sums = corners[:, 1:, 1:] - corners[:, :-1, 1:] - corners[:, 1:, :-1] + corners[:, :-1, :-1]
+
+    return sums.reshape(table.shape[0], -1)
+
+
+# Per-block averages for every grid size at once. 'stack' is (N, height, width) or (N, height*width) bits.
+# Returns {x: (N, x*x) float array of block averages} for each x in grid_sizes.
+def block_means(stack, grid_sizes=GRID_SIZES, width=CHIP_WIDTH, height=CHIP_HEIGHT):
+    stack = np.asarray(stack).reshape(-1, height, width)
+    return table_means(summed_area_table(stack), grid_sizes)
+
+
+# Per-block averages for every grid size, read off an existing summed-area table. Returns {x: (N, x*x) float array}.
+def table_means(table, grid_sizes=GRID_SIZES):
+    height = table.shape[1] - 1
+    width = table.shape[2] - 1
+
+    means = {}
+    for x in grid_sizes:
+        chunk_size = block_layout(x * x, width, height)[0]
+        means[x] = block_sums(table, x) / (chunk_size * chunk_size)
+    return means
+
+
+# Average of all block averages and sample standard deviation of the block averages, per read.
+def block_summary(averages):
+    averages = np.asarray(averages)
+    return averages.mean(axis=-1), averages.std(axis=-1, ddof=1)
+
+
+# Gaussian fit of the block averages of every grid of every read at once, in closed form: the maximum-likelihood
+# mean and (population, ddof=0) standard deviation, which is exactly what scipy's norm.fit returns.
+# 'means' is {x: (N, x*x)} as block_means returns it (or {x: (x*x,)} for one read). Returns (mu, sigma), each (N, len(grid_sizes)).
+def block_fit(means, grid_sizes=GRID_SIZES):
+    grid_sizes = list(grid_sizes)
+    values = np.concatenate([np.atleast_2d(np.asarray(means[x], dtype=float)) for x in grid_sizes], axis=1)
+    counts = np.array([x * x for x in grid_sizes])
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    # All grids side by side in one (N, sum of x*x) array, reduced segment by segment
+    mu = np.add.reduceat(values, starts, axis=1) / counts
+    deviations = values - np.repeat(mu, counts, axis=1)
+    sigma = np.sqrt(np.add.reduceat(deviations * deviations, starts, axis=1) / counts)
+    return mu, sigma
+
+
+# Single-read drop-in for the old per-script function. Returns (chunk_averages, stddev, avgtotal).
+def calculate_mean_and_dev(bitlist, num_of_blocks):
+    x = int(math.sqrt(num_of_blocks))
+    averages = block_means([bitlist], [x])[x]
+    avgtotal, stddev = block_summary(averages[0])
+    return averages[0].tolist(), float(stddev), float(avgtotal)
@@ -0,0 +1,95 @@
+# ----------------------------------------------------------------------------------
+# Bootstrap confidence intervals for block statistics.
+#
+# The average of the block averages and their standard deviation are
+# resampled in two ways:
+#   - across blocks : the blocks of one grid of one read are drawn with
+#                     replacement (how much the numbers of a read depend on
+#                     the particular blocks the chip was cut into)
+#   - across reads  : the reads of a campaign (or of one chip) are drawn with
+#                     replacement (how much the campaign numbers depend on
+#                     the particular reads taken)
+#
+# Every resample of n values is one row of a (resamples, n) matrix of random
+# indices. The matrix is turned into counts (how often each value was drawn),
+# so the mean and variance of every resample, of every read at once, are two
+# matrix products. The counts depend only on (n, resamples, seed) and are
+# cached, so each read of a campaign is resampled the same way no matter how
+# the reads are split over worker processes. Intervals are percentile
+# intervals.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+from functools import lru_cache
+import numpy as np
+
+RESAMPLES = 2000
+CONFIDENCE = 0.95
+SEED = 0
+
+# Column titles of an interval set, in the order bootstrap_ci returns them
+CI_COLUMNS = ['Average CI Low', 'Average CI High', 'Standard Deviation CI Low', 'Standard Deviation CI High']
+
+
+@lru_cache(maxsize=None)
+def _resample_counts(n, resamples, seed):
+    rng = np.random.default_rng([seed, n])
+    index = rng.integers(0, n, size=(resamples, n))
+    rows = n * np.arange(resamples)[:, None]
+    counts = np.bincount((index + rows).ravel(), minlength=resamples * n).reshape(resamples, n).astype(np.float64)
+    counts.setflags(write=False)
+    return counts
+
+
+# (resamples, n) matrix of how many times each of n values is drawn in every resample. Cached per (n, resamples, seed).
+def resample_counts(n, resamples=RESAMPLES, seed=SEED):
+    return _resample_counts(int(n), int(resamples), int(seed))
+
+
+# Mean and standard deviation of every resample of the last axis of values. Returns two (..., resamples) arrays.
+def resample_stats(values, resamples=RESAMPLES, seed=SEED, ddof=0):
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[-1]
+    if n <= ddof:
+        raise ValueError("Need more than "+str(ddof)+" values to bootstrap a standard deviation.")
+    counts = resample_counts(n, resamples, seed)
+    means = values @ counts.T / n
+    squares = (values * values) @ counts.T
+    variances = np.maximum(squares - n * means * means, 0) / (n - ddof)
+    return means, np.sqrt(variances)
+
+
+# Percentile interval of the last axis of samples, as (low, high)
+def percentile_interval(samples, confidence=CONFIDENCE):
+    tail = 50 * (1 - confidence)
+    low, high = np.percentile(samples, [tail, 100 - tail], axis=-1)
+    return low, high
+
+
+# Confidence intervals of the mean and the standard deviation (with ddof) of the last axis of values, bootstrapped over that axis.
+# Returns (mean low, mean high, std low, std high), each of shape values.shape[:-1].
+def bootstrap_ci(values, resamples=RESAMPLES, confidence=CONFIDENCE, seed=SEED, ddof=0):
+    means, stds = resample_stats(values, resamples, seed, ddof)
+    return percentile_interval(means, confidence) + percentile_interval(stds, confidence)
+
+
+# Intervals of the block averages of one or more reads for every grid size, bootstrapped across blocks.
+# 'means' is {x: (N, x*x)} (or {x: (x*x,)}) as BlockEngine.block_means returns it. Returns {x: (mean low, mean high, std low, std high)}.
+def block_intervals(means, resamples=RESAMPLES, confidence=CONFIDENCE, seed=SEED, ddof=0):
+    return {x: bootstrap_ci(means[x], resamples, confidence, seed, ddof) for x in means}
+
+
+# Intervals of the mean over reads of per-read statistics, bootstrapped across reads. 'mu' and 'sigma' are (N, grid sizes), as
+# BlockEngine.block_fit returns them. Returns (average, average low, average high, std, std low, std high), each (grid sizes,).
+def read_intervals(mu, sigma, resamples=RESAMPLES, confidence=CONFIDENCE, seed=SEED):
+    mu = np.asarray(mu, dtype=np.float64).T
+    sigma = np.asarray(sigma, dtype=np.float64).T
+    mu_low, mu_high = percentile_interval(resample_stats(mu, resamples, seed)[0], confidence)
+    sigma_low, sigma_high = percentile_interval(resample_stats(sigma, resamples, seed)[0], confidence)
+    return mu.mean(axis=1), mu_low, mu_high, sigma.mean(axis=1), sigma_low, sigma_high
@@ -0,0 +1,235 @@
+# ----------------------------------------------------------------------------------
+# Importable view of one campaign, for notebooks and other scripts.
+#
+#     from Campaign import Campaign
+#     campaign = Campaign('JUL4')
+#     mu, sigma = campaign.fits
+#     campaign.bit_distribution.save('JUL4-bitdistribution.png')
+#
+# A Campaign wraps a campaign directory of dumps (or its packed .bscd file).
+# Nothing is read when it is made: every derived artifact is computed the
+# first time it is asked for, kept on the object, and reused by everything
+# built on top of it:
+#
+#   words            packed reads, (N, bytes per read)
+#     bits           raw bit stack, (N, bits)
+#       weights      per-bit count of 1s over the reads
+#         bit_distribution, heat_map()
+#       raw_table    summed-area table of the raw stack
+#         raw_block_means    {x: (N, x*x)} for every grid size
+#           features, age_scores()
+#       processed    pre-processed (band-inverted) bit stack
+#         table      summed-area table of the pre-processed stack
+#           block_means      {x: (N, x*x)} for every grid size, rect_means()
+#             block_stats, fits, plot(), block_intervals()
+#               read_intervals()
+#     puf_metrics, image_errors()
+#
+# so asking for the fits and then the block statistics parses and sums the
+# dumps only once. PIL (bitmaps), matplotlib (histograms) and scipy (age
+# models) are only imported when something needing them is first used.
+#
+# The whole campaign is held in memory; use Streaming.py for campaigns too
+# large for that.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+from functools import cached_property
+import numpy as np
+from BlockEngine import GRID_SIZES, summed_area_table, table_means, block_summary, block_fit, rect_means
+from CampaignPack import load_words, campaign_name, campaign_profile, count_reads, chip_labels, chip_reads
+from PreProcess import normalize_bands, pre_process
+from ChipProfile import DEFAULT_PROFILE
+from Instrument import stage, count
+from Bootstrap import RESAMPLES, CONFIDENCE, SEED, block_intervals, read_intervals
+
+WINDOW = (16, 16)
+STRIDE = (1, 1)
+
+
+class Campaign:
+    # 'iterations' limits the campaign to reads 1..iterations (default: every read found).
+    # bands=None inverts the chip's own banding; chips / chip_map tag the reads as in CampaignPack.chip_labels.
+    def __init__(self, path, iterations=None, bands=None, chips=1, chip_map=None, profile=DEFAULT_PROFILE, grid_sizes=GRID_SIZES):
+        # If directory doesn't exist, throw error
+        if not os.path.exists(path):
+            raise FileNotFoundError("This directory does not exist.")
+
+        self.path = path
+        self.name = campaign_name(path)
+        self.profile = campaign_profile(path, profile)
+        self.bands = self.profile.bands if bands is None else normalize_bands(bands)
+        self.grid_sizes = list(grid_sizes)
+        self.chips = chips
+        self.chip_map = chip_map
+        self._iterations = iterations
+        self._heat_maps = {}
+        self._image_errors = {}
+        self._block_intervals = {}
+
+    def __repr__(self):
+        return "Campaign("+repr(self.path)+", "+self.profile.name+")"
+
+    def __len__(self):
+        return self.num_reads
+
+    @cached_property
+    def num_reads(self):
+        iterations = self._iterations
+        if iterations is None:
+            iterations = count_reads(self.path)
+        if iterations == 0:
+            raise FileNotFoundError("No reads found in "+self.path+".")
+        return iterations
+
+    # Chip label of every read, and the read numbers of every chip
+    @cached_property
+    def labels(self):
+        return chip_labels(self.num_reads, self.chips, self.chip_map)
+
+    @cached_property
+    def chip_reads(self):
+        return chip_reads(self.labels)
+
+    # Packed words of every read, (N, bytes per read). For a packed file this is a slice of its memory map.
+    @cached_property
+    def words(self):
+        return load_words(self.path, self.num_reads, profile=self.profile)
+
+    # Raw bits of every read, (N, bits)
+    @cached_property
+    def bits(self):
+        return np.unpackbits(np.asarray(self.words), axis=1)
+
+    # Number of reads each bit powered up as 1 in
+    @cached_property
+    def weights(self):
+        with stage('accumulate'):
+            weights = self.bits.sum(axis=0, dtype=np.uint32)
+        count('bits_processed', self.bits.size)
+        return weights
+
+    # Bits of every read with the bands inverted, (N, bits)
+    @cached_property
+    def processed(self):
+        with stage('pre_process'):
+            return pre_process(self.bits, self.bands)
+
+    # Summed-area table of the pre-processed reads, (N, height + 1, width + 1)
+    @cached_property
+    def table(self):
+        with stage('block_means'):
+            return summed_area_table(self.processed.reshape(-1, self.profile.height, self.profile.width))
+
+    # Summed-area table of the raw reads, as FixedBlockStats.py and AgeClassifier.py take their blocks
+    @cached_property
+    def raw_table(self):
+        with stage('block_means'):
+            return summed_area_table(self.bits.reshape(-1, self.profile.height, self.profile.width))
+
+    # Block averages of every pre-processed read, {x: (N, x*x)} for every grid size
+    @cached_property
+    def block_means(self):
+        with stage('block_means'):
+            return table_means(self.table, self.grid_sizes)
+
+    # Block averages of every raw read, {x: (N, x*x)}
+    @cached_property
+    def raw_block_means(self):
+        with stage('block_means'):
+            return table_means(self.raw_table, self.grid_sizes)
+
+    # Average of all block averages and standard deviation of the block averages of every read, {x: ((N,), (N,))}
+    @cached_property
+    def block_stats(self):
+        return {x: block_summary(self.block_means[x]) for x in self.grid_sizes}
+
+    # Age classifier feature matrix of the raw reads, (N, 2 * grid sizes): per grid size, the average and standard deviation of the block averages
+    @cached_property
+    def features(self):
+        columns = []
+        for x in self.grid_sizes:
+            columns += list(block_summary(self.raw_block_means[x]))
+        return np.stack(columns, axis=1)
+
+    # Gaussian fit of the block averages of every grid of every read, (mu, sigma), each (N, grid sizes)
+    @cached_property
+    def fits(self):
+        with stage('fit'):
+            return block_fit(self.block_means, self.grid_sizes)
+
+    # Bootstrap intervals of the block statistics of every read, across blocks (see Bootstrap.block_intervals). Kept per setting.
+    def block_intervals(self, resamples=RESAMPLES, confidence=CONFIDENCE, seed=SEED):
+        key = (resamples, confidence, seed)
+        if key not in self._block_intervals:
+            self._block_intervals[key] = block_intervals(self.block_means, resamples, confidence, seed)
+        return self._block_intervals[key]
+
+    # Bootstrap intervals of the fits averaged over the reads of one chip (default: every read), across reads (see Bootstrap.read_intervals)
+    def read_intervals(self, chip=None, resamples=RESAMPLES, confidence=CONFIDENCE, seed=SEED):
+        mu, sigma = self.fits
+        if chip is not None:
+            rows = np.array(self.chip_reads[chip]) - 1
+            mu, sigma = mu[rows], sigma[rows]
+        return read_intervals(mu, sigma, resamples, confidence, seed)
+
+    # Per-bit and summary PUF metrics of the reads (see PufMetrics.puf_metrics), as (arrays, summary)
+    @cached_property
+    def puf_metrics(self):
+        from PufMetrics import puf_metrics
+        return puf_metrics(np.asarray(self.words))
+
+    # Bit distribution of every read (darker pixels were 1 in more reads), as a PIL image
+    @cached_property
+    def bit_distribution(self):
+        from BitmapMaker import create_bit_distribution
+        with stage('render'):
+            return create_bit_distribution(self.weights, self.profile.width, self.profile.height, self.num_reads)
+
+    # Heat map of the bit distribution (see BitmapMaker.create_heat_map), as (PIL image, window averages). Kept per window and stride.
+    def heat_map(self, window=WINDOW, stride=STRIDE):
+        key = (tuple(window), tuple(stride))
+        if key not in self._heat_maps:
+            from BitmapMaker import create_heat_map
+            with stage('render'):
+                self._heat_maps[key] = create_heat_map(self.weights, self.profile.width, self.profile.height, self.num_reads, key[0], key[1])
+        return self._heat_maps[key]
+
+    # Black and white bitmap of read number i (counting from 1), as a PIL image
+    def bitmap(self, i):
+        from BitmapMaker import create_bitmap
+        return create_bitmap(self.bits[i - 1], self.profile.width, self.profile.height)
+
+    # Pre-processed average of the rectangle(s) of rows x cols bits at (top, left), for every read (see BlockEngine.rect_means)
+    def rect_means(self, top, left, rows, cols):
+        return rect_means(self.table, top, left, rows, cols)
+
+    # Errors of the reads against the image written onto the chip (see ImageCompare.image_errors). Kept per reference file.
+    def image_errors(self, reference_file='WrittenImage.csv'):
+        if reference_file not in self._image_errors:
+            from ImageCompare import load_reference, image_errors
+            reference = load_reference(reference_file, self.profile)
+            self._image_errors[reference_file] = image_errors(np.asarray(self.words), reference, self.profile)
+        return self._image_errors[reference_file]
+
+    # Log-likelihood ratio (Aged over Fresh) of every read under a trained AgeClassifier model
+    def age_scores(self, model_file='AgeModel.json'):
+        from AgeClassifier import AgeModel
+        model = AgeModel.load(model_file)
+        if (model.profile.width, model.profile.height) != (self.profile.width, self.profile.height):
+            raise ValueError(self.path+" holds "+self.profile.name+" reads, the model is for "+model.profile.name+".")
+        return model.score(self.features)
+
+    # Saves a histogram of the block averages of grid size x, of read number i or (by default) of every read pooled. Returns the fit (mu, sigma).
+    def plot(self, x, filename, i=None):
+        from ReportMaker import plot_histogram
+        if i is None:
+            return plot_histogram(self.block_means[x].ravel(), filename, self.name+' '+str(x*x)+' Blocks')
+        return plot_histogram(self.block_means[x][i - 1], filename, self.name+' Read '+str(i)+' '+str(x*x)+' Blocks')
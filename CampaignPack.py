@@ -0,0 +1,375 @@
+# ----------------------------------------------------------------------------------
+# A .py script that packs a whole campaign directory of .csv dumps
+# (e.g. 'JUL4' for JUL4_1.csv to JUL4_200.csv) into a single binary file,
+# and the reader the analysis scripts use to get reads back out of it.
+#
+# The packed file is a 64 byte header followed by every read's words, back
+# to back, width*height/8 bytes per read:
+#
+#   magic 'BSCD' | version | chip width | chip height | word size | read count
+#   | chip ID (16 bytes) | band count | first and last banding limiter of
+#   every band (up to 3) | padding
+#
+# Version 1 files, which held a single band, are still read.
+#
+# Reading a packed campaign memory-maps it with np.memmap, so every read is
+# a zero-copy slice (8kB for the 8kB chip) instead of a text file to re-parse.
+#
+# load_campaign() accepts either the .csv directory or the packed file, and is
+# what the analysis scripts call to get their reads. follow_campaign() does
+# the same for a directory that is still being written by read100.c /
+# read200.c, handing over each dump as soon as it is complete, and
+# follow_reads() drives the '--follow' mode of the analysis scripts with it.
+#
+# To use: Place file directory under the working directory and run the
+# script. The packed file is saved as '<directory>.bscd' in the working
+# directory. Run with no arguments to be prompted for the directory and chip
+# ID, or see 'python CampaignPack.py -h' for the 'run' and 'batch'
+# subcommands.
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py). The geometry is saved in the header, so
+# readers of a packed file never need to be told it.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import csv
+import os
+import struct
+import time
+import numpy as np
+from DumpLoader import Dump, load_dump, fixed_dump_size
+from PreProcess import BANDS, normalize_bands
+from ChipProfile import DEFAULT_PROFILE, get_profile, profile_for_geometry
+from CommandLine import build_parser, add_band_option, add_chip_option, bands_from_args, profile_from_args, run_batch
+from Instrument import run_main
+
+PACK_EXTENSION = '.bscd'
+PACK_MAGIC = b'BSCD'
+PACK_VERSION = 2
+HEADER_FORMAT = '<4sHHHHI16sH'      # Fixed part, up to the band count
+BAND_FORMAT = '<II'                 # One band, after the fixed part
+HEADER_SIZE = 64
+CHIP_ID_SIZE = 16                   # Bytes of the chip ID field
+MAX_BANDS = (HEADER_SIZE - struct.calcsize(HEADER_FORMAT)) // struct.calcsize(BAND_FORMAT)
+V1_HEADER_FORMAT = '<4sHHHHI16sII'  # Version 1: one band, none stored as 1..0
+
+
+# Header of a packed campaign file
+class PackHeader:
+    def __init__(self, width, height, word_size, read_count, chip_id='', bands=BANDS):
+        self.width = width
+        self.height = height
+        self.word_size = word_size
+        self.read_count = read_count
+        self.chip_id = chip_id
+        self.bands = normalize_bands(bands)
+        if not chip_id.isascii() or len(chip_id) > CHIP_ID_SIZE:
+            raise ValueError("Chip ID '"+chip_id+"' does not fit the header: at most "+str(CHIP_ID_SIZE)+" ASCII characters.")
+        if len(self.bands) > MAX_BANDS:
+            raise ValueError("A packed file holds at most "+str(MAX_BANDS)+" bands, not "+str(len(self.bands))+".")
+
+    # Bytes taken up by one read in the data section
+    @property
+    def read_bytes(self):
+        return self.width * self.height // 8
+
+    # Chip profile of the packed reads, with every band of the header
+    def profile(self):
+        return profile_for_geometry(self.width, self.height, self.word_size, self.bands)
+
+    def to_bytes(self):
+        packed = struct.pack(HEADER_FORMAT, PACK_MAGIC, PACK_VERSION, self.width, self.height, self.word_size,
+                             self.read_count, self.chip_id.encode('ascii'), len(self.bands))
+        for band in self.bands:
+            packed += struct.pack(BAND_FORMAT, *band)
+        return packed.ljust(HEADER_SIZE, b'\0')
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version = struct.unpack_from('<4sH', data)
+        if magic != PACK_MAGIC:
+            raise ValueError("Not a packed campaign file.")
+
+        # Version 1 held one band, and a band with last < first for none
+        if version == 1:
+            magic, version, width, height, word_size, read_count, chip_id, first_band, last_band = struct.unpack_from(V1_HEADER_FORMAT, data)
+            bands = [(first_band, last_band)] if last_band >= first_band else []
+        elif version == PACK_VERSION:
+            magic, version, width, height, word_size, read_count, chip_id, band_count = struct.unpack_from(HEADER_FORMAT, data)
+            if band_count > MAX_BANDS:
+                raise ValueError("Corrupt packed campaign header ("+str(band_count)+" bands).")
+            offset = struct.calcsize(HEADER_FORMAT)
+            size = struct.calcsize(BAND_FORMAT)
+            bands = [struct.unpack_from(BAND_FORMAT, data, offset + k * size) for k in range(band_count)]
+        else:
+            raise ValueError("Unsupported packed campaign version "+str(version)+".")
+        return cls(width, height, word_size, read_count, chip_id.rstrip(b'\0').decode('ascii'), bands)
+
+
+# A packed campaign opened for reading. Reads are zero-copy slices of a memory-mapped file.
+class PackedCampaign:
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            self.header = PackHeader.from_bytes(f.read(HEADER_SIZE))
+        self.words = np.memmap(filename, dtype=np.uint8, mode='r', offset=HEADER_SIZE,
+                               shape=(self.header.read_count, self.header.read_bytes))
+        self.addresses = np.arange(self.header.read_bytes * 8 // self.header.word_size)
+
+    def __len__(self):
+        return self.header.read_count
+
+    # Read number i, counting from 1 like the .csv file names do
+    def read(self, i):
+        if i < 1 or i > len(self):
+            raise FileNotFoundError("Read "+str(i)+" is not in this packed campaign.")
+        return Dump(self.addresses, self.words[i - 1], self.header.width, self.header.height)
+
+
+# Campaign name used for output files: 'JUL4' for both the JUL4 directory and JUL4.bscd
+def campaign_name(path):
+    name = os.path.basename(os.path.normpath(path))
+    if name.endswith(PACK_EXTENSION):
+        name = name[:-len(PACK_EXTENSION)]
+    return name
+
+
+# Path of read number i of a .csv campaign directory, e.g. JUL4/JUL4_7.csv
+def dump_path(input_dir, i):
+    return os.path.join(input_dir, campaign_name(input_dir)+'_'+str(i)+'.csv')
+
+
+# Chip profile of a campaign: the one in the header of a packed file, otherwise the given one
+def campaign_profile(path, profile=DEFAULT_PROFILE):
+    if os.path.isfile(path):
+        return PackedCampaign(path).header.profile()
+    return get_profile(profile)
+
+
+# Yields reads first..iterations of a campaign, one Dump at a time, from either its .csv directory or its packed file.
+# If iterations is None every read is yielded (for a directory, up to the first missing file).
+# Dumps in a directory are laid out as 'profile' says; a packed file carries its own geometry.
+def iter_campaign(path, iterations=None, first=1, profile=DEFAULT_PROFILE):
+    if os.path.isfile(path):
+        packed = PackedCampaign(path)
+        if iterations is None:
+            iterations = len(packed)
+        for i in range(first, iterations + 1):
+            yield packed.read(i)
+        return
+
+    if not os.path.isdir(path):
+        raise FileNotFoundError("This directory does not exist.")
+
+    i = first
+    while iterations is None or i <= iterations:
+        filename = dump_path(path, i)
+        if not os.path.exists(filename):
+            if iterations is None:
+                break
+            raise FileNotFoundError("File '"+os.path.basename(filename)+"' does not exist.")
+        yield load_dump(filename, profile.width, profile.height, profile.word_size)
+        i += 1
+
+
+# Loads reads first..iterations of a campaign into a list. See iter_campaign.
+def load_campaign(path, iterations=None, first=1, profile=DEFAULT_PROFILE):
+    return list(iter_campaign(path, iterations, first, profile))
+
+
+# Yields reads first..iterations (or on and on, if iterations is None) of a .csv campaign directory that is still being written,
+# one Dump at a time as soon as each dump is complete. A dump is complete once it has the exact size of a full read in the
+# read100.c / read200.c layout, or (for any other layout) once the next dump has been started or its size has held still
+# for a whole poll, and it parses to a full read. Stops when idle_timeout seconds go by without a new or growing dump.
+def follow_campaign(path, iterations=None, first=1, profile=DEFAULT_PROFILE, poll=0.5, idle_timeout=None):
+    if os.path.isfile(path):
+        raise ValueError("Only a campaign directory being written can be followed, not a packed file.")
+
+    full_size = fixed_dump_size(profile.num_words, profile.word_size)
+    i = first
+    last_size = None
+    last_change = time.monotonic()
+    while iterations is None or i <= iterations:
+        filename = dump_path(path, i)
+        size = os.path.getsize(filename) if os.path.exists(filename) else None
+        if size is not None and (size == full_size or size == last_size or os.path.exists(dump_path(path, i + 1))):
+            try:
+                dump = load_dump(filename, profile.width, profile.height, profile.word_size)
+            except ValueError:
+                dump = None # still half a line at the end
+            if dump is not None and dump.words.size >= profile.read_bytes:
+                yield dump
+                i += 1
+                last_size = None
+                last_change = time.monotonic()
+                continue
+
+        if size != last_size:
+            last_change = time.monotonic()
+        last_size = size
+        if idle_timeout is not None and time.monotonic() - last_change > idle_timeout:
+            return
+        time.sleep(poll)
+
+
+# Follows a campaign directory while it is being written (see follow_campaign), handing every complete dump to take(dump) if given.
+# Every 'refresh' seconds update(reads) is called with the number of complete reads so far, and once more at the end if reads came
+# in since. Stops after 'iterations' reads, or when no new dump has come in for idle_timeout seconds. Returns the number of reads.
+def follow_reads(path, iterations, update, profile=DEFAULT_PROFILE, poll=0.5, refresh=5.0, idle_timeout=60.0, take=None):
+    reads = 0
+    refreshed = 0
+    last_refresh = time.monotonic()
+    for dump in follow_campaign(path, iterations, 1, profile, poll, idle_timeout):
+        reads += 1
+        if take is not None:
+            take(dump)
+        if time.monotonic() - last_refresh >= refresh:
+            update(reads)
+            print(str(reads)+" reads in, outputs refreshed")
+            last_refresh = time.monotonic()
+            refreshed = reads
+
+    if reads == 0:
+        raise FileNotFoundError("No reads came in to "+path+".")
+    if reads != refreshed:
+        update(reads)
+    return reads
+
+
+# Packed words of reads first..iterations as one (N, bytes per read) uint8 array, with N = 0 if there are no reads.
+# For a packed file this is a zero-copy slice of the memory map.
+def load_words(path, iterations=None, first=1, profile=DEFAULT_PROFILE):
+    if os.path.isfile(path):
+        packed = PackedCampaign(path)
+        if iterations is None:
+            iterations = len(packed)
+        if iterations > len(packed):
+            raise FileNotFoundError("Read "+str(iterations)+" is not in this packed campaign.")
+        return packed.words[first - 1:iterations]
+
+    words = [dump.words[:profile.read_bytes] for dump in iter_campaign(path, iterations, first, profile)]
+    if not words:
+        return np.zeros((0, profile.read_bytes), dtype=np.uint8)
+    return np.stack(words)
+
+
+# Number of reads in a campaign: the read count of a packed file, or the consecutive dumps found in a directory
+def count_reads(path):
+    if os.path.isfile(path):
+        return len(PackedCampaign(path))
+    count = 0
+    while os.path.exists(dump_path(path, count + 1)):
+        count += 1
+    return count
+
+
+# Reads a chip map: a .csv file of 'Read,Chip' rows tagging every read number with the chip it came from.
+def load_chip_map(filename):
+    chip_map = {}
+    with open(filename, 'r', newline='') as csvfile:
+        csvreader = csv.reader(csvfile)
+        next(csvreader) # skips "Read,Chip" header line
+        for row in csvreader:
+            if row:
+                chip_map[int(row[0])] = row[1].strip()
+    return chip_map
+
+
+# Chip label of each of reads 1..num_reads, as an array of strings.
+# Without a chip map the reads are split evenly in order, the way read200.c takes them:
+# reads 1..100 from chip 1 (/dev/spidev0.0), reads 101..200 from chip 2 (/dev/spidev0.1).
+def chip_labels(num_reads, chips=1, chip_map=None):
+    if chip_map is None:
+        return (1 + np.arange(num_reads) * chips // num_reads).astype(str)
+
+    if isinstance(chip_map, str):
+        chip_map = load_chip_map(chip_map)
+    missing = [i for i in range(1, num_reads + 1) if i not in chip_map]
+    if missing:
+        raise ValueError("Chip map does not tag read "+str(missing[0])+".")
+    return np.array([chip_map[i] for i in range(1, num_reads + 1)])
+
+
+# Read numbers of every chip, as {chip label: sorted list of read numbers}, in order of first appearance
+def chip_reads(labels):
+    reads = {}
+    for i, label in enumerate(labels.tolist(), 1):
+        reads.setdefault(label, []).append(i)
+    return reads
+
+
+# Packs reads 1..iterations of a .csv campaign directory into one binary file. Returns the header written.
+# The bands stored default to those of the profile (at most MAX_BANDS).
+def pack_campaign(input_dir, output_file, iterations=None, chip_id='', bands=None, profile=DEFAULT_PROFILE):
+    profile = get_profile(profile)
+    if bands is None:
+        bands = profile.bands
+
+    # The header is checked before any dump is read
+    header = PackHeader(profile.width, profile.height, profile.word_size, 0, chip_id, bands)
+    dumps = load_campaign(input_dir, iterations, profile=profile)
+    header.read_count = len(dumps)
+
+    with open(output_file, 'wb') as f:
+        f.write(header.to_bytes())
+        for dump in dumps:
+            words = dump.words[:header.read_bytes]
+            if words.size != header.read_bytes:
+                raise ValueError("Dump holds "+str(words.size)+" words, expected "+str(header.read_bytes)+".")
+            f.write(words.tobytes())
+
+    return header
+
+
+# Packs one campaign directory into '<name>.bscd' in the working directory. Returns the packed file.
+# A packed file (e.g. one a batch pattern also matched) is left as it is.
+def pack_one(input_dir, chip_id='', bands=None, profile=DEFAULT_PROFILE):
+    if os.path.isfile(input_dir) and input_dir.endswith(PACK_EXTENSION):
+        print(input_dir+" is already packed.")
+        return input_dir
+
+    # If directory doesn't exist, throw error
+    if not os.path.isdir(input_dir):
+        raise FileNotFoundError("This directory does not exist.")
+
+    output_file = campaign_name(input_dir) + PACK_EXTENSION
+    header = pack_campaign(input_dir, output_file, chip_id=chip_id, bands=bands, profile=profile)
+    print(str(header.read_count)+" reads packed into "+output_file+".")
+    return output_file
+
+
+def add_options(parser):
+    parser.add_argument('--chip-id', default='', help="chip ID saved in the header, at most "+str(CHIP_ID_SIZE)+" ASCII characters (default none)")
+    add_band_option(parser)
+    add_chip_option(parser)
+
+def main():
+    args = build_parser("Pack a .csv campaign directory into one binary file.", add_options, input_help="campaign directory").parse_args()
+
+    try:
+        # Batch mode: every campaign directory matching the pattern(s), no prompts
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: pack_one(path, args.chip_id, bands_from_args(args), profile_from_args(args)))
+
+        # Get directory
+        if args.command == 'run':
+            input_dir = args.input
+            chip_id = args.chip_id
+        else:
+            input_dir = input("Enter the input directory (e.g. 'JUL4' for JUL4_1.csv to JUL4_200.csv): ")
+            chip_id = input("Enter the chip ID (leave blank if none): ").strip()
+
+        pack_one(input_dir, chip_id, bands_from_args(args), profile_from_args(args))
+
+    # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'CampaignPack')
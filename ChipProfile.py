@@ -0,0 +1,91 @@
+# ----------------------------------------------------------------------------------
+# Chip profiles: the geometry of an SRAM device as the analysis sees it.
+#
+# A profile holds the bit grid (rows x cols), the word size (bits per
+# address in the dumps), the banded section(s) to invert and, for the
+# devices the binary image was written onto, the height of that image.
+# Everything else is derived from it: number of addresses, bytes per read,
+# the block layout and block sizes of every grid.
+#
+# The scripts take a profile by name with '--chip' (default '8kB', the
+# 23K640 the campaigns so far were taken on). Packed .bscd files carry their
+# own geometry in the header, which always wins over the command line.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+from BlockEngine import GRID_SIZES, block_layout
+from PreProcess import BANDS, normalize_bands
+
+
+class ChipProfile:
+    def __init__(self, name, width, height, word_size=8, bands=(), image_height=None):
+        self.name = name
+        self.width = width                  # bits per row of the grid
+        self.height = height                # rows of the grid
+        self.word_size = word_size          # bits per address in a dump
+        self.bands = normalize_bands(bands) # (first, last) bit ranges to invert, both ends inclusive
+        self.image_height = image_height    # rows of the binary image written by img_write.c, None if never written
+
+    @property
+    def num_bits(self):
+        return self.width * self.height
+
+    # Addresses (rows of a dump file)
+    @property
+    def num_words(self):
+        return self.num_bits // self.word_size
+
+    @property
+    def max_address(self):
+        return self.num_words - 1
+
+    # Bytes taken up by the words of one read
+    @property
+    def read_bytes(self):
+        return self.num_bits // 8
+
+    # (chunk_size, chunks_per_row, x_offset) of a grid of num_of_blocks blocks
+    def block_layout(self, num_of_blocks):
+        return block_layout(num_of_blocks, self.width, self.height)
+
+    # Bits in one block of every grid size, e.g. [16384, 7225, ...] for the 8kB chip
+    def block_sizes(self, grid_sizes=GRID_SIZES):
+        return [self.block_layout(x * x)[0] ** 2 for x in grid_sizes]
+
+    # Everything that affects the outputs, for the stats manifest
+    def to_dict(self):
+        return {'name': self.name, 'width': self.width, 'height': self.height, 'word_size': self.word_size, 'bands': [list(band) for band in self.bands]}
+
+
+# Known devices. Only the 8kB chip has a measured banding; pass --band for the others.
+PROFILES = {
+    '8kB': ChipProfile('8kB', 256, 256, 8, BANDS, image_height=156),    # 23K640
+    '32kB': ChipProfile('32kB', 512, 512, 8),                           # 23K256
+    '128kB': ChipProfile('128kB', 1024, 1024, 8),                       # 23LC1024
+}
+DEFAULT_PROFILE = PROFILES['8kB']
+
+
+def get_profile(name):
+    if isinstance(name, ChipProfile):
+        return name
+    if name not in PROFILES:
+        raise ValueError("Unknown chip '"+str(name)+"'. Known chips: "+', '.join(PROFILES)+".")
+    return PROFILES[name]
+
+
+# Profile of a grid found in a packed file header: the known one with that geometry, or a new one named after its size
+def profile_for_geometry(width, height, word_size=8, bands=None):
+    for profile in PROFILES.values():
+        if (profile.width, profile.height, profile.word_size) == (width, height, word_size):
+            if bands is None or normalize_bands(bands) == profile.bands:
+                return profile
+            return ChipProfile(profile.name, width, height, word_size, bands, profile.image_height)
+    return ChipProfile(str(width * height // 8192)+'kB', width, height, word_size, bands if bands is not None else ())
+
@@ -0,0 +1,145 @@
+# ----------------------------------------------------------------------------------
+# Consolidated, columnar statistics output: one file per campaign instead of
+# one small .csv file per read.
+#
+# A table is a dict of equal-length numpy columns:
+#
+#   read    read number (from 1)
+#   chip    chip the read came from ('1', '2', ... or the chip map label)
+#   grid    blocks per side of the grid (2 .. 20)
+#   block   block index within the grid, row-major; -1 for a row that
+#           summarizes every block of the grid
+#   mean    block average (or the mean of the block averages), full precision
+#   std     standard deviation of the block averages (NaN for a single block)
+#   mean_ci_low, mean_ci_high, std_ci_low, std_ci_high
+#           bootstrap confidence interval of mean and std (see Bootstrap.py),
+#           NaN when the statistics were made without intervals
+#
+# Tables are saved as .npz (always available) or .parquet (needs pyarrow).
+# When only some reads of a campaign are recomputed, their rows replace the
+# old ones in the existing file and every other read is kept.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import numpy as np
+
+COLUMNS = ['read', 'chip', 'grid', 'block', 'mean', 'std', 'mean_ci_low', 'mean_ci_high', 'std_ci_low', 'std_ci_high']
+INTERVAL_COLUMNS = COLUMNS[6:]
+FORMATS = {'npz': '.npz', 'parquet': '.parquet'}
+
+
+# Name of the consolidated file of a campaign, e.g. 'JUL4_BlockStats.npz'
+def table_name(name, kind, fmt='npz'):
+    if fmt not in FORMATS:
+        raise ValueError("Unknown table format '"+str(fmt)+"'.")
+    return name+'_'+kind+FORMATS[fmt]
+
+
+# Builds a table from its columns, with fixed dtypes. chip defaults to '' (filled in by with_chips).
+# intervals, if given, holds the four INTERVAL_COLUMNS; they default to NaN.
+def make_table(read, grid, block, mean, std, chip=None, intervals=None):
+    read = np.asarray(read, dtype=np.int32)
+    if chip is None:
+        chip = np.full(read.shape, '')
+    if intervals is None:
+        intervals = [np.full(read.shape, np.nan) for column in INTERVAL_COLUMNS]
+    table = {
+        'read': read,
+        'chip': np.asarray(chip, dtype=str),
+        'grid': np.asarray(grid, dtype=np.int16),
+        'block': np.asarray(block, dtype=np.int32),
+        'mean': np.asarray(mean, dtype=np.float64),
+        'std': np.asarray(std, dtype=np.float64),
+    }
+    for column, values in zip(INTERVAL_COLUMNS, intervals):
+        table[column] = np.asarray(values, dtype=np.float64)
+    return table
+
+
+def empty_table():
+    return make_table([], [], [], [], [])
+
+
+def concat_tables(tables):
+    tables = [table for table in tables if table is not None]
+    if not tables:
+        return empty_table()
+    return {column: np.concatenate([table[column] for table in tables]) for column in COLUMNS}
+
+
+# Rows of a table where keep (a boolean array) is set
+def select_rows(table, keep):
+    return {column: table[column][keep] for column in COLUMNS}
+
+
+# Sets the chip column from chip labels of reads 1..N
+def with_chips(table, labels):
+    table = dict(table)
+    table['chip'] = np.asarray(labels)[table['read'] - 1].astype(str)
+    return table
+
+
+# Replaces the rows of the reads in 'new' and drops reads no longer in 'reads'. Sorted by read, grid, block.
+def merge_tables(old, new, reads):
+    if old is not None:
+        keep = np.isin(old['read'], list(reads)) & ~np.isin(old['read'], new['read'])
+        new = concat_tables([select_rows(old, keep), new])
+    order = np.lexsort((new['block'], new['grid'], new['read']))
+    return select_rows(new, order)
+
+
+# pyarrow is only needed for .parquet tables, so it is imported on first use
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet tables need the pyarrow package. Use the npz format instead.")
+    return pyarrow
+
+
+def write_table(filename, table):
+    # Written beside the old file and moved over it, so a crash never leaves half a table
+    tmp_path = filename + '.tmp'
+    if filename.endswith(FORMATS['parquet']):
+        pyarrow = import_pyarrow()
+        pyarrow.parquet.write_table(pyarrow.table({column: table[column] for column in COLUMNS}), tmp_path)
+    else:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **table)
+    os.replace(tmp_path, filename)
+
+
+def read_table(filename):
+    # If file doesn't exist, throw error
+    if not os.path.exists(filename):
+        raise FileNotFoundError("Table "+filename+" does not exist.")
+
+    if filename.endswith(FORMATS['parquet']):
+        columns = import_pyarrow().parquet.read_table(filename).to_pydict()
+    else:
+        with np.load(filename) as data:
+            columns = {column: data[column] for column in COLUMNS if column in data}
+
+    # Tables written before the interval columns existed have none
+    intervals = None
+    if all(column in columns for column in INTERVAL_COLUMNS):
+        intervals = [columns[column] for column in INTERVAL_COLUMNS]
+    return make_table(columns['read'], columns['grid'], columns['block'], columns['mean'], columns['std'], columns['chip'], intervals)
+
+
+# Merges freshly computed rows into the campaign's table file (if any) and writes it back with the chip column set.
+def update_table(filename, new_tables, reads, labels):
+    old = None
+    if os.path.exists(filename):
+        old = read_table(filename)
+    table = with_chips(merge_tables(old, concat_tables(new_tables), reads), labels)
+    write_table(filename, table)
+    return table
@@ -0,0 +1,183 @@
+# ----------------------------------------------------------------------------------
+# Shared command line for the analysis scripts.
+#
+# Every script keeps its old behaviour when run with no subcommand (it asks
+# for its parameters with input() prompts), and also accepts:
+#
+#   <script>.py run INPUT [options]          one campaign, no prompts
+#   <script>.py batch PATTERN [...] [options] every campaign matching the glob(s)
+#
+# The batch subcommand processes all matching campaign directories (or packed
+# .bscd files) in one interpreter, so startup and imports are paid once, and
+# reports how long each one took. A campaign that fails is reported and
+# skipped; the rest of the batch still runs.
+#
+# Every mode also takes '--report FILE' (a JSON report of the time spent in
+# each stage) and '--profile FILE' (a cProfile run); see Instrument.py.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import argparse
+import glob
+import os
+import time
+from PreProcess import parse_band
+from ChipProfile import DEFAULT_PROFILE, PROFILES, get_profile
+from Bootstrap import RESAMPLES, CONFIDENCE, SEED
+from Instrument import add_profile_option
+
+
+# Builds the parser. add_options(parser) adds the script's own flags, which every subcommand (and the prompt mode) accepts.
+# The flags may come before or after the subcommand: the subcommand copies have no defaults of their own, so they only
+# overwrite what was given before the subcommand when they are given again after it.
+def build_parser(description, add_options, input_help="campaign directory or packed .bscd file"):
+    parser = argparse.ArgumentParser(description=description)
+    add_options(parser)
+    add_profile_option(parser)
+
+    options = argparse.ArgumentParser(add_help=False)
+    add_options(options)
+    add_profile_option(options)
+    for action in options._actions:
+        action.default = argparse.SUPPRESS
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    run = subparsers.add_parser('run', parents=[options], help="process one input without prompting")
+    run.add_argument('input', help=input_help)
+
+    batch = subparsers.add_parser('batch', parents=[options], help="process every input matching the glob pattern(s)")
+    batch.add_argument('patterns', nargs='+', metavar='PATTERN', help="glob pattern, e.g. 'JUL*' (quote it)")
+
+    return parser
+
+
+# Adds the flag for the two-chip campaigns (reads 1..200 instead of 1..100)
+def add_two_chips_option(parser):
+    parser.add_argument('--two-chips', action='store_true', help="campaign holds 200 reads over 2 chips (default: 1 chip, 100 reads)")
+
+
+# Adds the flags for tagging the reads of a campaign by chip
+def add_chips_option(parser):
+    parser.add_argument('--chips', type=int, default=1, help="number of chips the reads are split over evenly, in order (default 1)")
+    add_chip_map_option(parser)
+
+
+# Adds the flag for a chip map, for the tools whose reads are otherwise split evenly by --chips or --two-chips
+def add_chip_map_option(parser):
+    parser.add_argument('--chip-map', metavar='FILE', help="'Read,Chip' .csv file tagging each read with its chip (overrides the even split)")
+
+
+# Adds the flag for spreading the reads of a campaign over a process pool
+def add_workers_option(parser):
+    parser.add_argument('--workers', type=int, default=1, help="number of processes to spread the reads over (default 1)")
+
+
+# Adds the flag for the banded section(s) to invert. Given more than once for chips with several bands.
+def add_band_option(parser):
+    parser.add_argument('--band', action='append', type=parse_band, metavar='FIRST:LAST',
+                        help="bit range to invert, both ends inclusive; repeat for several bands (default: the chip's own, "
+                             +' '.join(str(first)+':'+str(last) for first, last in DEFAULT_PROFILE.bands)+" for the "+DEFAULT_PROFILE.name+" chip)")
+
+
+# Band list chosen on the command line, or None for the chip's own
+def bands_from_args(args):
+    if args.band:
+        return args.band
+    return None
+
+
+# Adds the flag for the chip profile (geometry, word size and banding) of the dumps
+def add_chip_option(parser):
+    parser.add_argument('--chip', choices=list(PROFILES), default=DEFAULT_PROFILE.name,
+                        help="chip the dumps were read from (default "+DEFAULT_PROFILE.name+"); packed files carry their own")
+
+
+# Chip profile chosen on the command line, or the default one
+def profile_from_args(args):
+    return get_profile(getattr(args, 'chip', DEFAULT_PROFILE.name))
+
+
+# Adds the flags for bootstrap confidence intervals of the block statistics (see Bootstrap.py)
+def add_ci_option(parser):
+    parser.add_argument('--ci', action='store_true', help="add bootstrap confidence interval columns to the statistics")
+    parser.add_argument('--resamples', type=int, default=RESAMPLES, help="with --ci, bootstrap resamples (default "+str(RESAMPLES)+")")
+    parser.add_argument('--confidence', type=float, default=CONFIDENCE, help="with --ci, confidence level (default "+str(CONFIDENCE)+")")
+    parser.add_argument('--seed', type=int, default=SEED, help="with --ci, seed of the resampling (default "+str(SEED)+")")
+
+
+# Bootstrap settings chosen on the command line as (resamples, confidence, seed), or None without --ci
+def ci_from_args(args):
+    if not getattr(args, 'ci', False):
+        return None
+    if args.resamples < 1 or not 0 < args.confidence < 1:
+        raise ValueError("--resamples must be at least 1 and --confidence between 0 and 1.")
+    return args.resamples, args.confidence, args.seed
+
+
+# Adds the flags for the consolidated, one-file-per-campaign output (see ColumnarStats.py)
+def add_columnar_option(parser):
+    parser.add_argument('--columnar', choices=['npz', 'parquet'],
+                        help="write one table per campaign in this format instead of a .csv file per read")
+    parser.add_argument('--legacy-csv', action='store_true', help="with --columnar, still write the per-read .csv files too")
+
+
+# Adds the flags for the SQLite results store (see ResultsStore.py). With default=None the store is only filled when --store is given.
+def add_store_option(parser, default=None):
+    if default is None:
+        parser.add_argument('--store', metavar='FILE', help="also store the statistics in this SQLite results database")
+    else:
+        parser.add_argument('--store', metavar='FILE', default=default, help="SQLite results database (default "+default+")")
+    parser.add_argument('--date', help="with --store, date of the campaign as YYYY-MM-DD (default: from its name, e.g. JUL4, or its dumps)")
+
+
+# Adds the flags for following a campaign directory while the acquisition program is still writing it
+def add_follow_option(parser):
+    parser.add_argument('--follow', action='store_true', help="watch the campaign directory and take in each dump as soon as it is written")
+    parser.add_argument('--poll', type=float, default=0.5, help="with --follow, seconds between looks at the directory (default 0.5)")
+    parser.add_argument('--refresh', type=float, default=5.0, help="with --follow, seconds between rewrites of the outputs (default 5)")
+    parser.add_argument('--idle-timeout', type=float, default=60.0, help="with --follow, stop once no new dump has come in for this many seconds (default 60)")
+
+
+# Adds the flag for ignoring the output manifest and recomputing every read
+def add_force_option(parser):
+    parser.add_argument('--force', action='store_true', help="recompute every read, even if its output is up to date")
+
+
+# Expands the glob pattern(s) into a sorted list of campaign directories / packed files, skipping Stats output directories.
+def expand_patterns(patterns):
+    paths = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            if os.path.isdir(path) and path.rstrip('/\\').endswith('Stats'):
+                continue
+            paths.add(path)
+    return sorted(paths)
+
+
+# Runs run_one(path) for every input matching the pattern(s) and prints per-input timing. Returns the number of failures.
+def run_batch(patterns, run_one):
+    paths = expand_patterns(patterns)
+    if not paths:
+        raise FileNotFoundError("No input matches "+' '.join(patterns)+".")
+
+    failures = 0
+    batch_start = time.perf_counter()
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            run_one(path)
+            status = "done"
+        except Exception as e:
+            failures += 1
+            status = "FAILED ("+str(e)+")"
+        print("{}: {} in {:.2f} s".format(path, status, time.perf_counter() - start))
+
+    print("{} of {} inputs processed in {:.2f} s".format(len(paths) - failures, len(paths), time.perf_counter() - batch_start))
+    return failures
@@ -0,0 +1,181 @@
+# ----------------------------------------------------------------------------------
+# Shared loader for .csv dump files deliminated into "Address,Word" format,
+# as written by read100.c / read200.c.
+#
+# A dump is parsed straight into a packed uint8 array of words (one entry per
+# address). The individual bits are only unpacked, with np.unpackbits, the
+# first time they are asked for, and are then kept as a (height, width) view so
+# the analysis scripts can slice rows and columns directly.
+#
+# Dumps exactly as read100.c / read200.c write them (the header, then one
+# '%04x,%02x' line per address, addresses 0, 1, 2, ... in order) are decoded
+# straight from the raw bytes: the file is viewed as a (lines, line width)
+# array and the word column is looked up through a hex table in one step.
+# Anything else (the header without a newline from readbothonce.c, the
+# repeated 0000 row at the top of WrittenImage.csv, other widths) falls back
+# to the line-by-line parser, which accepts it as before.
+#
+# read_csv() is kept with the same signature and output as the per-script
+# copies it replaces, so existing callers give bit-identical results.
+#
+# The defaults are for a memory device of size 8kB; see ChipProfile.py for
+# the geometry of the others.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import numpy as np
+from Instrument import stage, count
+
+# Constants (Change if necessary, currently set for 8kB chip)
+CHIP_WIDTH = 256
+CHIP_HEIGHT = 256
+WORD_SIZE = 8
+
+HEADER = b'Address,Word'
+ADDRESS_DIGITS = 4
+
+# Value of every hex digit byte ('0'-'9', 'a'-'f', 'A'-'F'); 255 for any other byte
+HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+HEX_VALUES[np.frombuffer(b'0123456789', dtype=np.uint8)] = np.arange(10)
+HEX_VALUES[np.frombuffer(b'abcdef', dtype=np.uint8)] = np.arange(10, 16)
+HEX_VALUES[np.frombuffer(b'ABCDEF', dtype=np.uint8)] = np.arange(10, 16)
+
+# Address columns already built, by number of addresses
+_address_columns = {}
+
+
+# A single parsed dump. 'words' holds one packed byte per row of the file, bits are unpacked lazily.
+class Dump:
+    def __init__(self, addresses, words, width=CHIP_WIDTH, height=CHIP_HEIGHT):
+        self.addresses = addresses
+        self.words = words
+        self.width = width
+        self.height = height
+        self._flat_bits = None
+
+    # Every bit of the dump, MSB first within each word, as a flat uint8 array of 0s and 1s.
+    @property
+    def flat_bits(self):
+        if self._flat_bits is None:
+            self._flat_bits = np.unpackbits(self.words)
+        return self._flat_bits
+
+    # (height, width) view of the chip. Extra trailing rows in the file (if any) are left out.
+    @property
+    def bits(self):
+        num_bits = self.width * self.height
+        if self.flat_bits.size < num_bits:
+            raise ValueError("Dump holds "+str(self.flat_bits.size)+" bits, expected at least "+str(num_bits)+".")
+        return self.flat_bits[:num_bits].reshape(self.height, self.width)
+
+
+# Splits the text of a dump into an int array of addresses and a packed uint8 array of words.
+# Words wider than 8 bits are stored most significant byte first, so the bits keep their order.
+def parse_dump(text, word_size=WORD_SIZE):
+    lines = text.split()
+    if lines and lines[0].startswith('Address,Word'):
+        # skips "Address,Word" header line. readbothonce.c writes it without a newline, so keep whatever follows it
+        lines[0] = lines[0][len('Address,Word'):]
+        if not lines[0]:
+            lines = lines[1:]
+
+    addr_col = []
+    word_col = []
+    for line in lines:
+        address, byte = line.split(',')
+        addr_col.append(address)
+        word_col.append(byte.zfill(word_size // 4))
+
+    # bytes.fromhex decodes the whole word column in a single call
+    words = np.frombuffer(bytes.fromhex(''.join(word_col)), dtype=np.uint8)
+    addresses = np.array([int(address, 16) for address in addr_col], dtype=np.int64)
+
+    return addresses, words
+
+
+# The text '0000', '0001', ... of addresses 0..num_words-1 as a (num_words, 4) uint8 array, built once per size
+def address_column(num_words):
+    if num_words not in _address_columns:
+        text = ''.join(['%04x' % i for i in range(num_words)]).encode()
+        _address_columns[num_words] = np.frombuffer(text, dtype=np.uint8).reshape(num_words, ADDRESS_DIGITS)
+    return _address_columns[num_words]
+
+
+# Size in bytes of a dump of num_words words in the fixed layout read100.c / read200.c write, or None if its addresses need more than 4 digits
+def fixed_dump_size(num_words, word_size=WORD_SIZE):
+    if num_words > 16 ** ADDRESS_DIGITS:
+        return None
+    return len(HEADER) + 1 + num_words * (ADDRESS_DIGITS + 1 + word_size // 4 + 1)
+
+
+# Decodes the raw bytes of a dump in the fixed layout read100.c / read200.c write, into an int array of addresses and a packed uint8 array of words.
+# Returns None if the bytes are laid out any other way (the caller falls back to parse_dump).
+def parse_fixed(data, word_size=WORD_SIZE):
+    digits = word_size // 4
+    if not data.startswith(HEADER) or digits % 2:
+        return None
+
+    # Lines end in '\n', or '\r\n' if the file went through Windows; the header line tells which
+    if data[len(HEADER):len(HEADER) + 1] == b'\n':
+        eol = 1
+    elif data[len(HEADER):len(HEADER) + 2] == b'\r\n':
+        eol = 2
+    else:
+        return None
+    line = ADDRESS_DIGITS + 1 + digits + eol
+    body = np.frombuffer(data, dtype=np.uint8, offset=len(HEADER) + eol)
+    if body.size == 0 or body.size % line:
+        return None
+
+    # One row per line; every column below is a strided view, nothing is copied until the lookup
+    rows = body.reshape(-1, line)
+    if (rows[:, ADDRESS_DIGITS] != ord(',')).any() or (rows[:, -1] != ord('\n')).any():
+        return None
+    if eol == 2 and (rows[:, -2] != ord('\r')).any():
+        return None
+
+    # Address continuity: the address column has to read 0000, 0001, ... byte for byte, so it is never decoded
+    if not np.array_equal(rows[:, :ADDRESS_DIGITS], address_column(rows.shape[0])):
+        return None
+
+    nibbles = HEX_VALUES[rows[:, ADDRESS_DIGITS + 1:ADDRESS_DIGITS + 1 + digits]]
+    if (nibbles == 255).any():
+        return None
+    words = (nibbles[:, 0::2] << 4 | nibbles[:, 1::2]).ravel()
+
+    return np.arange(rows.shape[0], dtype=np.int64), words
+
+
+# Loads one dump file into a Dump object.
+def load_dump(filename, width=CHIP_WIDTH, height=CHIP_HEIGHT, word_size=WORD_SIZE):
+    with stage('parse'):
+        with open(filename, 'rb') as csvfile:
+            data = csvfile.read()
+
+        parsed = parse_fixed(data, word_size)
+        if parsed is None:
+            parsed = parse_dump(data.decode(), word_size)
+        addresses, words = parsed
+    count('dumps_parsed')
+    count('bytes_read', len(data))
+    return Dump(addresses, words, width, height)
+
+
+# Splits a dump holding several chips back to back (as readbothonce.c writes them) into one Dump per chip.
+def split_chips(dump, chips=2):
+    num_words = dump.addresses.size // chips
+    read_bytes = dump.words.size // chips
+    return [Dump(dump.addresses[c * num_words:(c + 1) * num_words], dump.words[c * read_bytes:(c + 1) * read_bytes],
+                 dump.width, dump.height) for c in range(chips)]
+
+
+# .csv Decoding function. Takes .csv files of the format "Address,Word" and returns int list of addresses and int list of binary values.
+def read_csv(filename):
+    dump = load_dump(filename)
+    return dump.addresses.tolist(), dump.flat_bits.tolist()
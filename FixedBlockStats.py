@@ -1,143 +1,154 @@
-# ----------------------------------------------------------------------------------
-# A .py script that takes one .csv file deliminated into
-# "Address,Word" format, splits the bit data into equal and even 
-# square-shaped divisions as cleanly as possible, and determines the average
-# incidence of 1s in each division, the average of all averages, and the 
-# standard deviation of the averages. This statistics are therein dumped
-# into .csv files of their own.
-#
-# This script is currently configured for a memory device of size 8kB.
-# It is intended to be used after "PreProcess.py".
-#
-# The program will create a directory under the working directory,
-# titled 'TRAINING_DATA', and store the file into it. If this directory already
-# exists, it will just store the file into the existing directory.
-#
-# Author : Gaines Odom
-# Email : gaines.a.odom@gmail.com
-# Inst. : Auburn University
-# Advisor : Dr. Ujjwal Guin
-#
-# Created On : 08/24/2023
-# Last Edited On: 08/28/2023
-# ----------------------------------------------------------------------------------
-
-import statistics
-import csv
-import os
-import math
-
-def write_to_csv(filename, avgs, sdevs, avgtot):
-    # Open the CSV file for writing
-    with open(filename, 'w', newline='') as csvfile:
-        csvwriter = csv.writer(csvfile)
-
-        # Write the header row
-        csvwriter.writerow(['Block', 'Percentage of 1s', 'Total Average','Overall Standard Deviation'])
-
-        # Loop through data and write each row
-        for i, value in enumerate(avgs):
-            csvwriter.writerow([i, '{:.4f}'.format(value),'{:.4f}'.format(avgtot), '{:.4f}'.format(sdevs)])
-
-# .csv Decoding function. Takes .csv files of the format "Address,Word" and returns int list of addresses and int list of binary values.
-def read_csv(filename):
-    addresses = []
-    bit_list = []
-    bits = []
-    with open(filename, 'r') as csvfile:
-        csvreader = csv.reader(csvfile)
-        next(csvreader)
-        for row in csvreader:
-            address, byte = row
-            addresses.append(int(address, 16))  # Turns 4 digit hex address into decimal int value list
-            bit_list.append(bin(int(byte, 16))[2:].zfill(8))    # Turns 2 digit hex byte into 8 bit binary string list
-
-    # Create a list of 1-bit strings from 8-bit binary strings        
-    for byte in bit_list:
-        for bit in byte:  
-            bits.append(bit)
-    
-    # Turn 1-bit strings into 1-bit ints
-    bits = [int(bit) for bit in bits]
-
-    return addresses, bits
-
-def calculate_mean_and_dev(bitlist, num_of_blocks) : # num_of_blocks should be a squared product of an int, ex. 4, 9, 16 etc.
-    
-    chunk_size = int(math.sqrt(len(bitlist) // num_of_blocks)) # round down: 65536 // 81 = 809 -> int(sqrt(809)) = 28 -> chunks are 28x28
-    excess_bits = len(bitlist) - (num_of_blocks * chunk_size * chunk_size) # 65536 - (81 * 28 * 28) = 2032
-    row_size = 256 * chunk_size   # 256 * 28 = 7168 (start at addr 0, incrementing by 28, until next row -> addr is 0 + 7168)
-    chunks_per_row = int(math.sqrt(num_of_blocks)) # chunks_per_row = sqrt(81) = 9
-    chunks_per_column = int(math.sqrt(num_of_blocks))
-    x_offset = math.ceil((excess_bits // 511) / 2)   # keeps it off the wall for purposes of evenness. Centremost divisions are used
-    y_offset = x_offset * 256
-    print(str(chunk_size*chunk_size))
-    chunk_averages = []
-    chunk = []
-    percentage = []
-
-    for i in range(chunks_per_column):
-        for j in range(chunks_per_row):
-            start_idx = i * row_size + j * chunk_size + x_offset + y_offset
-            for k in range (chunk_size) : 
-                vert_addr  = start_idx + k * 256
-                end_idx = vert_addr + chunk_size
-                chunk.append(bitlist[vert_addr:end_idx])
-            
-            chunk = [item for sublist in chunk for item in sublist]
-
-            average = sum(chunk) / len(chunk)
-            
-            chunk_averages.append(average)
-            chunk.clear()
-            percentage.clear()
-        avgtotal = sum(chunk_averages) / len(chunk_averages)
-        stddev = statistics.stdev(chunk_averages)
-        
-
-    return chunk_averages, stddev, avgtotal
-
-def main():
-    try:
-        prevdir = os.getcwd() # Purely for clarity of use
-
-        # Get directory
-        input_file = input("Enter the input file (e.g. 'JUL4' for JUL4.csv): ") + '.csv'
-        
-        # If directory doesn't exist, throw error
-        if not os.path.exists(input_file):
-            raise FileNotFoundError("This file does not exist.")
-            
-        a, b = read_csv(input_file)
-
-        os.chdir(prevdir)
-
-        if not os.path.exists('TRAINING_DATA'):
-                os.mkdir('TRAINING_DATA')
-
-        os.chdir('TRAINING_DATA')
-        agorfre = input("Aged or Fresh? ")
-
-        for i in range(2,21) :
-            averages, stddev, avgtotal = calculate_mean_and_dev(b, (i*i)) # SET NUMBERS LATER
-            #print("Averages:", averages)
-            #print("Standard Deviations:", stddev)
-
-            filey = agorfre + "Stats" + str(i*i) + "Blocks.csv"         
-            
-            write_to_csv(filey, averages, stddev, avgtotal)
-            if not os.path.exists(filey):
-                raise FileNotFoundError("Did not create "+filey+".")
-            else : 
-                print("CSV file "+filey+" has been created.")
-
-            # Error Handler
-    except Exception as e:
-        print("An error occurred: {e}")
-
-    # Return to program directory, create training data directory and save training data to it
-    finally:
-        os.chdir(prevdir)    
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+# ----------------------------------------------------------------------------------
+# A .py script that takes one .csv file deliminated into
+# "Address,Word" format, splits the bit data into equal and even 
+# square-shaped divisions as cleanly as possible, and determines the average
+# incidence of 1s in each division, the average of all averages, and the 
+# standard deviation of the averages. This statistics are therein dumped
+# into .csv files of their own.
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py).
+# It is intended to be used after "PreProcess.py".
+#
+# The program will create a directory under the working directory,
+# titled 'TRAINING_DATA', and store the file into it. If this directory already
+# exists, it will just store the file into the existing directory.
+#
+# Next to the .csv files, '<label>Features.json' keeps the total average and
+# overall standard deviation of every grid size at full precision, with the
+# chip the dump was read from, for AgeClassifier.py to train on.
+#
+# With --ci, every file also gets bootstrap confidence intervals of the total
+# average and the overall standard deviation, resampling the blocks (see
+# Bootstrap.py).
+#
+# Run with no arguments to be prompted for the parameters, or see
+# 'python FixedBlockStats.py -h' for the 'run' and 'batch' subcommands.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 08/24/2023
+# Last Edited On: 08/28/2023
+# ----------------------------------------------------------------------------------
+
+import csv
+import json
+import os
+from DumpLoader import load_dump
+from BlockEngine import GRID_SIZES, block_means, block_summary
+from ChipProfile import DEFAULT_PROFILE
+from CommandLine import build_parser, add_chip_option, add_ci_option, profile_from_args, ci_from_args, run_batch
+from Bootstrap import CI_COLUMNS, bootstrap_ci
+from Instrument import stage, count, run_main
+
+# 'interval', if given, holds the four CI_COLUMNS, repeated on every row like the totals
+def write_to_csv(filename, avgs, sdevs, avgtot, interval=None):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        if interval is None:
+            csvwriter.writerow(['Block', 'Percentage of 1s', 'Total Average','Overall Standard Deviation'])
+        else:
+            csvwriter.writerow(['Block', 'Percentage of 1s', 'Total Average','Overall Standard Deviation'] + CI_COLUMNS)
+            interval = ['{:.4f}'.format(value) for value in interval]
+
+        # Loop through data and write each row
+        for i, value in enumerate(avgs):
+            row = [i, '{:.4f}'.format(value),'{:.4f}'.format(avgtot), '{:.4f}'.format(sdevs)]
+            if interval is not None:
+                row += interval
+            csvwriter.writerow(row)
+
+# Saves the features of one dump (see AgeClassifier.py) and the chip it was read from
+def write_features(filename, features, profile, grid_sizes):
+    with open(filename, 'w') as f:
+        json.dump({'chip': profile.name, 'grid_sizes': grid_sizes, 'features': features}, f, indent=1)
+
+# Block statistics of one dump for every grid size, written as '<label>Stats<n>Blocks.csv' into output_dir. Returns the files written.
+# ci = (resamples, confidence, seed) adds the bootstrap intervals of the total average and overall standard deviation.
+def run_file(input_file, label, output_dir='TRAINING_DATA', profile=DEFAULT_PROFILE, ci=None):
+    if not input_file.endswith('.csv'):
+        input_file = input_file + '.csv'
+
+    # If file doesn't exist, throw error
+    if not os.path.exists(input_file):
+        raise FileNotFoundError("This file does not exist.")
+        
+    dump = load_dump(input_file, profile.width, profile.height, profile.word_size)
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # Block averages for every grid size, computed in one pass
+    with stage('block_means'):
+        means = block_means(dump.bits[None], width=profile.width, height=profile.height)
+    files = []
+    features = []
+
+    for i in GRID_SIZES :
+        averages = means[i][0]
+        avgtotal, stddev = block_summary(averages)
+        features += [float(avgtotal), float(stddev)]
+        interval = None
+        if ci is not None:
+            with stage('bootstrap'):
+                interval = [float(value) for value in bootstrap_ci(averages, *ci, ddof=1)]
+        #print("Averages:", averages)
+        #print("Standard Deviations:", stddev)
+
+        filey = os.path.join(output_dir, label + "Stats" + str(i*i) + "Blocks.csv")
+        
+        with stage('write_csv'):
+            write_to_csv(filey, averages, stddev, avgtotal, interval)
+        count('files_written')
+        if not os.path.exists(filey):
+            raise FileNotFoundError("Did not create "+filey+".")
+        files.append(filey)
+
+    write_features(os.path.join(output_dir, label + "Features.json"), features, profile, list(GRID_SIZES))
+    return files
+
+def add_options(parser):
+    parser.add_argument('--label', help="'Aged' or 'Fresh', prefixed to the output file names (asked for if not given; required in batch mode)")
+    add_chip_option(parser)
+    add_ci_option(parser)
+
+def main():
+    parser = build_parser("Block statistics of one dump for every grid size.", add_options,
+                          input_help="dump file, with or without '.csv'")
+    args = parser.parse_args()
+    # Batch mode runs unattended, so the label cannot be asked for
+    if args.command == 'batch' and args.label is None:
+        parser.error("batch mode needs --label")
+
+    try:
+        # Batch mode: every dump matching the pattern(s). Each one gets its own TRAINING_DATA/<name> directory
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: run_file(path, args.label, os.path.join('TRAINING_DATA', os.path.splitext(os.path.basename(path))[0]), profile_from_args(args), ci_from_args(args)))
+
+        # Get file
+        if args.command == 'run':
+            input_file = args.input
+        else:
+            input_file = input("Enter the input file (e.g. 'JUL4' for JUL4.csv): ") + '.csv'
+
+        # If file doesn't exist, throw error
+        if not os.path.exists(input_file) and not os.path.exists(input_file + '.csv'):
+            raise FileNotFoundError("This file does not exist.")
+
+        agorfre = args.label if args.label is not None else input("Aged or Fresh? ")
+
+        for filey in run_file(input_file, agorfre, profile=profile_from_args(args), ci=ci_from_args(args)) :
+            print("CSV file "+os.path.basename(filey)+" has been created.")
+
+            # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'FixedBlockStats')
\ No newline at end of file
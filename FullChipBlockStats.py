@@ -1,260 +1,424 @@
-# ----------------------------------------------------------------------------------
-# A .py script that takes one .csv file deliminated into
-# "Address,Word" format, splits the bit data into equal and even 
-# square-shaped divisions as cleanly as possible, and determines the average
-# incidence of 1s in each division, the average of all averages, and the 
-# standard deviation of the averages. This statistics are therein dumped
-# into .csv files of their own.
-#
-# This script is currently configured for a memory device of size 8kB.
-# It is intended to be used after "PreProcess.py".
-#
-# The program will create a directory under the working directory,
-# titled 'TRAINING_DATA', and store the file into it. If this directory already
-# exists, it will just store the file into the existing directory.
-#
-# Author : Gaines Odom
-# Email : gaines.a.odom@gmail.com
-# Inst. : Auburn University
-# Advisor : Dr. Ujjwal Guin
-#
-# Created On : 08/24/2023
-# Last Edited On: 08/28/2023
-# ----------------------------------------------------------------------------------
-from __future__ import print_function
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
-from scipy import stats
-from scipy.stats import norm
-import statistics
-import csv
-import os
-import math
-
-FIRST_BANDING_LIMITER = 16384
-LAST_BANDING_LIMITER = 49150
-
-blockdict = {
-    0: 16384,
-    1: 7225,
-    2: 4096,
-    3: 2601,
-    4: 1764,
-    5: 1296,
-    6: 1024,
-    7: 784,
-    8: 625,
-    9: 529,
-    10: 441,
-    11: 361,
-    12: 324,
-    13: 289,
-    14: 256,
-    15: 225,
-    16: 196,
-    17: 169,
-    18: 144
-}
-
-
-def Gauss(x, A, B):
-    y = A*np.exp(-1*B*x**2)
-    return y
-
-def func(x, a, x0, sigma):
-    return a*np.exp(-(x-x0)**2/(2*sigma**2))
-
-def make_plot(x, actually_make_plot, chip_number,num_blocks) :
-    mu, sigma = norm.fit(x) 
-    #mu_perc = mu/100
-    '''if (actually_make_plot == 1) :
-        num_bins = 10
-
-        fig, ax = plt.subplots()
-
-        # the histogram of the data
-        n, bins, patches = ax.hist(x, num_bins, density=True)
-
-        # add a 'best fit' line
-        y = ((1 / (np.sqrt(2 * np.pi) * sigma)) *
-            np.exp(-0.5 * (1 / sigma * (bins - mu))**2))
-        ax.plot(bins, y, '--')
-        plt.xlim(0.60,0.75)
-        ax.set_xlabel('Percent of 1s at Startup')
-        ax.set_ylabel('Probability Density')
-        ax.set_title('Chip '+str(chip_number)+' $\mu={:.2%}$, $\sigma={:.2%}$'.format(mu, sigma))
-
-        # Tweak spacing to prevent clipping of ylabel
-        #fig.tight_layout()
-        
-        fname = 'hist_plot_chip'+str(chip_number)+'_'+str(num_blocks)+'blocks.png'
-        plt.savefig(fname)
-        plt.close()'''
-    return mu, sigma
-
-# Pre-Processing function: takes 65536 int list as input 'bitlist', inverts every bit within banding limiters, and returns pre-processed list of 65536 ints as 'blist'
-def pre_processing(bitlist) :
-   
-    blist = []
-    inverter = {1:0, 0:1}
-
-    # Invert banded section
-    for i in range(len(bitlist)) :
-        if i < FIRST_BANDING_LIMITER or i > LAST_BANDING_LIMITER:
-            blist.append(bitlist[i])
-        else :
-            blist.append(inverter[bitlist[i]])
-
-    return blist
-
-def write_to_csv(filename, sdevs, avgtots):
-    # Open the CSV file for writing
-    with open(filename, 'w', newline='') as csvfile:
-        csvwriter = csv.writer(csvfile)
-
-        # Write the header row
-        csvwriter.writerow(['Block Size', 'Average','Standard Deviation'])
-
-        # Loop through data and write each row
-        for i in range (len(avgtots)) : 
-            csvwriter.writerow([blockdict[i], '{:.4f}'.format(avgtots[i]), '{:.4f}'.format(sdevs[i])])
-
-# .csv Decoding function. Takes .csv files of the format "Address,Word" and returns int list of addresses and int list of binary values.
-def read_csv(filename):
-    addresses = []
-    bit_list = []
-    bits = []
-    with open(filename, 'r') as csvfile:
-        csvreader = csv.reader(csvfile)
-        next(csvreader) # skips "Address,Word" header line
-        for row in csvreader:
-            address, byte = row # row = address: in leftmost space, byte: in rightmost space
-            addresses.append(int(address, 16))  # Turns 4 digit hex address into decimal int value list
-            bit_list.append(bin(int(byte, 16))[2:].zfill(8))    # Turns 2 digit hex byte into 8 bit binary string list
-
-    # Create a list of 1-bit strings from 8-bit binary strings        
-    for byte in bit_list:
-        for bit in byte:  
-            bits.append(bit)
-    
-    # Turn 1-bit strings into 1-bit ints
-    bits = [int(bit) for bit in bits]
-
-    return addresses, bits
-
-def calculate_mean_and_dev(bitlist, num_of_blocks) : # num_of_blocks should be a squared product of an int, ex. 4, 9, 16 etc.
-    
-    chunk_size = int(math.sqrt(len(bitlist) // num_of_blocks)) # round down: 65536 // 81 = 809 -> int(sqrt(809)) = 28 -> chunks are 28x28
-    excess_bits = len(bitlist) - (num_of_blocks * chunk_size * chunk_size) # 65536 - (81 * 28 * 28) = 2032
-    row_size = 256 * chunk_size   # 256 * 28 = 7168 (start at addr 0, incrementing by 28, until next row -> addr is 0 + 7168)
-    chunks_per_row = int(math.sqrt(num_of_blocks)) # chunks_per_row = sqrt(81) = 9
-    chunks_per_column = int(math.sqrt(num_of_blocks))
-    x_offset = math.ceil((excess_bits // 511) / 2)   # keeps it off the wall for purposes of evenness. Centremost divisions are used
-    y_offset = x_offset * 256
-    # print(str(chunk_size*chunk_size))
-    chunk_averages = []
-    chunk = []
-
-    for i in range(chunks_per_column):
-        for j in range(chunks_per_row):
-            start_idx = i * row_size + j * chunk_size + x_offset + y_offset
-            for k in range (chunk_size) : 
-                vert_addr  = start_idx + k * 256
-                end_idx = vert_addr + chunk_size
-                chunk.append(bitlist[vert_addr:end_idx])
-            
-            chunk = [item for sublist in chunk for item in sublist]
-
-            average = statistics.mean(chunk)
-            
-            chunk_averages.append(average)
-            chunk.clear()
-    #chunk_averages = [(item * 100) for item in chunk_averages]
-    avgtotal = statistics.mean(chunk_averages)
-    stddev = statistics.stdev(chunk_averages)
-    
-    return chunk_averages, stddev, avgtotal
-
-def main():
-    try:
-        devlist = []
-        avglist = []
-        bitlists = []
-        proclists = []
-        list25 = []
-        list16 = []
-        list9 = []
-        prevdir = os.getcwd() # Purely for clarity of use
-
-        # Get directory
-        input_dir = input("Enter the input directory: ")
-        one_or_two = input("2 chips? Y/N (N == one chip)")
-        if (one_or_two == 'Y') :
-            itera = 201
-        else : 
-            itera = 101
-        # If directory doesn't exist, throw error
-        if not os.path.exists(input_dir):
-            raise FileNotFoundError("This directory does not exist.")
-        os.chdir(input_dir)
-
-        for i in range(1, itera) :
-            if not os.path.exists(input_dir+'_'+str(i)+'.csv'):
-                raise FileNotFoundError("File '"+input_dir+"_"+str(i)+".csv' does not exist.")
-            
-            a, b = read_csv(input_dir+'_'+str(i)+'.csv')
-            bitlists.append(b)
-            proclists.append(pre_processing(bitlists[i-1]))            
-
-        os.chdir(prevdir)
-        if not os.path.exists(input_dir+'Stats'):
-            os.mkdir(input_dir+'Stats')
-        os.chdir(input_dir+'Stats')
-
-        for i in range(1,itera) :
-            
-            for x in range(2,21) :
-                averages, stddev, avgtotal = calculate_mean_and_dev(proclists[i-1], (x*x)) # SET NUMBERS LATER
-                #print("Averages:", averages)
-                #print("Standard Deviations:", stddev)
-                #print("ok")
-
-                mu, sigma = make_plot(averages, 0,1,0)
-                #print("ok2")
-                avglist.append(mu)
-                devlist.append(sigma) 
-
-                #if (x == 3) : list9.append(averages)
-                #if (x == 4) : list16.append(averages)
-                #if (x == 5) : list25.append(averages)
-                
-            filename = input_dir+'_'+str(i)+'Stats.csv'
-            write_to_csv(filename, devlist, avglist)
-            #if not os.path.exists(filename):
-                #raise FileNotFoundError("Did not create "+filename+".")
-            # else : 
-                # print("CSV file "+filename+" has been created.")
-            
-            avglist.clear()
-            devlist.clear()
-        
-
-        print("All statistics files created and placed in directory "+prevdir+"/"+input_dir+"Stats")
-        #make_plot(list9[:len(list9)//2],1,1,9)
-        #make_plot(list9[len(list9)//2:],1,2,9)
-        #make_plot(list16[:len(list16)//2],1,1,16)
-        #make_plot(list16[len(list16)//2:],1,2,16)
-        #make_plot(list25[:len(list25)//2],1,1,25)
-        #make_plot(list25[len(list25)//2:],1,2,25)
-        print ("All plots made and saved in directory "+prevdir+"/"+input_dir+"Stats")
-            # Error Handler
-    except Exception as e:
-        print("An error occurred: {e}")
-
-    # Return to program directory, create training data directory and save training data to it
-    finally:
-        os.chdir(prevdir)    
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+# ----------------------------------------------------------------------------------
+# A .py script that takes one .csv file deliminated into
+# "Address,Word" format, splits the bit data into equal and even 
+# square-shaped divisions as cleanly as possible, and determines the average
+# incidence of 1s in each division, the average of all averages, and the 
+# standard deviation of the averages. This statistics are therein dumped
+# into .csv files of their own.
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py).
+# It is intended to be used after "PreProcess.py".
+#
+# The program will create a directory under the working directory,
+# titled 'TRAINING_DATA', and store the file into it. If this directory already
+# exists, it will just store the file into the existing directory.
+#
+# With two chips (or a chip map), the block averages of all the reads of each
+# chip are also pooled and fitted into '<name>_Chip<c>Stats.csv'. The pooled
+# fit is built from the fits of the reads, which are kept in the manifest, so
+# a re-run only parses the dumps that changed, and only rewrites the files of
+# the chips whose reads changed.
+#
+# With --ci, every Stats file (and table row) also gets bootstrap confidence
+# intervals of its average and standard deviation (resampling the blocks of
+# the read, see Bootstrap.py), and '<name>_BootstrapStats.csv' holds the
+# average and standard deviation over the reads of each chip with their
+# intervals (resampling the reads, from the fits kept in the manifest).
+#
+# With --store FILE, the fits of every read are also stored in a SQLite
+# results database (see ResultsStore.py) for trend queries across campaigns.
+#
+# With --columnar npz (or parquet), the statistics of every read go into one
+# table, '<name>_BlockStats.npz', at full precision instead (see
+# ColumnarStats.py); add --legacy-csv to keep the per-read files as well.
+#
+# With --follow, the campaign directory is watched while read100.c / read200.c
+# are still writing it, and every --refresh seconds the outputs are brought up
+# to date with the dumps complete so far (only the new reads are processed).
+#
+# Run with no arguments to be prompted for the parameters, or see
+# 'python FullChipBlockStats.py -h' for the 'run' and 'batch' subcommands.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 08/24/2023
+# Last Edited On: 08/28/2023
+# ----------------------------------------------------------------------------------
+from __future__ import print_function
+import numpy as np
+import csv
+import os
+from BlockEngine import GRID_SIZES, block_fit
+from CampaignPack import campaign_name, campaign_profile, chip_labels, chip_reads, follow_reads
+from Streaming import stream_reads
+from ParallelRunner import run_reads
+from Instrument import stage, count, run_main
+from CommandLine import build_parser, add_two_chips_option, add_chip_map_option, add_workers_option, add_force_option, add_band_option, add_chip_option, add_columnar_option, add_ci_option, add_store_option, add_follow_option, bands_from_args, ci_from_args, profile_from_args, run_batch
+from PreProcess import normalize_bands
+from ChipProfile import DEFAULT_PROFILE
+from StatsCache import StatsManifest, input_hashes
+from ColumnarStats import make_table, table_name, update_table
+from Bootstrap import CI_COLUMNS, block_intervals, read_intervals
+from ResultsStore import open_store, store_params, campaign_date, is_stored, store_reads
+
+STATS_VERSION = 1   # Bump whenever a change alters the contents of the output files
+CI_BATCH = 32       # Reads bootstrapped together with --ci: enough to share the matrix products, few enough to keep memory flat
+
+# Bits per block of every grid size (2x2 .. 20x20 by default), derived from the chip geometry: 16384, 7225, ... on the 8kB chip
+blockdict = dict(enumerate(DEFAULT_PROFILE.block_sizes()))
+
+
+def Gauss(x, A, B):
+    y = A*np.exp(-1*B*x**2)
+    return y
+
+def func(x, a, x0, sigma):
+    return a*np.exp(-(x-x0)**2/(2*sigma**2))
+
+# Fits a Gaussian to one list of block averages: the closed form of norm.fit (mean and population standard deviation).
+# With actually_make_plot == 1 the histogram and fit are also saved (see ReportMaker.py, which draws them for a whole campaign).
+def make_plot(x, actually_make_plot, chip_number,num_blocks) :
+    x = np.asarray(x, dtype=float)
+    mu, sigma = x.mean(), x.std()
+    #mu_perc = mu/100
+    if (actually_make_plot == 1) :
+        from ReportMaker import plot_histogram
+        fname = 'hist_plot_chip'+str(chip_number)+'_'+str(num_blocks)+'blocks.png'
+        plot_histogram(x, fname, 'Chip '+str(chip_number), xlim=(0.60,0.75))
+    return mu, sigma
+
+# 'intervals', if given, holds the four CI_COLUMNS of every row
+def write_to_csv(filename, sdevs, avgtots, blocksizes=blockdict, intervals=None):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        if intervals is None:
+            csvwriter.writerow(['Block Size', 'Average','Standard Deviation'])
+        else:
+            csvwriter.writerow(['Block Size', 'Average','Standard Deviation'] + CI_COLUMNS)
+
+        # Loop through data and write each row
+        for i in range (len(avgtots)) : 
+            row = [blocksizes[i], '{:.4f}'.format(avgtots[i]), '{:.4f}'.format(sdevs[i])]
+            if intervals is not None:
+                row += ['{:.4f}'.format(value) for value in intervals[i]]
+            csvwriter.writerow(row)
+
+def write_bootstrap_csv(filename, rows, blocksizes=blockdict):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['Chip', 'Block Size', 'Reads', 'Average', 'Average CI Low', 'Average CI High',
+                            'Standard Deviation', 'Standard Deviation CI Low', 'Standard Deviation CI High'])
+
+        # Loop through data and write each row
+        for chip, reads, columns in rows:
+            for i, values in enumerate(zip(*columns)):
+                csvwriter.writerow([chip, blocksizes[i], reads] + ['{:.4f}'.format(value) for value in values])
+
+# Name of the output file of read i
+def output_name(name, i):
+    return name+'_'+str(i)+'Stats.csv'
+
+# Name of the pooled output file of one chip
+def chip_output_name(name, chip):
+    return name+'_Chip'+chip+'Stats.csv'
+
+# Outputs kept only in the manifest (see StatsManifest.stale_reads)
+def no_output(i):
+    return None
+
+# Fits of reads 1..N as recorded in a manifest, as (mu, sigma), each (N, grid sizes)
+def campaign_fits(manifest, hashes):
+    values = [manifest.value(i) for i in sorted(hashes)]
+    return np.array([mus for mus, sigmas in values]), np.array([sigmas for mus, sigmas in values])
+
+# Parameters that affect the output files. A change to any of them invalidates every output in the manifest.
+def output_params(bands, profile=DEFAULT_PROFILE, ci=None):
+    params = {'grid_sizes': [GRID_SIZES[0], GRID_SIZES[-1]], 'bands': [list(band) for band in normalize_bands(bands)], 'chip': profile.to_dict(), 'version': STATS_VERSION}
+    if ci is not None:
+        params['ci'] = list(ci)
+    return params
+
+# Bootstraps the block averages of a batch of reads in one go and (with write_csv) writes their Stats files.
+# 'pending' holds (read, averages, standard deviations, block averages). Returns the rows of process_reads.
+def bootstrap_reads(output_dir, name, profile, write_csv, ci, pending):
+    with stage('bootstrap'):
+        cis = block_intervals({x: np.stack([means[x] for i, mus, sigmas, means in pending]) for x in GRID_SIZES}, *ci)
+    rows = []
+    for n, (i, mus, sigmas, means) in enumerate(pending) :
+        intervals = [[float(value[n]) for value in cis[x]] for x in GRID_SIZES]
+        if write_csv :
+            with stage('write_csv'):
+                write_to_csv(os.path.join(output_dir, output_name(name, i)), sigmas, mus, profile.block_sizes(), intervals)
+            count('files_written')
+        rows.append((i, mus, sigmas, intervals))
+    return rows
+
+# Worker: fits the block averages of reads first..last and writes their Stats files into output_dir.
+# The fits are sent back as (read, averages, standard deviations, intervals), one per read.
+# With ci = (resamples, confidence, seed), the reads also get the bootstrap intervals of every grid (else intervals is None).
+def process_reads(input_dir, output_dir, bands, profile, write_csv, ci, first, last):
+    devlist = []
+    avglist = []
+    rows = []
+    pending = []
+    name = campaign_name(input_dir)
+
+    # Stream the dumps one at a time (pre-processed, with their block averages for every grid size), so memory stays flat.
+    # If missing even one, error is thrown.
+    for result in stream_reads(input_dir, last, first, bands, profile=profile) :
+        i = result.index
+        
+        # Gaussian fit of every grid size in one go (the same numbers make_plot / norm.fit give, without a scipy call per grid)
+        with stage('fit'):
+            mus, sigmas = block_fit(result.means, GRID_SIZES)
+        avglist.extend(mus[0].tolist())
+        devlist.extend(sigmas[0].tolist())
+            
+        # With intervals, the reads are bootstrapped (and their files written) CI_BATCH at a time
+        if ci is not None :
+            pending.append((i, avglist[:], devlist[:], result.means))
+            if len(pending) == CI_BATCH :
+                rows.extend(bootstrap_reads(output_dir, name, profile, write_csv, ci, pending))
+                pending.clear()
+        else :
+            if write_csv :
+                filename = os.path.join(output_dir, output_name(name, i))
+                with stage('write_csv'):
+                    write_to_csv(filename, devlist, avglist, profile.block_sizes())
+                count('files_written')
+            rows.append((i, avglist[:], devlist[:], None))
+        #if not os.path.exists(filename):
+            #raise FileNotFoundError("Did not create "+filename+".")
+        # else : 
+            # print("CSV file "+filename+" has been created.")
+        
+        avglist.clear()
+        devlist.clear()
+
+    if pending :
+        rows.extend(bootstrap_reads(output_dir, name, profile, write_csv, ci, pending))
+    return rows
+
+# Columnar table of the fits (and intervals, if any) of process_reads (block -1: one row per grid)
+def fits_table(rows):
+    grids = np.array(GRID_SIZES)
+    intervals = None
+    if rows and rows[0][3] is not None:
+        intervals = np.array([interval for i, mus, sigmas, cis in rows for interval in cis]).T
+    return make_table(np.repeat([i for i, mus, sigmas, cis in rows], len(grids)), np.tile(grids, len(rows)), np.full(len(rows) * len(grids), -1),
+                      [mu for i, mus, sigmas, cis in rows for mu in mus], [sigma for i, mus, sigmas, cis in rows for sigma in sigmas], intervals=intervals)
+
+# Fit of the block averages of several reads pooled together, from the fits of the reads: every read has the same number of
+# blocks per grid, so the pooled mean is the mean of the read means and the pooled variance is the mean of the read variances
+# plus the variance of the read means (the Chan et al. merge of Streaming.Welford). mu and sigma are (reads, grid sizes).
+def pool_fits(mu, sigma):
+    avg = mu.mean(axis=0)
+    dev = np.sqrt((sigma * sigma).mean(axis=0) + ((mu - avg) ** 2).mean(axis=0))
+    return avg, dev
+
+# Fits the pooled block averages of every read of each chip (of the chips in 'chips' only, if given), and writes '<name>_Chip<c>Stats.csv' per chip.
+# mu and sigma are the fits of reads 1..N, (N, grid sizes).
+def process_chips(stats_dir, name, labels, mu, sigma, profile=DEFAULT_PROFILE, chips=None):
+    for chip, reads in chip_reads(labels).items():
+        if chips is not None and chip not in chips:
+            continue
+        rows = np.array(reads) - 1
+        # Same fit as make_plot (norm.fit): mean and population standard deviation
+        avglist, devlist = pool_fits(mu[rows], sigma[rows])
+        with stage('write_csv'):
+            write_to_csv(os.path.join(stats_dir, chip_output_name(name, chip)), devlist, avglist, profile.block_sizes())
+        count('files_written')
+
+# Name of the file of the intervals across reads
+def bootstrap_output_name(name):
+    return name+'_BootstrapStats.csv'
+
+# Averages and standard deviations over the reads of each chip, with their intervals bootstrapped across reads, into '<name>_BootstrapStats.csv'.
+# mu and sigma are the fits of reads 1..N, (N, grid sizes).
+def process_bootstrap(stats_dir, name, labels, mu, sigma, ci, profile=DEFAULT_PROFILE):
+    rows = []
+    with stage('bootstrap'):
+        for chip, reads in chip_reads(labels).items():
+            index = np.array(reads) - 1
+            rows.append((chip, len(reads), read_intervals(mu[index], sigma[index], *ci)))
+    with stage('write_csv'):
+        write_bootstrap_csv(os.path.join(stats_dir, bootstrap_output_name(name)), rows, profile.block_sizes())
+    count('files_written')
+
+# Processes every read of one campaign (directory or packed file) into '<name>Stats'. Returns that directory.
+# Reads whose outputs are up to date according to the manifest are skipped, unless force is set.
+# With two chips (reads 1..100 from chip 1, 101..200 from chip 2) or a chip map, per-chip statistics are written too.
+# bands=None inverts the chip's own banding.
+# columnar ('npz' or 'parquet') writes '<name>_BlockStats.<format>' instead of the per-read files, or as well with legacy_csv.
+# ci = (resamples, confidence, seed) adds bootstrap intervals to the per-read files and writes '<name>_BootstrapStats.csv'.
+# store names a results database (see ResultsStore.py) to bulk-insert the fits of every read into as well, dated 'date' (default: see campaign_date).
+# num_reads limits the outputs to the first reads of the campaign, e.g. those written so far of a followed campaign (default: all of them).
+def run_campaign(input_dir, two_chips=False, workers=1, force=False, bands=None, chip_map=None, profile=DEFAULT_PROFILE,
+                 columnar=None, legacy_csv=False, ci=None, store=None, date=None, num_reads=None):
+    if (two_chips) :
+        itera = 201
+    else : 
+        itera = 101
+    # If directory doesn't exist, throw error
+    if not os.path.exists(input_dir):
+        raise FileNotFoundError("This directory does not exist.")
+
+    # Geometry and banding of the chip (a packed file carries its own)
+    profile = campaign_profile(input_dir, profile)
+    if bands is None:
+        bands = profile.bands
+
+    name = campaign_name(input_dir)
+    stats_dir = os.path.abspath(name+'Stats')
+    if not os.path.exists(stats_dir):
+        os.mkdir(stats_dir)
+
+    # Outputs: the per-read .csv files and/or one table for the whole campaign, each with its own manifest section
+    write_csv = columnar is None or legacy_csv
+    outputs = []
+    if write_csv:
+        outputs.append(('FullChipBlockStats', lambda i: output_name(name, i)))
+    if columnar is not None:
+        table_file = table_name(name, 'BlockStats', columnar)
+        outputs.append(('FullChipBlockStats:'+columnar, lambda i: table_file))
+
+    # The per-chip, bootstrap and store outputs are built from the fits of every read, which are kept (at full precision) in their own manifest section
+    multi_chip = two_chips or chip_map is not None
+    if num_reads is None:
+        num_reads = itera - 1
+    labels = chip_labels(itera - 1, 2 if two_chips else 1, chip_map)[:num_reads]
+    fits_manifest = None
+    if multi_chip or ci is not None or store is not None:
+        fits_manifest = StatsManifest(stats_dir, 'FullChipBlockStats:fits', output_params(bands, profile))
+
+    # Only reads whose dump, output file or parameters changed since the last run are recomputed
+    with stage('hash'):
+        hashes = input_hashes(input_dir, 1, num_reads)
+    manifests = [(StatsManifest(stats_dir, section, output_params(bands, profile, ci)), output) for section, output in outputs]
+    if fits_manifest is not None:
+        manifests.append((fits_manifest, no_output))
+    if force:
+        reads = sorted(hashes)
+    else:
+        reads = sorted(set().union(*[manifest.stale_reads(hashes, output) for manifest, output in manifests]))
+
+    # Process the reads, split over the worker processes
+    rows = [row for chunk in run_reads(process_reads, (os.path.abspath(input_dir), stats_dir, bands, profile, write_csv, ci), reads, workers) for row in chunk]
+    if columnar is not None:
+        with stage('write_table'):
+            update_table(os.path.join(stats_dir, table_file), [fits_table(rows)], hashes, labels)
+        count('files_written')
+
+    fits = {i: [mus, sigmas] for i, mus, sigmas, cis in rows}
+    for manifest, output in manifests:
+        manifest.record(hashes, output, fits if manifest is fits_manifest else None)
+
+    # Each read is recorded against the file of its chip, so only the files of chips with a changed (or relabelled) read, or
+    # missing files, are written again
+    if multi_chip:
+        chips_manifest = StatsManifest(stats_dir, 'FullChipBlockStats:chips', output_params(bands, profile))
+        chip_output = lambda i: chip_output_name(name, labels[i - 1])
+        stale = sorted(hashes) if force else chips_manifest.stale_reads(hashes, chip_output)
+        if stale:
+            mu, sigma = campaign_fits(fits_manifest, hashes)
+            process_chips(stats_dir, name, labels, mu, sigma, profile, {labels[i - 1] for i in stale})
+        chips_manifest.record(hashes, chip_output)
+
+    # The intervals across reads depend on every read of a chip, so the file is written again whenever one of them changed
+    if ci is not None:
+        bootstrap_manifest = StatsManifest(stats_dir, 'FullChipBlockStats:bootstrap', dict(output_params(bands, profile, ci), chips=labels.tolist()))
+        bootstrap_output = lambda i: bootstrap_output_name(name)
+        if force or bootstrap_manifest.stale_reads(hashes, bootstrap_output):
+            mu, sigma = campaign_fits(fits_manifest, hashes)
+            process_bootstrap(stats_dir, name, labels, mu, sigma, ci, profile)
+        bootstrap_manifest.record(hashes, bootstrap_output)
+
+    # The store gets the fits of every read. A copy stored by ResultsStore.py, with the block averages as well, is kept if it is up to date.
+    if store is not None:
+        connection = open_store(store)
+        try:
+            params = store_params(bands, profile, blocks=False)
+            date = campaign_date(input_dir, name, date)
+            if force or not (is_stored(connection, input_dir, params, date, hashes, labels)
+                             or is_stored(connection, input_dir, store_params(bands, profile), date, hashes, labels)):
+                mu, sigma = campaign_fits(fits_manifest, hashes)
+                store_reads(connection, input_dir, date, profile, params, labels, hashes, mu, sigma)
+        finally:
+            connection.close()
+
+    return stats_dir
+
+def add_options(parser):
+    add_two_chips_option(parser)
+    add_workers_option(parser)
+    add_force_option(parser)
+    add_band_option(parser)
+    add_chip_option(parser)
+    add_columnar_option(parser)
+    add_ci_option(parser)
+    add_store_option(parser)
+    add_follow_option(parser)
+    add_chip_map_option(parser)
+
+def main():
+    args = build_parser("Block statistics for every read of a campaign.", add_options).parse_args()
+
+    try:
+        # Batch mode: every campaign matching the pattern(s), no prompts
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: run_campaign(path, args.two_chips, args.workers, args.force, bands_from_args(args), args.chip_map, profile_from_args(args),
+                                                         args.columnar, args.legacy_csv, ci_from_args(args), args.store, args.date))
+
+        # Get directory
+        if args.command == 'run':
+            input_dir = args.input
+            two_chips = args.two_chips
+        else:
+            input_dir = input("Enter the input directory (or packed .bscd file): ")
+            one_or_two = input("2 chips? Y/N (N == one chip)")
+            two_chips = (one_or_two == 'Y')
+
+        def run(num_reads=None):
+            return run_campaign(input_dir, two_chips, args.workers, args.force, bands_from_args(args), args.chip_map, profile_from_args(args),
+                                args.columnar, args.legacy_csv, ci_from_args(args), args.store, args.date, num_reads)
+
+        # Following: the outputs are refreshed with the reads written so far, and left with every read that came in
+        if args.follow:
+            follow_reads(input_dir, 200 if two_chips else 100, run, profile_from_args(args), args.poll, args.refresh, args.idle_timeout)
+            stats_dir = os.path.abspath(campaign_name(input_dir)+'Stats')
+        else:
+            stats_dir = run()
+
+        print("All statistics files created and placed in directory "+stats_dir)
+        name = campaign_name(input_dir)
+        if two_chips or args.chip_map is not None:
+            print("Per-chip statistics written to "+os.path.join(stats_dir, chip_output_name(name, '*')))
+        if args.columnar is not None:
+            print("Statistics table written to "+os.path.join(stats_dir, table_name(name, 'BlockStats', args.columnar)))
+        if args.ci:
+            print("Bootstrap intervals across reads written to "+os.path.join(stats_dir, bootstrap_output_name(name)))
+        if args.store is not None:
+            print("Fits of every read stored in "+os.path.abspath(args.store))
+        # The histograms are drawn separately, on demand: python ReportMaker.py run <input>
+        #make_plot(list9[:len(list9)//2],1,1,9)
+        #make_plot(list9[len(list9)//2:],1,2,9)
+        #make_plot(list16[:len(list16)//2],1,1,16)
+        #make_plot(list16[len(list16)//2:],1,2,16)
+        #make_plot(list25[:len(list25)//2],1,1,25)
+        #make_plot(list25[len(list25)//2:],1,2,25)
+            # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'FullChipBlockStats')
\ No newline at end of file
@@ -0,0 +1,221 @@
+# ----------------------------------------------------------------------------------
+# A .py script that measures how faithfully a chip keeps the binary image
+# img_write.c wrote onto it, across the reads (or power cycles) of a
+# retention campaign.
+#
+# The reference is the first 8192 rows of 'WrittenImage.csv' (the words
+# img_write.c writes, in file order), loaded once. Every read is XORed with
+# it on the packed words and the differences counted with popcount, so no
+# read is ever unpacked except to gather the per-bit error counts:
+#   - per read  : bit errors over the whole chip and over the image rows
+#                 (the top IMAGE_HEIGHT = 156 rows the Image bitmap modes show)
+#   - per row   : error rate of every row of the chip, over all the reads
+#   - per block : error rate of every block of every grid size (2x2 .. 20x20),
+#                 laid out as in BlockEngine.py
+#   - per bit   : number of reads the bit was wrong in
+#
+# The program will create '<name>Stats' under the working directory (if
+# necessary) and write into it:
+#   <name>_ImageSummary.csv   Metric, Value
+#   <name>_ImageReads.csv     Read, Chip, Bit Errors, Bit Error Rate, Image Bit Errors, Image Bit Error Rate
+#   <name>_ImageRows.csv      Row, Bit Errors, Error Rate
+#   <name>_ImageBlocks.csv    NumBlocks, Block, Error Rate
+#   <name>_ImageErrors.npz    every per-read, per-row and per-bit array
+# and the error map '<name>-imageerrors.png' into 'BITMAPS' (one pixel per
+# bit, darker for bits that were wrong in more reads).
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py).
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import csv
+import os
+import numpy as np
+from DumpLoader import load_dump
+from BlockEngine import GRID_SIZES, block_means
+from CampaignPack import load_words, campaign_name, campaign_profile, count_reads, chip_labels
+from PufMetrics import popcount, wide_words, write_summary_csv
+from BitmapMaker import create_bit_distribution
+from ChipProfile import DEFAULT_PROFILE
+from CommandLine import build_parser, add_chips_option, add_chip_option, profile_from_args, run_batch
+from Instrument import run_main
+
+REFERENCE_FILE = 'WrittenImage.csv'
+
+# Reads XORed with the reference at a time
+CHUNK_READS = 256
+
+
+# Packed words img_write.c writes onto the chip: the words of the first rows of the reference file, in file order
+def load_reference(filename=REFERENCE_FILE, profile=DEFAULT_PROFILE):
+    # If file doesn't exist, throw error
+    if not os.path.exists(filename):
+        raise FileNotFoundError("Reference image "+filename+" does not exist.")
+
+    words = load_dump(filename, profile.width, profile.height, profile.word_size).words
+    if words.size < profile.read_bytes:
+        raise ValueError(filename+" holds "+str(words.size)+" words, the "+profile.name+" chip needs "+str(profile.read_bytes)+".")
+    return np.ascontiguousarray(words[:profile.read_bytes])
+
+
+# Errors of a (N, bytes per read) stack of packed reads against the packed reference, CHUNK_READS reads at a time.
+# Returns per-read error counts over the chip and over the top image_rows rows, per-row error counts summed over
+# the reads and per-bit error counts (number of reads each bit was wrong in).
+def image_errors(words, reference, profile=DEFAULT_PROFILE, image_rows=None):
+    if image_rows is None:
+        image_rows = profile.image_height or profile.height
+    num_reads = words.shape[0]
+    read_errors = np.zeros(num_reads, dtype=np.int64)
+    read_image_errors = np.zeros(num_reads, dtype=np.int64)
+    row_errors = np.zeros(profile.height, dtype=np.int64)
+    bit_errors = np.zeros(profile.num_bits, dtype=np.int64)
+
+    for start in range(0, num_reads, CHUNK_READS):
+        xor = np.bitwise_xor(np.asarray(words[start:start + CHUNK_READS]), reference)
+
+        # Popcount of the XOR, a row of the chip at a time (8 bytes at a time where possible)
+        per_row = popcount(wide_words(xor)).reshape(xor.shape[0], profile.height, -1).sum(axis=2, dtype=np.int64)
+        read_errors[start:start + xor.shape[0]] = per_row.sum(axis=1)
+        read_image_errors[start:start + xor.shape[0]] = per_row[:, :image_rows].sum(axis=1)
+        row_errors += per_row.sum(axis=0)
+
+        bit_errors += np.unpackbits(xor, axis=1).sum(axis=0, dtype=np.int64)
+
+    return read_errors, read_image_errors, row_errors, bit_errors
+
+
+# Error rate of every block of every grid size, from the per-bit error counts of num_reads reads. Returns {x: (x*x,) rates}.
+def block_error_rates(bit_errors, num_reads, grid_sizes=GRID_SIZES, profile=DEFAULT_PROFILE):
+    means = block_means(bit_errors.reshape(1, profile.height, profile.width), grid_sizes, profile.width, profile.height)
+    return {x: means[x][0] / num_reads for x in grid_sizes}
+
+
+def write_reads_csv(filename, read_errors, read_image_errors, labels, num_bits, image_bits):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['Read', 'Chip', 'Bit Errors', 'Bit Error Rate', 'Image Bit Errors', 'Image Bit Error Rate'])
+
+        # Loop through data and write each row
+        for i, (chip, errors, image) in enumerate(zip(labels.tolist(), read_errors.tolist(), read_image_errors.tolist()), 1):
+            csvwriter.writerow([i, chip, errors, '{:.6f}'.format(errors / num_bits), image, '{:.6f}'.format(image / image_bits)])
+
+def write_rows_csv(filename, row_errors, num_reads, width):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['Row', 'Bit Errors', 'Error Rate'])
+
+        # Loop through data and write each row
+        for row, errors in enumerate(row_errors.tolist()):
+            csvwriter.writerow([row, errors, '{:.6f}'.format(errors / (num_reads * width))])
+
+def write_blocks_csv(filename, rates):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['NumBlocks', 'Block', 'Error Rate'])
+
+        # Loop through data and write each row
+        for x in rates:
+            for j, rate in enumerate(rates[x].tolist()):
+                csvwriter.writerow([x*x, j, '{:.6f}'.format(rate)])
+
+
+# Compares reads 1..iterations (or every read) of one campaign with the reference image, into '<name>Stats'. Returns the summary.
+def run_campaign(input_dir, reference_file=REFERENCE_FILE, iterations=None, chips=1, chip_map=None, profile=DEFAULT_PROFILE, output_dir='BITMAPS'):
+    # If directory doesn't exist, throw error
+    if not os.path.exists(input_dir):
+        raise FileNotFoundError("This directory does not exist.")
+
+    profile = campaign_profile(input_dir, profile)
+    reference = load_reference(reference_file, profile)
+
+    if iterations is None:
+        iterations = count_reads(input_dir)
+    if iterations == 0:
+        raise FileNotFoundError("No reads found in "+input_dir+".")
+
+    words = load_words(input_dir, iterations, profile=profile)
+    labels = chip_labels(iterations, chips, chip_map)
+    read_errors, read_image_errors, row_errors, bit_errors = image_errors(words, reference, profile)
+    rates = block_error_rates(bit_errors, iterations, profile=profile)
+
+    image_rows = profile.image_height or profile.height
+    image_bits = image_rows * profile.width
+    summary = {
+        'Reads': iterations,
+        'Bits': profile.num_bits,
+        'Image Rows': image_rows,
+        'Bit Error Rate': float(read_errors.mean()) / profile.num_bits,
+        'Image Bit Error Rate': float(read_image_errors.mean()) / image_bits,
+        'Max Read Bit Error Rate': float(read_errors.max()) / profile.num_bits,
+        'Reads Without Errors': int((read_errors == 0).sum()),
+        'Bits Ever Wrong Fraction': float((bit_errors > 0).mean()),
+        'Bits Always Wrong Fraction': float((bit_errors == iterations).mean()),
+    }
+
+    name = campaign_name(input_dir)
+    stats_dir = name+'Stats'
+    if not os.path.exists(stats_dir):
+        os.mkdir(stats_dir)
+
+    np.savez(os.path.join(stats_dir, name+'_ImageErrors.npz'), chips=labels, read_errors=read_errors, read_image_errors=read_image_errors,
+             row_errors=row_errors, bit_errors=bit_errors.reshape(profile.height, profile.width))
+    write_summary_csv(os.path.join(stats_dir, name+'_ImageSummary.csv'), summary)
+    write_reads_csv(os.path.join(stats_dir, name+'_ImageReads.csv'), read_errors, read_image_errors, labels, profile.num_bits, image_bits)
+    write_rows_csv(os.path.join(stats_dir, name+'_ImageRows.csv'), row_errors, iterations, profile.width)
+    write_blocks_csv(os.path.join(stats_dir, name+'_ImageBlocks.csv'), rates)
+
+    # Error map: darker pixels were wrong in more reads
+    if not os.path.exists(output_dir):
+        os.mkdir(output_dir)
+    image = create_bit_distribution(bit_errors, profile.width, profile.height, iterations)
+    image.save(os.path.join(output_dir, name+'-imageerrors.png'))
+
+    return summary
+
+
+def add_options(parser):
+    parser.add_argument('--reference', default=REFERENCE_FILE, help="image written onto the chip (default WrittenImage.csv)")
+    parser.add_argument('--reads', type=int, help="number of reads to compare (default: every read found)")
+    add_chips_option(parser)
+    add_chip_option(parser)
+
+def main():
+    args = build_parser("Bit errors of read-back dumps against the image written onto the chip.", add_options).parse_args()
+
+    try:
+        # Batch mode: every campaign matching the pattern(s), no prompts
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: run_campaign(path, args.reference, args.reads, args.chips, args.chip_map, profile_from_args(args)))
+
+        # Get directory
+        if args.command == 'run':
+            input_dir = args.input
+        else:
+            input_dir = input("Enter the input directory (or packed .bscd file): ")
+
+        summary = run_campaign(input_dir, args.reference, args.reads, args.chips, args.chip_map, profile_from_args(args))
+        for metric, value in summary.items():
+            print(metric+": "+str(value))
+
+    # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'ImageCompare')
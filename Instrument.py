@@ -0,0 +1,159 @@
+# ----------------------------------------------------------------------------------
+# Stage timers, counters and profiling for the analysis scripts.
+#
+# The pipeline marks its stages (parsing, pre-processing, block averages,
+# fitting, writing, rendering) with
+#
+#     with stage('parse'):
+#         ...
+#     count('dumps_parsed')
+#
+# While instrumentation is off (the default) stage() hands back one shared
+# do-nothing context and count() returns straight away, so the marks cost
+# next to nothing. With '--report FILE' every stage's wall-clock and CPU time
+# and number of calls, and every counter, are gathered (from the worker
+# processes too, see ParallelRunner.py) and written to FILE as JSON at the
+# end of the run. With '--profile FILE' the whole run goes through cProfile:
+# the raw statistics are saved to FILE (for pstats / snakeviz) and the
+# slowest functions are printed.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import argparse
+import contextlib
+import datetime
+import json
+import platform
+import sys
+import time
+import numpy as np
+
+# Functions printed after a --profile run
+PROFILE_LINES = 20
+
+_enabled = False
+_stages = {}    # {name: [wall seconds, CPU seconds, calls]}
+_counters = {}  # {name: count}
+_NULL_STAGE = contextlib.nullcontext()
+
+
+# Times one pass through a stage into _stages
+class _Stage:
+    __slots__ = ('name', 'wall', 'cpu')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        entry = _stages.setdefault(self.name, [0.0, 0.0, 0])
+        entry[0] += time.perf_counter() - self.wall
+        entry[1] += time.process_time() - self.cpu
+        entry[2] += 1
+        return False
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+def enabled():
+    return _enabled
+
+def reset():
+    _stages.clear()
+    _counters.clear()
+
+
+# Context that times its block as the named stage (a shared do-nothing context while instrumentation is off)
+def stage(name):
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+# Adds n to the named counter
+def count(name, n=1):
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+# Timings and counters gathered so far, in a form that can be pickled back from a worker process
+def snapshot():
+    return {'stages': {name: list(entry) for name, entry in _stages.items()}, 'counters': dict(_counters)}
+
+
+# Adds a snapshot (e.g. from a worker process) into the timings and counters of this process
+def merge(other):
+    for name, (wall, cpu, calls) in other['stages'].items():
+        entry = _stages.setdefault(name, [0.0, 0.0, 0])
+        entry[0] += wall
+        entry[1] += cpu
+        entry[2] += calls
+    for name, value in other['counters'].items():
+        _counters[name] = _counters.get(name, 0) + value
+
+
+# The run report: the whole run's wall-clock and CPU time, and every stage and counter. Stage times are summed over processes.
+def run_report(script, wall, cpu):
+    return {
+        'script': script,
+        'argv': sys.argv[1:],
+        'finished': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'stages': {name: {'wall_seconds': wall, 'cpu_seconds': cpu, 'calls': calls} for name, (wall, cpu, calls) in sorted(_stages.items())},
+        'counters': dict(sorted(_counters.items())),
+    }
+
+
+# Adds the flags for timing the run by stage and for profiling it
+def add_profile_option(parser):
+    parser.add_argument('--report', metavar='FILE', help="write a JSON report of the time spent in each stage and of the work done")
+    parser.add_argument('--profile', metavar='FILE', help="run under cProfile, save the statistics to FILE and print the slowest functions (main process only)")
+
+
+# Runs a script's main() with the instrumentation asked for on its command line (--report, --profile).
+# main() may return the number of inputs that failed (batch mode); if any did, the script exits with status 1.
+def run_main(main, script):
+    options = argparse.ArgumentParser(add_help=False)
+    add_profile_option(options)
+    args = options.parse_known_args()[0]
+    if args.report is None and args.profile is None:
+        if main():
+            sys.exit(1)
+        return
+
+    enable(args.report is not None)
+    reset()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    if args.profile is not None:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        failures = profiler.runcall(main)
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_LINES)
+        print("Profile saved as "+args.profile)
+    else:
+        failures = main()
+
+    if args.report is not None:
+        with open(args.report, 'w') as f:
+            json.dump(run_report(script, time.perf_counter() - wall, time.process_time() - cpu), f, indent=1)
+        print("Run report saved as "+args.report)
+    if failures:
+        sys.exit(1)
@@ -0,0 +1,75 @@
+# ----------------------------------------------------------------------------------
+# Process-pool runner for per-read campaign work.
+#
+# Every read of a campaign is independent, so the analysis scripts hand their
+# per-read work to run_reads() as a function over a contiguous range of read
+# numbers. The reads to process are cut into contiguous ranges (a few per
+# worker); with one worker the ranges are processed in-process, with more they
+# are fanned out over a process pool. Only the range bounds are pickled, never
+# the reads themselves.
+#
+# Each read writes its own output file, so results are identical to a serial
+# run no matter which worker handles which chunk.
+#
+# When stage timing is on (see Instrument.py), each worker sends its timings
+# back with its result and they are added to the parent's.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import math
+from concurrent.futures import ProcessPoolExecutor
+import Instrument
+
+# Chunks handed to each worker. More than one keeps workers busy if some chunks run slow.
+TASKS_PER_WORKER = 4
+
+
+# Splits a list of read numbers into contiguous (start, end) chunks, end inclusive.
+# A chunk ends at a gap in the read numbers or after about 1/(workers * TASKS_PER_WORKER) of the reads.
+def read_chunks(reads, workers):
+    reads = sorted(reads)
+    size = max(1, math.ceil(len(reads) / (workers * TASKS_PER_WORKER)))
+    if workers <= 1:
+        size = len(reads)
+
+    chunks = []
+    for i in reads:
+        if chunks and i == chunks[-1][1] + 1 and i - chunks[-1][0] < size:
+            chunks[-1][1] = i
+        else:
+            chunks.append([i, i])
+    return [tuple(chunk) for chunk in chunks]
+
+
+# Worker side of an instrumented chunk: the result, and the timings gathered while computing it
+def run_instrumented(func, args, start, end):
+    Instrument.reset()
+    Instrument.enable()
+    result = func(*args, start, end)
+    return result, Instrument.snapshot()
+
+
+# Calls func(*args, start, end) over every contiguous chunk of 'reads', on 'workers' processes. Returns the results in read order.
+def run_reads(func, args, reads, workers=1):
+    chunks = read_chunks(reads, workers)
+    if workers <= 1:
+        return [func(*args, start, end) for start, end in chunks]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if not Instrument.enabled():
+            futures = [pool.submit(func, *args, start, end) for start, end in chunks]
+            return [future.result() for future in futures]
+
+        futures = [pool.submit(run_instrumented, func, args, start, end) for start, end in chunks]
+        results = []
+        for future in futures:
+            result, timings = future.result()
+            Instrument.merge(timings)
+            results.append(result)
+        return results
@@ -0,0 +1,58 @@
+# ----------------------------------------------------------------------------------
+# Pre-processing of SRAM dumps: inverts every bit within the banded
+# section(s) of the chip before statistics are taken.
+#
+# The banding is described as a list of (first, last) bit index ranges,
+# both ends inclusive. The inversion mask for a list of bands is built once
+# per chip size and cached, and is applied to a whole (N, 65536) read stack
+# with a single XOR.
+#
+# This module is currently configured for a memory device of size 8kB, with
+# one band from bit 16384 to bit 49150.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+from functools import lru_cache
+import numpy as np
+
+# Constants (Change if necessary, currently set for 8kB chip)
+FIRST_BANDING_LIMITER = 16384
+LAST_BANDING_LIMITER = 49150
+BANDS = ((FIRST_BANDING_LIMITER, LAST_BANDING_LIMITER),)
+
+
+# Turns a band list into the hashable, sorted form the mask cache is keyed on
+def normalize_bands(bands):
+    return tuple(sorted((int(first), int(last)) for first, last in bands))
+
+
+# Parses a band given on the command line as 'FIRST:LAST'
+def parse_band(text):
+    first, last = text.split(':')
+    return int(first), int(last)
+
+
+@lru_cache(maxsize=None)
+def _banding_mask(num_bits, bands):
+    mask = np.zeros(num_bits, dtype=np.uint8)
+    for first, last in bands:
+        mask[first:last + 1] = 1
+    mask.setflags(write=False)
+    return mask
+
+
+# Inversion mask of a chip with num_bits bits: 1 inside any band, 0 elsewhere. Cached per (num_bits, bands).
+def banding_mask(num_bits, bands=BANDS):
+    return _banding_mask(num_bits, normalize_bands(bands))
+
+
+# Pre-Processing function: takes a (num_bits,) or (N, num_bits) array of bits and returns a copy with every bit within the bands inverted
+def pre_process(bits, bands=BANDS):
+    bits = np.asarray(bits, dtype=np.uint8)
+    return np.bitwise_xor(bits, banding_mask(bits.shape[-1], bands))
@@ -0,0 +1,308 @@
+# ----------------------------------------------------------------------------------
+# A .py script that measures how stable each bit of a chip is across reads,
+# for using the SRAM power-up state as a fingerprint (PUF).
+#
+# From a stack of N reads it computes:
+#   - per bit  : count of 1s, probability of powering up as 1, number of
+#                flips between consecutive reads, and whether the bit is
+#                stable-0, stable-1 or unstable
+#   - golden   : the reference response, by majority vote over the reads
+#   - per read : Hamming distance to the golden response
+#   - summary  : bit error rate, mean pairwise intra-chip Hamming distance,
+#                stable-cell fractions, average min-entropy
+#   - pairs    : (optional) the all-pairs Hamming distance matrix between
+#                reads, and its mean/min/max for every pair of chips
+#
+# Reads can be tagged by chip (--chips N splits them evenly in order, the
+# way read200.c takes 100 reads from /dev/spidev0.0 and then 100 from
+# /dev/spidev0.1; --chip-map gives an explicit 'Read,Chip' file). Each chip
+# then gets its own summary, and the distance matrix is always computed so
+# intra-chip and inter-chip distances can be compared.
+#
+# Everything works on the packed words (one byte per address), with XOR and
+# popcount over whole arrays. Per-bit counts are gathered a block of reads at
+# a time, so memory stays bounded for long campaigns. The raw power-up values
+# are used; the banding inversion does not change any stability figure.
+#
+# The program will create '<name>Stats' under the working directory (if
+# necessary) and write into it:
+#   <name>_PufMetrics.npz   every per-bit and per-read array
+#   <name>_PufSummary.csv   Metric, Value
+#   <name>_PufReads.csv     Read, Chip, Hamming Distance, Fractional Hamming Distance
+#   <name>_Chip<c>_PufSummary.csv   (several chips) Metric, Value of chip c alone
+#   <name>_HammingMatrix.npz        (matrix) matrix, chips
+#   <name>_ChipHamming.csv          (matrix) Chip A, Chip B, Pairs, Mean / Min / Max Fractional Hamming Distance
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py).
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import csv
+import os
+import numpy as np
+from CampaignPack import load_words, campaign_name, count_reads, chip_labels, chip_reads
+from ChipProfile import DEFAULT_PROFILE
+from CommandLine import build_parser, add_chips_option, add_chip_option, profile_from_args, run_batch
+from Instrument import run_main
+
+# Reads unpacked at a time when gathering per-bit counts
+CHUNK_READS = 256
+
+# Upper bound on the XOR temporary when building the Hamming distance matrix
+MATRIX_BLOCK_BYTES = 64 * 2**20
+
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+# Number of 1 bits in each uint8 of 'words'
+def popcount(words):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    return POPCOUNT_TABLE[words]
+
+
+# Same reads viewed as uint64 when popcount can take them, so the XOR and popcount run 8 bytes at a time
+def wide_words(words):
+    words = np.ascontiguousarray(words)
+    if hasattr(np, 'bitwise_count') and words.shape[1] % 8 == 0:
+        return words.view(np.uint64)
+    return words
+
+
+# All-pairs Hamming distance matrix between the reads (rows) of 'words' and those of 'other' (default: 'words' itself).
+# Rows are taken a block at a time so the XOR temporary stays under MATRIX_BLOCK_BYTES. A matrix of a stack
+# against itself is symmetric, so only its upper half is computed and then mirrored.
+def hamming_matrix(words, other=None):
+    symmetric = other is None
+    a = wide_words(words)
+    b = a if symmetric else wide_words(other)
+    matrix = np.zeros((a.shape[0], b.shape[0]), dtype=np.int32)
+
+    rows = max(1, MATRIX_BLOCK_BYTES // max(1, b.nbytes))
+    for start in range(0, a.shape[0], rows):
+        end = min(start + rows, a.shape[0])
+        first = start if symmetric else 0
+        xor = np.bitwise_xor(a[start:end, None, :], b[None, first:, :])
+        matrix[start:end, first:] = popcount(xor).sum(axis=-1, dtype=np.int64)
+        if symmetric:
+            matrix[end:, start:end] = matrix[start:end, end:].T
+
+    return matrix
+
+
+# Mean, min and max fractional Hamming distance over the reads of every pair of chips.
+# Pairs of a chip with itself (intra-chip) leave out each read against itself.
+def chip_distances(matrix, labels, num_bits):
+    chips = list(chip_reads(labels))
+    rows = []
+    for n, chip_a in enumerate(chips):
+        for chip_b in chips[n:]:
+            block = matrix[np.ix_(labels == chip_a, labels == chip_b)]
+            if chip_a == chip_b:
+                block = block[np.triu_indices(block.shape[0], k=1)]
+            if block.size == 0:
+                continue
+            rows.append([chip_a, chip_b, block.size, block.mean() / num_bits, block.min() / num_bits, block.max() / num_bits])
+    return rows
+
+
+# Hamming distance of every read (row of 'words') to a packed reference response
+def hamming_to_reference(words, reference):
+    return popcount(np.bitwise_xor(words, reference)).sum(axis=-1, dtype=np.int64)
+
+
+# Per-bit count of 1s and per-bit count of flips between consecutive reads, gathered CHUNK_READS reads at a time
+def bit_counts(words):
+    num_bits = words.shape[1] * 8
+    ones = np.zeros(num_bits, dtype=np.int64)
+    flips = np.zeros(num_bits, dtype=np.int64)
+    previous = None
+
+    for start in range(0, words.shape[0], CHUNK_READS):
+        chunk = np.asarray(words[start:start + CHUNK_READS])
+        ones += np.unpackbits(chunk, axis=1).sum(axis=0, dtype=np.int64)
+
+        # Flips: XOR of every read with the one before it, including across the chunk boundary
+        if previous is not None:
+            chunk = np.concatenate([previous, chunk])
+        if chunk.shape[0] > 1:
+            flips += np.unpackbits(np.bitwise_xor(chunk[1:], chunk[:-1]), axis=1).sum(axis=0, dtype=np.int64)
+        previous = chunk[-1:]
+
+    return ones, flips
+
+
+# Golden (reference) response by majority vote, packed. Ties go to 0.
+def golden_response(ones, num_reads):
+    return np.packbits(2 * ones > num_reads)
+
+
+# Every per-bit, per-read and summary metric of a (N, bytes per read) stack of packed reads
+def puf_metrics(words):
+    num_reads = words.shape[0]
+    num_bits = words.shape[1] * 8
+
+    ones, flips = bit_counts(words)
+    probability = ones / num_reads
+    golden = golden_response(ones, num_reads)
+    distances = hamming_to_reference(words, golden)
+
+    stable_0 = ones == 0
+    stable_1 = ones == num_reads
+    unstable = ~(stable_0 | stable_1)
+
+    # Mean Hamming distance over all pairs of reads, straight from the per-bit counts: a bit with k ones differs in k*(N-k) pairs
+    num_pairs = num_reads * (num_reads - 1) / 2
+    if num_pairs > 0:
+        pairwise = float((ones * (num_reads - ones)).sum()) / num_pairs
+    else:
+        pairwise = float('nan')
+
+    min_entropy = -np.log2(np.maximum(probability, 1 - probability))
+
+    summary = {
+        'Reads': num_reads,
+        'Bits': num_bits,
+        'Bit Error Rate': float(distances.mean()) / num_bits,
+        'Max Fractional Hamming Distance to Golden': float(distances.max()) / num_bits,
+        'Mean Intra-Chip Hamming Distance': pairwise / num_bits,
+        'Stable-0 Fraction': float(stable_0.mean()),
+        'Stable-1 Fraction': float(stable_1.mean()),
+        'Unstable Fraction': float(unstable.mean()),
+        'Mean Flips Per Bit': float(flips.mean()),
+        'Mean Min-Entropy Per Bit': float(min_entropy.mean()),
+        'Fraction of 1s in Golden': float(np.unpackbits(golden).mean()),
+    }
+
+    arrays = {
+        'ones': ones,
+        'probability': probability,
+        'flips': flips,
+        'stable_0': stable_0,
+        'stable_1': stable_1,
+        'unstable': unstable,
+        'golden': golden,
+        'hamming_to_golden': distances,
+    }
+    return arrays, summary
+
+
+def write_summary_csv(filename, summary):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['Metric', 'Value'])
+
+        # Loop through data and write each row
+        for metric, value in summary.items():
+            if isinstance(value, float):
+                value = '{:.6f}'.format(value)
+            csvwriter.writerow([metric, value])
+
+def write_reads_csv(filename, distances, labels, num_bits):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['Read', 'Chip', 'Hamming Distance', 'Fractional Hamming Distance'])
+
+        # Loop through data and write each row
+        for i, (chip, distance) in enumerate(zip(labels.tolist(), distances.tolist()), 1):
+            csvwriter.writerow([i, chip, distance, '{:.6f}'.format(distance / num_bits)])
+
+def write_chip_distances_csv(filename, rows):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['Chip A', 'Chip B', 'Pairs', 'Mean Fractional Hamming Distance',
+                            'Min Fractional Hamming Distance', 'Max Fractional Hamming Distance'])
+
+        # Loop through data and write each row
+        for row in rows:
+            csvwriter.writerow(row[:3] + ['{:.6f}'.format(value) for value in row[3:]])
+
+
+# Computes the metrics of reads 1..iterations (or every read) of one campaign into '<name>Stats'. Returns the summary.
+# The reads are tagged by chip (see chip_labels). With more than one chip, or if matrix is set, the all-pairs
+# Hamming distance matrix and its per-chip-pair figures are written too.
+def run_campaign(input_dir, iterations=None, chips=1, chip_map=None, matrix=False, profile=DEFAULT_PROFILE):
+    # If directory doesn't exist, throw error
+    if not os.path.exists(input_dir):
+        raise FileNotFoundError("This directory does not exist.")
+
+    if iterations is None:
+        iterations = count_reads(input_dir)
+    if iterations == 0:
+        raise FileNotFoundError("No reads found in "+input_dir+".")
+
+    words = load_words(input_dir, iterations, profile=profile)
+    labels = chip_labels(iterations, chips, chip_map)
+    arrays, summary = puf_metrics(words)
+
+    name = campaign_name(input_dir)
+    stats_dir = name+'Stats'
+    if not os.path.exists(stats_dir):
+        os.mkdir(stats_dir)
+
+    np.savez(os.path.join(stats_dir, name+'_PufMetrics.npz'), chips=labels, **arrays)
+    write_summary_csv(os.path.join(stats_dir, name+'_PufSummary.csv'), summary)
+    write_reads_csv(os.path.join(stats_dir, name+'_PufReads.csv'), arrays['hamming_to_golden'], labels, summary['Bits'])
+
+    # Each chip on its own: the golden response of a campaign mixing chips means nothing
+    reads = chip_reads(labels)
+    if len(reads) > 1:
+        for chip, chip_read_list in reads.items():
+            chip_summary = puf_metrics(words[np.array(chip_read_list) - 1])[1]
+            write_summary_csv(os.path.join(stats_dir, name+'_Chip'+chip+'_PufSummary.csv'), chip_summary)
+
+    if matrix or len(reads) > 1:
+        distances = hamming_matrix(words)
+        np.savez(os.path.join(stats_dir, name+'_HammingMatrix.npz'), matrix=distances, chips=labels)
+        write_chip_distances_csv(os.path.join(stats_dir, name+'_ChipHamming.csv'), chip_distances(distances, labels, summary['Bits']))
+
+    return summary
+
+
+def add_options(parser):
+    parser.add_argument('--reads', type=int, help="number of reads to use (default: every read found)")
+    add_chips_option(parser)
+    add_chip_option(parser)
+    parser.add_argument('--matrix', action='store_true', help="also write the all-pairs Hamming distance matrix (always on with several chips)")
+
+def main():
+    args = build_parser("Per-bit stability and PUF metrics of a campaign.", add_options).parse_args()
+
+    try:
+        # Batch mode: every campaign matching the pattern(s), no prompts
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: run_campaign(path, args.reads, args.chips, args.chip_map, args.matrix, profile_from_args(args)))
+
+        # Get directory
+        if args.command == 'run':
+            input_dir = args.input
+        else:
+            input_dir = input("Enter the input directory (or packed .bscd file): ")
+
+        summary = run_campaign(input_dir, args.reads, args.chips, args.chip_map, args.matrix, profile_from_args(args))
+        for metric, value in summary.items():
+            print(metric+": "+str(value))
+        print("PUF metrics placed in directory "+os.path.abspath(campaign_name(input_dir)+'Stats'))
+
+    # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'PufMetrics')
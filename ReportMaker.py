@@ -0,0 +1,322 @@
+# ----------------------------------------------------------------------------------
+# A .py script that draws the histogram and Gaussian fit figures of a
+# campaign from the statistics already computed into '<name>Stats', so the
+# cost of plotting is only paid when someone asks for the plots.
+#
+# Figures (written into '<name>Stats/Plots'):
+#   hist_plot_chip<c>_<n>blocks.png   per chip and grid size: the per-read
+#                                     averages of every read of the chip
+#                                     (FullChipBlockStats.py output)
+#   hist_plot_read<i>_<n>blocks.png   with --per-read, per read and grid size:
+#                                     the block averages of the read
+#                                     (AvgListMaker.py output)
+#   <name>_Summary.png                with --summary, one sheet for the whole
+#                                     campaign: every grid size, every chip
+#
+# Each figure is a histogram of the values with the Gaussian fitted to them
+# (mean and population standard deviation, as make_plot in
+# FullChipBlockStats.py). The figures are drawn in worker processes
+# (--workers) with the non-interactive Agg backend. A figure newer than the
+# statistics it is drawn from is skipped, unless --force is given; the
+# 'manifest.json' in the Plots directory (see StatsCache.py) also has the
+# per-chip figures redrawn when the reads are split over chips differently.
+#
+# The statistics are taken from the campaign's columnar table when there is
+# one (see ColumnarStats.py), else from the per-read .csv files. Reads are
+# split over chips by the table's chip column, or by --chips / --chip-map.
+#
+# Run with no arguments to be prompted for the campaign, or see
+# 'python ReportMaker.py -h' for the 'run' and 'batch' subcommands.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import re
+import numpy as np
+from CampaignPack import campaign_name, chip_labels
+from ParallelRunner import run_reads
+from ColumnarStats import FORMATS, table_name, read_table
+from CommandLine import build_parser, add_chips_option, add_workers_option, add_force_option, run_batch
+from Instrument import run_main
+from StatsCache import StatsManifest
+from BlockEngine import GRID_SIZES
+import FullChipBlockStats
+import AvgListMaker
+
+PLOT_DIR = 'Plots'
+GRIDS = list(GRID_SIZES)
+
+REPORT_VERSION = 1  # Bump whenever a change alters the look of the figures
+
+
+# Saves a histogram of x with its Gaussian fit. Returns the fit (mu, sigma). matplotlib is imported on first use, with the Agg backend.
+def plot_histogram(x, filename, title, num_bins=10, xlim=None):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    x = np.asarray(x, dtype=float)
+    mu, sigma = x.mean(), x.std()
+
+    fig, ax = plt.subplots()
+    draw_histogram(ax, x, mu, sigma, num_bins)
+    if xlim is not None:
+        ax.set_xlim(*xlim)
+    ax.set_xlabel('Percent of 1s at Startup')
+    ax.set_ylabel('Probability Density')
+    ax.set_title(title+r' $\mu={:.2f}\%$, $\sigma={:.2f}\%$'.format(mu * 100, sigma * 100))
+
+    fig.savefig(filename)
+    plt.close(fig)
+    return mu, sigma
+
+
+# Histogram of x on ax, and the 'best fit' line when x is not constant
+def draw_histogram(ax, x, mu, sigma, num_bins=10, label=None):
+    n, bins, patches = ax.hist(x, num_bins, density=True, alpha=0.6, label=label)
+    if sigma > 0:
+        y = ((1 / (np.sqrt(2 * np.pi) * sigma)) *
+             np.exp(-0.5 * (1 / sigma * (bins - mu))**2))
+        ax.plot(bins, y, '--', color=patches[0].get_facecolor()[:3])
+
+
+# True if filename exists and was written after the data it is drawn from was last changed
+def is_fresh(filename, data_mtime):
+    return os.path.exists(filename) and os.path.getmtime(filename) >= data_mtime
+
+
+# Names of the figures in 'figures' ({figure name: mtime of its data}) that have to be drawn: missing, older than their data,
+# or not drawn from this data with these parameters according to the manifest
+def stale_figures(manifest, plot_dir, figures, force=False):
+    if force:
+        return set(figures)
+    stale = set(manifest.stale_reads({figure: repr(mtime) for figure, mtime in figures.items()}, lambda figure: figure))
+    return stale | {figure for figure, mtime in figures.items() if not is_fresh(os.path.join(plot_dir, figure), mtime)}
+
+
+# Columnar table of one kind ('BlockStats' or 'BlockAverages') in the stats directory, or None
+def find_table(stats_dir, name, kind):
+    for fmt in FORMATS:
+        filename = os.path.join(stats_dir, table_name(name, kind, fmt))
+        if os.path.exists(filename):
+            return filename
+    return None
+
+
+# Read numbers that have a per-read output file, e.g. 'JUL4_<i>Stats.csv' for output_name = FullChipBlockStats.output_name
+def csv_reads(stats_dir, name, output_name):
+    prefix, suffix = output_name(name, '\0').split('\0')
+    pattern = re.compile('^'+re.escape(prefix)+r'(\d+)'+re.escape(suffix)+'$')
+    reads = []
+    for filename in os.listdir(stats_dir):
+        match = pattern.match(filename)
+        if match:
+            reads.append(int(match.group(1)))
+    return sorted(reads)
+
+
+# Per-read statistics of a campaign, as (reads, averages, stds, chips, mtimes):
+# the (N, 19) average and standard deviation of the block averages of every read, its chip ('' if unknown) and when its data last changed
+def load_read_stats(stats_dir, name):
+    table_file = find_table(stats_dir, name, 'BlockStats')
+    if table_file is not None:
+        table = read_table(table_file)
+        summary = table['block'] == -1
+        reads = table['read'][summary][::len(GRIDS)]
+        averages = table['mean'][summary].reshape(-1, len(GRIDS))
+        stds = table['std'][summary].reshape(-1, len(GRIDS))
+        chips = table['chip'][summary][::len(GRIDS)]
+        mtimes = np.full(reads.shape, os.path.getmtime(table_file))
+        return reads, averages, stds, chips, mtimes
+
+    reads = np.array(csv_reads(stats_dir, name, FullChipBlockStats.output_name), dtype=int)
+    averages = np.zeros((reads.size, len(GRIDS)))
+    stds = np.zeros((reads.size, len(GRIDS)))
+    mtimes = np.zeros(reads.size)
+    for n, i in enumerate(reads.tolist()):
+        filename = os.path.join(stats_dir, FullChipBlockStats.output_name(name, i))
+        data = np.loadtxt(filename, delimiter=',', skiprows=1, ndmin=2)
+        averages[n], stds[n] = data[:, 1], data[:, 2]
+        mtimes[n] = os.path.getmtime(filename)
+    return reads, averages, stds, np.full(reads.shape, ''), mtimes
+
+
+# Block averages of read i for every grid size, as {x: (x*x,) array}, from an AvgList .csv file
+def load_avglist(filename):
+    data = np.loadtxt(filename, delimiter=',', skiprows=1, ndmin=2)
+    return {x: data[data[:, 0] == x * x, 1] for x in GRIDS}
+
+
+def chip_plot_name(chip, x):
+    return 'hist_plot_chip'+str(chip)+'_'+str(x*x)+'blocks.png'
+
+def read_plot_name(i, x):
+    return 'hist_plot_read'+str(i)+'_'+str(x*x)+'blocks.png'
+
+
+# Worker: draws the stale per-chip figures of grid sizes first..last. Returns the number of figures drawn.
+def plot_grids(plot_dir, averages, chips, stale, first, last):
+    made = 0
+    for x in range(first, last + 1):
+        for chip in dict.fromkeys(chips.tolist()):
+            if chip_plot_name(chip, x) not in stale:
+                continue
+            plot_histogram(averages[chips == chip, x - 2], os.path.join(plot_dir, chip_plot_name(chip, x)), 'Chip '+str(chip)+', '+str(x*x)+' Blocks')
+            made += 1
+    return made
+
+
+# Worker: draws the stale per-read figures of reads first..last from their block averages. Returns the number of figures drawn.
+def plot_reads(stats_dir, name, plot_dir, stale, first, last):
+    table_file = find_table(stats_dir, name, 'BlockAverages')
+    table = None
+    made = 0
+    for i in range(first, last + 1):
+        grids = [x for x in GRIDS if read_plot_name(i, x) in stale]
+        if not grids:
+            continue
+
+        # The table is loaded once per worker, and only if some figure has to be drawn
+        if table_file is not None:
+            if table is None:
+                table = read_table(table_file)
+            rows = table['read'] == i
+            means = {x: table['mean'][rows & (table['grid'] == x)] for x in grids}
+        else:
+            means = load_avglist(os.path.join(stats_dir, AvgListMaker.output_name(name, i)))
+
+        for x in grids:
+            plot_histogram(means[x], os.path.join(plot_dir, read_plot_name(i, x)), 'Read '+str(i)+', '+str(x*x)+' Blocks')
+            made += 1
+    return made
+
+
+# One sheet for a whole campaign: the per-chip histogram of every grid size, and the spread of the block averages against the number of blocks.
+def plot_summary(filename, name, averages, stds, chips):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(4, 5, figsize=(20, 14))
+    axes = axes.ravel()
+    for x in GRIDS:
+        ax = axes[x - 2]
+        for chip in dict.fromkeys(chips.tolist()):
+            values = averages[chips == chip, x - 2]
+            draw_histogram(ax, values, values.mean(), values.std(), label='Chip '+str(chip))
+        ax.set_title(str(x*x)+' Blocks')
+
+    ax = axes[len(GRIDS)]
+    for chip in dict.fromkeys(chips.tolist()):
+        ax.plot([x*x for x in GRIDS], stds[chips == chip].mean(axis=0), 'o-', label='Chip '+str(chip))
+    ax.set_xscale('log')
+    ax.set_xlabel('Number of Blocks')
+    ax.set_ylabel('Mean Standard Deviation')
+    ax.legend()
+
+    fig.suptitle(name+': '+str(averages.shape[0])+' reads')
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+
+
+# Draws the figures of one campaign into '<name>Stats/Plots'. Returns that directory and the number of figures drawn.
+# Reads are tagged by the table's chip column, unless chips > 1 or a chip map is given.
+def run_report(input_path, workers=1, per_read=False, summary=False, force=False, chips=1, chip_map=None):
+    name = campaign_name(input_path)
+    stats_dir = os.path.abspath(name+'Stats')
+
+    # If the statistics don't exist, throw error
+    if not os.path.exists(stats_dir):
+        raise FileNotFoundError("No statistics in "+stats_dir+". Run FullChipBlockStats.py first.")
+
+    reads, averages, stds, labels, mtimes = load_read_stats(stats_dir, name)
+    if reads.size == 0:
+        raise FileNotFoundError("No read statistics found in "+stats_dir+".")
+    if chips > 1 or chip_map is not None:
+        labels = chip_labels(int(reads.max()), chips, chip_map)[reads - 1]
+    labels = np.where(labels == '', '1', labels)
+
+    plot_dir = os.path.join(stats_dir, PLOT_DIR)
+    if not os.path.exists(plot_dir):
+        os.mkdir(plot_dir)
+
+    # Per-chip figures (and the summary sheet), drawn again whenever the reads or their split over chips change
+    figures = {}
+    for chip in dict.fromkeys(labels.tolist()):
+        for x in GRIDS:
+            figures[chip_plot_name(chip, x)] = mtimes[labels == chip].max()
+    summary_name = name+'_Summary.png'
+    if summary:
+        figures[summary_name] = mtimes.max()
+    manifest = StatsManifest(plot_dir, 'ReportMaker', {'reads': reads.tolist(), 'chips': labels.tolist(), 'version': REPORT_VERSION})
+    stale = stale_figures(manifest, plot_dir, figures, force)
+
+    # Only the grid sizes with something to draw are handed out to the workers
+    grids = [x for x in GRIDS if any(chip_plot_name(chip, x) in stale for chip in set(labels.tolist()))]
+    made = sum(run_reads(plot_grids, (plot_dir, averages, labels, stale), grids, workers))
+    if summary_name in stale:
+        plot_summary(os.path.join(plot_dir, summary_name), name, averages, stds, labels)
+        made += 1
+    manifest.record({figure: repr(mtime) for figure, mtime in figures.items()}, lambda figure: figure)
+
+    if per_read:
+        table_file = find_table(stats_dir, name, 'BlockAverages')
+        if table_file is not None:
+            avg_reads = np.unique(read_table(table_file)['read']).tolist()
+        else:
+            avg_reads = csv_reads(stats_dir, name, AvgListMaker.output_name)
+        if not avg_reads:
+            raise FileNotFoundError("No block averages found in "+stats_dir+". Run AvgListMaker.py first.")
+
+        figures = {}
+        for i in avg_reads:
+            data_file = table_file if table_file is not None else os.path.join(stats_dir, AvgListMaker.output_name(name, i))
+            data_mtime = os.path.getmtime(data_file)
+            for x in GRIDS:
+                figures[read_plot_name(i, x)] = data_mtime
+        manifest = StatsManifest(plot_dir, 'ReportMaker:reads', {'version': REPORT_VERSION})
+        stale = stale_figures(manifest, plot_dir, figures, force)
+
+        stale_reads = [i for i in avg_reads if any(read_plot_name(i, x) in stale for x in GRIDS)]
+        made += sum(run_reads(plot_reads, (stats_dir, name, plot_dir, stale), stale_reads, workers))
+        manifest.record({figure: repr(mtime) for figure, mtime in figures.items()}, lambda figure: figure)
+
+    return plot_dir, made
+
+def add_options(parser):
+    add_workers_option(parser)
+    add_force_option(parser)
+    add_chips_option(parser)
+    parser.add_argument('--per-read', action='store_true', help="also draw every read's block averages, per grid size (needs AvgListMaker.py output)")
+    parser.add_argument('--summary', action='store_true', help="also compose one summary sheet for the campaign")
+
+def main():
+    args = build_parser("Histogram and Gaussian fit figures of a campaign's statistics.", add_options).parse_args()
+
+    try:
+        # Batch mode: every campaign matching the pattern(s), no prompts
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: run_report(path, args.workers, args.per_read, args.summary, args.force, args.chips, args.chip_map))
+
+        # Get directory
+        if args.command == 'run':
+            input_dir = args.input
+        else:
+            input_dir = input("Enter the input directory (or packed .bscd file): ")
+
+        plot_dir, made = run_report(input_dir, args.workers, args.per_read, args.summary, args.force, args.chips, args.chip_map)
+        print(str(made)+" plots made and saved in directory "+plot_dir)
+
+    # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'ReportMaker')
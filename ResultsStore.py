@@ -0,0 +1,368 @@
+# ----------------------------------------------------------------------------------
+# A .py script that keeps the block statistics of many campaigns in one local
+# SQLite database, so aging trends across campaigns (JUL4, AUG12, ...) are a
+# query instead of a re-parse of every '<name>Stats' directory.
+#
+# Tables (all indexed for the trend queries below):
+#   campaigns    name, absolute path (which identifies the campaign, so
+#                campaigns of the same name in different places are kept
+#                apart), date, chip profile, parameters, number of reads
+#   chips        chip labels of a campaign ('1', '2', ... or the chip map's)
+#   reads        read number, chip and content hash of every dump
+#   block_stats  per read and grid size (2x2 .. 20x20): the mean and
+#                (population) standard deviation of the block averages, the
+#                same numbers as FullChipBlockStats.py's Stats files, and the
+#                x*x block averages themselves as one float64 BLOB
+#
+# Keeping the block averages of a read and grid in one row (instead of a row
+# per block) keeps a campaign to a few thousand rows: it is stored in tens of
+# milliseconds, and its blocks are loaded straight into NumPy.
+#
+# A campaign is filled in one transaction of bulk inserts and replaces any
+# earlier copy of itself; a campaign whose dumps, parameters and date have
+# not changed since it was stored is skipped. Its date is taken from --date, or
+# from a name like 'JUL4' (the year from the dumps' modification time), or
+# from the modification time of its first dump.
+#
+# The query helpers return NumPy arrays:
+#   trend(connection, grid, chip)            mean and standard deviation of
+#                                            the block averages per campaign
+#                                            (and chip), by date
+#   block_trend(connection, grid, chip)      average of every block per
+#                                            campaign, by date
+#   read_stats(connection, campaign, grid)   mean and standard deviation per
+#                                            read
+#   read_blocks(connection, campaign, grid)  block averages of every read
+# where 'campaign' is the path of a stored campaign, or its name if no other
+# stored campaign has the same name.
+#
+# FullChipBlockStats.py fills the store with '--store FILE' from the fits of
+# its statistics stage, without parsing the dumps again; it does not keep
+# the block averages of every read, so those are only stored by this script.
+#
+# Usage:
+#   python ResultsStore.py run JUL4 [--store Results.db] [--date 2026-07-04] [--chips 2] [--trend 9]
+#   python ResultsStore.py batch 'JUL*' 'AUG*' [--trend 9]
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py).
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import datetime
+import json
+import os
+import re
+import sqlite3
+import numpy as np
+from Campaign import Campaign
+from BlockEngine import GRID_SIZES
+from CampaignPack import dump_path, campaign_name
+from PreProcess import normalize_bands
+from StatsCache import input_hashes
+from ChipProfile import DEFAULT_PROFILE
+from Instrument import stage, count, run_main
+from CommandLine import build_parser, add_chips_option, add_band_option, add_chip_option, add_force_option, add_store_option, bands_from_args, profile_from_args, run_batch
+
+STORE_FILE = 'Results.db'
+STORE_VERSION = 1   # Bump whenever a change alters what is stored for a campaign
+SCHEMA_VERSION = 2  # Bump whenever a change alters the tables (older stores are refused, not migrated)
+
+# Byte layout of the block averages in block_stats.blocks
+BLOCK_DTYPE = np.dtype('<f8')
+
+MONTHS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    chip TEXT NOT NULL,
+    params TEXT NOT NULL,
+    read_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS campaigns_date ON campaigns (date);
+CREATE INDEX IF NOT EXISTS campaigns_name ON campaigns (name);
+
+CREATE TABLE IF NOT EXISTS chips (
+    id INTEGER PRIMARY KEY,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns (id) ON DELETE CASCADE,
+    label TEXT NOT NULL,
+    UNIQUE (campaign_id, label)
+);
+CREATE INDEX IF NOT EXISTS chips_label ON chips (label);
+
+CREATE TABLE IF NOT EXISTS reads (
+    id INTEGER PRIMARY KEY,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns (id) ON DELETE CASCADE,
+    chip_id INTEGER NOT NULL REFERENCES chips (id) ON DELETE CASCADE,
+    read INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    UNIQUE (campaign_id, read)
+);
+CREATE INDEX IF NOT EXISTS reads_chip ON reads (chip_id);
+
+CREATE TABLE IF NOT EXISTS block_stats (
+    read_id INTEGER NOT NULL REFERENCES reads (id) ON DELETE CASCADE,
+    grid INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    std REAL NOT NULL,
+    blocks BLOB,
+    UNIQUE (read_id, grid)
+);
+CREATE INDEX IF NOT EXISTS block_stats_grid ON block_stats (grid);
+'''
+
+
+# Opens (creating if necessary) a results store
+def open_store(filename=STORE_FILE):
+    connection = sqlite3.connect(filename)
+    version = connection.execute('PRAGMA user_version').fetchone()[0]
+    if version != SCHEMA_VERSION and connection.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'campaigns'").fetchone()[0]:
+        connection.close()
+        raise ValueError(filename+" was made by another version of ResultsStore.py. Remove it and store the campaigns again.")
+    connection.execute('PRAGMA foreign_keys = ON')
+    connection.executescript(SCHEMA)
+    connection.execute('PRAGMA user_version = '+str(SCHEMA_VERSION))
+    return connection
+
+
+# Date of a campaign as 'YYYY-MM-DD': the one given, else the month and day of a name like 'JUL4' in the year its first dump
+# was written, else the day its first dump (or packed file) was written
+def campaign_date(path, name, date=None):
+    if date is not None:
+        return datetime.date.fromisoformat(date).isoformat()
+
+    first = path if os.path.isfile(path) else dump_path(path, 1)
+    written = datetime.date.fromtimestamp(os.path.getmtime(first if os.path.exists(first) else path))
+    match = re.match(r'^([A-Za-z]{3})(\d{1,2})(?!\d)', name)
+    if match and match.group(1).upper() in MONTHS:
+        try:
+            return datetime.date(written.year, MONTHS.index(match.group(1).upper()) + 1, int(match.group(2))).isoformat()
+        except ValueError:
+            pass
+    return written.isoformat()
+
+
+# Parameters a stored campaign was made with. A change to any of them replaces the campaign on the next store.
+def store_params(bands, profile=DEFAULT_PROFILE, blocks=True):
+    return json.dumps({'bands': [list(band) for band in normalize_bands(bands)], 'chip': profile.to_dict(), 'blocks': blocks, 'version': STORE_VERSION}, sort_keys=True)
+
+
+# True if the campaign at 'path' is stored with these parameters (see store_params) and date, and the same dumps and chips.
+# 'hashes' is {read number: content hash} as StatsCache.input_hashes returns it, 'labels' the chip label of reads 1..N.
+def is_stored(connection, path, params, date, hashes, labels):
+    row = connection.execute('SELECT id, params, date FROM campaigns WHERE path = ?', (os.path.abspath(path),)).fetchone()
+    if row is None or row[1] != params or row[2] != date:
+        return False
+    stored = {i: (digest, label) for i, digest, label in connection.execute(
+        'SELECT r.read, r.hash, ch.label FROM reads r JOIN chips ch ON ch.id = r.chip_id WHERE r.campaign_id = ?', (row[0],))}
+    return stored == {i: (hashes[i], label) for i, label in enumerate(np.asarray(labels).tolist(), 1)}
+
+
+# Bulk-inserts the statistics of reads 1..N of the campaign at 'path' into the store at 'connection', replacing any earlier copy, in one transaction.
+# mu and sigma are the fits of every read, (N, grid sizes), as BlockEngine.block_fit returns them; 'blocks', if given, holds the block
+# averages of every read, {x: (N, x*x)}. params is store_params(...), labels and hashes as for is_stored.
+def store_reads(connection, path, date, profile, params, labels, hashes, mu, sigma, blocks=None, grid_sizes=GRID_SIZES):
+    labels = np.asarray(labels).tolist()
+    num_reads = len(labels)
+    path = os.path.abspath(path)
+    with stage('store'), connection:
+        connection.execute('DELETE FROM campaigns WHERE path = ?', (path,))
+        campaign_id = connection.execute('INSERT INTO campaigns (name, date, path, chip, params, read_count) VALUES (?, ?, ?, ?, ?, ?)',
+                                         (campaign_name(path), date, path, profile.name, params, num_reads)).lastrowid
+
+        chip_ids = {}
+        for label in labels:
+            if label not in chip_ids:
+                chip_ids[label] = connection.execute('INSERT INTO chips (campaign_id, label) VALUES (?, ?)', (campaign_id, label)).lastrowid
+        connection.executemany('INSERT INTO reads (campaign_id, chip_id, read, hash) VALUES (?, ?, ?, ?)',
+                               [(campaign_id, chip_ids[label], i, hashes[i]) for i, label in enumerate(labels, 1)])
+        read_ids = np.array([read_id for read_id, in connection.execute('SELECT id FROM reads WHERE campaign_id = ? ORDER BY read', (campaign_id,))])
+
+        # One row per read and grid size, its block averages (if given) packed as little-endian float64
+        for g, x in enumerate(grid_sizes):
+            if blocks is not None:
+                means = np.asarray(blocks[x]).astype(BLOCK_DTYPE)
+                packed = [row.tobytes() for row in means]
+            else:
+                packed = [None] * num_reads
+            connection.executemany('INSERT INTO block_stats (read_id, grid, mean, std, blocks) VALUES (?, ?, ?, ?, ?)',
+                                   zip(read_ids.tolist(), [x] * num_reads, mu[:, g].tolist(), sigma[:, g].tolist(), packed))
+    count('rows_stored', num_reads * len(grid_sizes))
+
+
+# Stores every read of a Campaign (with its block averages, if blocks is set) into the store at 'connection'; see store_reads.
+# 'hashes' is {read number: content hash} as StatsCache.input_hashes returns it (hashed here if not given).
+# Returns False (and stores nothing) if the campaign is already stored with the same dumps, parameters and date, unless force is set.
+def store_campaign(connection, campaign, hashes=None, date=None, blocks=True, force=False):
+    if hashes is None:
+        with stage('hash'):
+            hashes = input_hashes(campaign.path, 1, campaign.num_reads)
+    params = store_params(campaign.bands, campaign.profile, blocks)
+    date = campaign_date(campaign.path, campaign.name, date)
+    if not force and is_stored(connection, campaign.path, params, date, hashes, campaign.labels):
+        return False
+
+    mu, sigma = campaign.fits
+    store_reads(connection, campaign.path, date, campaign.profile, params, campaign.labels, hashes, mu, sigma,
+                campaign.block_means if blocks else None, campaign.grid_sizes)
+    return True
+
+
+# Id of a stored campaign, given its path or (if no other stored campaign has the same name) its name
+def find_campaign(connection, campaign):
+    row = connection.execute('SELECT id FROM campaigns WHERE path = ?', (os.path.abspath(campaign),)).fetchone()
+    if row is not None:
+        return row[0]
+    rows = connection.execute('SELECT id FROM campaigns WHERE name = ?', (campaign,)).fetchall()
+    if not rows:
+        raise ValueError("Campaign "+campaign+" is not in the store.")
+    if len(rows) > 1:
+        raise ValueError(str(len(rows))+" stored campaigns are named "+campaign+". Give the path of the one wanted.")
+    return rows[0][0]
+
+
+# Mean and standard deviation of the block averages of grid size x, averaged over the reads of every stored campaign and chip
+# (only chip 'chip', if given). One row per campaign and chip, by chip then date.
+# Returns (names, dates (datetime64[D]), chips, reads, means, stds), each an array with one entry per row.
+def trend(connection, x, chip=None):
+    query = ('SELECT c.name, c.date, ch.label, COUNT(*), AVG(s.mean), AVG(s.std) FROM campaigns c '
+             'JOIN reads r ON r.campaign_id = c.id JOIN chips ch ON ch.id = r.chip_id JOIN block_stats s ON s.read_id = r.id AND s.grid = ?')
+    params = [x]
+    if chip is not None:
+        query += ' WHERE ch.label = ?'
+        params.append(str(chip))
+    rows = connection.execute(query+' GROUP BY c.id, ch.id ORDER BY ch.label, c.date, c.name, c.id', params).fetchall()
+    if not rows:
+        return np.array([], dtype=str), np.array([], dtype='datetime64[D]'), np.array([], dtype=str), np.array([], dtype=int), np.array([]), np.array([])
+    names, dates, chips, reads, means, stds = zip(*rows)
+    return np.array(names), np.array(dates, dtype='datetime64[D]'), np.array(chips), np.array(reads), np.array(means), np.array(stds)
+
+
+# Average of every block of grid size x over the reads of every stored campaign (of chip 'chip' only, if given), by date.
+# Returns (names, dates (datetime64[D]), (campaigns, x*x) array of block averages). Campaigns stored without blocks are left out.
+def block_trend(connection, x, chip=None):
+    query = ('SELECT c.id, c.name, c.date, b.blocks FROM campaigns c '
+             'JOIN reads r ON r.campaign_id = c.id JOIN chips ch ON ch.id = r.chip_id JOIN block_stats b ON b.read_id = r.id AND b.grid = ? '
+             'WHERE b.blocks IS NOT NULL')
+    params = [x]
+    if chip is not None:
+        query += ' AND ch.label = ?'
+        params.append(str(chip))
+    ids = []
+    names = []
+    dates = []
+    sums = []
+    counts = []
+    for campaign_id, name, date, blocks in connection.execute(query+' ORDER BY c.date, c.name, c.id', params):
+        if not ids or ids[-1] != campaign_id:
+            ids.append(campaign_id)
+            names.append(name)
+            dates.append(date)
+            sums.append(np.zeros(x * x))
+            counts.append(0)
+        sums[-1] += np.frombuffer(blocks, dtype=BLOCK_DTYPE)
+        counts[-1] += 1
+    if not names:
+        return np.array([], dtype=str), np.array([], dtype='datetime64[D]'), np.zeros((0, x * x))
+    return np.array(names), np.array(dates, dtype='datetime64[D]'), np.array(sums) / np.array(counts)[:, None]
+
+
+# Mean and standard deviation of the block averages of grid size x for every read of one stored campaign (path or name, see find_campaign).
+# Returns (reads, chips, means, stds), each an array with one entry per read.
+def read_stats(connection, campaign, x):
+    rows = connection.execute('SELECT r.read, ch.label, s.mean, s.std FROM reads r JOIN chips ch ON ch.id = r.chip_id '
+                              'JOIN block_stats s ON s.read_id = r.id AND s.grid = ? '
+                              'WHERE r.campaign_id = ? ORDER BY r.read', (x, find_campaign(connection, campaign))).fetchall()
+    if not rows:
+        raise ValueError("Campaign "+campaign+" has no "+str(x)+"x"+str(x)+" grid in the store.")
+    reads, chips, means, stds = zip(*rows)
+    return np.array(reads), np.array(chips), np.array(means), np.array(stds)
+
+
+# Block averages of grid size x for every read of one stored campaign (path or name, see find_campaign).
+# Returns (reads, (reads, x*x) array of block averages).
+def read_blocks(connection, campaign, x):
+    rows = connection.execute('SELECT r.read, b.blocks FROM reads r JOIN block_stats b ON b.read_id = r.id AND b.grid = ? '
+                              'WHERE r.campaign_id = ? ORDER BY r.read', (x, find_campaign(connection, campaign))).fetchall()
+    if not rows:
+        raise ValueError("Campaign "+campaign+" has no "+str(x)+"x"+str(x)+" grid in the store.")
+    if rows[0][1] is None:
+        raise ValueError("Campaign "+campaign+" was stored without its block averages.")
+    reads, blocks = zip(*rows)
+    return np.array(reads), np.frombuffer(b''.join(blocks), dtype=BLOCK_DTYPE).reshape(len(reads), x * x)
+
+
+# Stores every read of one campaign (directory or packed file) into the store file. Returns True if it was (re)stored.
+# bands=None inverts the chip's own banding.
+def run_campaign(input_dir, store_file=STORE_FILE, date=None, chips=1, chip_map=None, bands=None, profile=DEFAULT_PROFILE, blocks=True, force=False):
+    campaign = Campaign(input_dir, bands=bands, chips=chips, chip_map=chip_map, profile=profile)
+    connection = open_store(store_file)
+    try:
+        return store_campaign(connection, campaign, date=date, blocks=blocks, force=force)
+    finally:
+        connection.close()
+
+
+def print_trend(store_file, x, chip=None):
+    connection = open_store(store_file)
+    try:
+        names, dates, chips, reads, means, stds = trend(connection, x, chip)
+    finally:
+        connection.close()
+    print("Chip, Campaign, Date, Reads, Average, Standard Deviation ("+str(x*x)+" blocks)")
+    for row in zip(chips.tolist(), names.tolist(), dates.astype(str).tolist(), reads.tolist(), means.tolist(), stds.tolist()):
+        print('{}, {}, {}, {}, {:.4f}, {:.4f}'.format(*row))
+
+
+def add_options(parser):
+    add_store_option(parser, STORE_FILE)
+    add_chips_option(parser)
+    add_band_option(parser)
+    add_chip_option(parser)
+    add_force_option(parser)
+    parser.add_argument('--no-blocks', action='store_true', help="store only the per-read summary of every grid, not every block average")
+    parser.add_argument('--trend', type=int, metavar='X', help="then print the trend of the XxX grid over every stored campaign")
+    parser.add_argument('--trend-chip', metavar='CHIP', help="with --trend, only this chip")
+
+def main():
+    args = build_parser("Store the block statistics of campaigns in one SQLite database and query trends across them.", add_options).parse_args()
+
+    try:
+        def store_one(path):
+            stored = run_campaign(path, args.store, args.date, args.chips, args.chip_map, bands_from_args(args), profile_from_args(args), not args.no_blocks, args.force)
+            if not stored:
+                print(path+" is already up to date in "+args.store)
+
+        # Batch mode: every campaign matching the pattern(s), no prompts
+        failures = 0
+        if args.command == 'batch':
+            failures = run_batch(args.patterns, store_one)
+        else:
+            # Get directory
+            if args.command == 'run':
+                input_dir = args.input
+            else:
+                input_dir = input("Enter the input directory (or packed .bscd file): ")
+            store_one(input_dir)
+            print("Statistics of "+input_dir+" stored in "+os.path.abspath(args.store))
+
+        if args.trend is not None:
+            print_trend(args.store, args.trend, args.trend_chip)
+        return failures
+
+    # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'ResultsStore')
@@ -0,0 +1,106 @@
+# ----------------------------------------------------------------------------------
+# Incremental statistics generation for campaign directories.
+#
+# Each '<dir>Stats' output directory carries a 'manifest.json' recording, per
+# script, the parameters its outputs were made with (grid range, banding
+# limiters, script version) and a content hash of every input dump it has
+# processed. On a re-run only the reads whose dump changed, whose output file
+# went missing, or all reads if the parameters changed, are recomputed.
+#
+# Appending reads to an ongoing aging campaign therefore only costs the new
+# reads, plus hashing the old ones.
+#
+# An entry can also keep a small per-read value (e.g. the fits of the read),
+# so outputs built from every read of a campaign can be rebuilt from the
+# manifest without parsing the unchanged dumps again.
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import hashlib
+import json
+import os
+from CampaignPack import PackedCampaign, dump_path
+
+MANIFEST_NAME = 'manifest.json'
+
+
+# Content hash of reads first..last of a campaign, as {read number: hex digest}. If missing even one read, error is thrown.
+# For a .csv directory the file bytes are hashed, for a packed file the read's words.
+def input_hashes(input_dir, first, last):
+    hashes = {}
+    if os.path.isfile(input_dir):
+        packed = PackedCampaign(input_dir)
+        for i in range(first, last + 1):
+            hashes[i] = hashlib.blake2b(packed.read(i).words.tobytes(), digest_size=16).hexdigest()
+        return hashes
+
+    for i in range(first, last + 1):
+        filename = dump_path(input_dir, i)
+        if not os.path.exists(filename):
+            raise FileNotFoundError("File '"+os.path.basename(filename)+"' does not exist.")
+        with open(filename, 'rb') as f:
+            hashes[i] = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    return hashes
+
+
+# Manifest of the outputs one script has written into an output directory
+class StatsManifest:
+    def __init__(self, output_dir, script, params):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.output_dir = output_dir
+        self.script = script
+        self.params = params
+        self.entries = {}
+
+        # Entries made with other parameters are worthless, so they are dropped
+        section = self.load().get(script, {})
+        if section.get('params') == params:
+            self.entries = section.get('reads', {})
+
+    # Every section of the manifest file, {} if there is none yet
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    # Reads (sorted) whose input hash differs from the manifest, or whose output file is missing.
+    # output_name(i) is the name of read i's output file in the output directory, or None if the read only has a recorded value.
+    def stale_reads(self, hashes, output_name):
+        stale = []
+        for i in sorted(hashes):
+            entry = self.entries.get(str(i))
+            output = output_name(i)
+            if entry is None or entry['hash'] != hashes[i] or entry['output'] != output \
+                    or (output is not None and not os.path.exists(os.path.join(self.output_dir, output))):
+                stale.append(i)
+        return stale
+
+    # Value recorded with read i, or None
+    def value(self, i):
+        return self.entries.get(str(i), {}).get('value')
+
+    # Records reads as up to date and writes the manifest back out.
+    # 'values', if given, is {read number: JSON-serializable value} to keep with the reads; reads not in it keep their old value.
+    def record(self, hashes, output_name, values=None):
+        for i in hashes:
+            entry = {'hash': hashes[i], 'output': output_name(i)}
+            if values is not None and i in values:
+                entry['value'] = values[i]
+            elif self.value(i) is not None:
+                entry['value'] = self.value(i)
+            self.entries[str(i)] = entry
+
+        # Read again, so the sections other manifests of this directory recorded since this one was made are kept
+        manifest = self.load()
+        manifest[self.script] = {'params': self.params, 'reads': self.entries}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,285 @@
+# ----------------------------------------------------------------------------------
+# A .py script for constant-memory processing of very large read campaigns.
+#
+# stream_reads() is a generator that reads one dump, pre-processes it,
+# computes its block averages for every grid size, yields the result and
+# drops it before touching the next dump. Nothing is kept per read, so peak
+# memory does not depend on how many reads the campaign has.
+#
+# Statistics across reads are kept in running (Welford) accumulators instead
+# of being computed after the fact from every read held in memory:
+#   - per bit   : count of 1s, mean and variance of the power-up value
+#   - per block : mean and variance of the block average, for every grid size
+# Accumulators from separate chunks of reads can be merged, so the work can
+# also be spread over a process pool.
+#
+# The program will create '<name>Stats' under the working directory (if
+# necessary) and write into it:
+#   <name>_StreamStats.csv   Block Size, Block, Reads, Mean, Standard Deviation
+#   <name>_BitStats.npz      per-bit ones count, mean and variance
+#
+# With --follow the campaign directory is watched while read100.c / read200.c
+# are still writing it: each dump is taken in as soon as it is complete (see
+# follow_campaign in CampaignPack.py), and every --refresh seconds the files
+# above and the bit distribution 'BITMAPS/<name>-bitdistribution.png' are
+# rewritten from the running state. Following stops after --reads reads, or
+# once no new dump has shown up for --idle-timeout seconds.
+#
+# This script defaults to a memory device of size 8kB; pass --chip for the
+# others (see ChipProfile.py).
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import csv
+import os
+import time
+import numpy as np
+from BlockEngine import GRID_SIZES, block_means
+from CampaignPack import iter_campaign, follow_campaign, campaign_name, campaign_profile, count_reads
+from PreProcess import BANDS, pre_process
+from ParallelRunner import run_reads
+from Instrument import stage, count, run_main
+from ChipProfile import DEFAULT_PROFILE
+from CommandLine import build_parser, add_workers_option, add_band_option, add_chip_option, add_follow_option, bands_from_args, profile_from_args, run_batch
+
+
+# Running mean and variance (Welford's algorithm) of a fixed-shape array over a stream of samples
+class Welford:
+    def __init__(self, shape):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, sample):
+        self.count += 1
+        delta = sample - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (sample - self.mean)
+
+    # Folds a whole batch of samples (stacked along the first axis) in at once
+    def update_batch(self, samples):
+        samples = np.asarray(samples, dtype=float)
+        batch = Welford(self.mean.shape)
+        batch.count = samples.shape[0]
+        batch.mean = samples.mean(axis=0)
+        batch.m2 = ((samples - batch.mean) ** 2).sum(axis=0)
+        self.merge(batch)
+
+    # Folds another accumulator of the same shape into this one (Chan et al. parallel update)
+    def merge(self, other):
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.m2 = self.m2 + other.m2 + delta * delta * (self.count * other.count / count)
+        self.count = count
+
+    # Sample variance (ddof=1 by default, like statistics.stdev). NaN until there are enough samples.
+    def variance(self, ddof=1):
+        if self.count <= ddof:
+            return np.full(self.mean.shape, np.nan)
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=1):
+        return np.sqrt(self.variance(ddof))
+
+
+# One read's worth of results, as yielded by stream_reads
+class ReadResult:
+    def __init__(self, index, bits, means):
+        self.index = index
+        self.bits = bits      # pre-processed bits, flat
+        self.means = means    # {x: (x*x,) block averages}
+
+
+# Yields a ReadResult for reads first..iterations of a campaign, one dump in memory at a time.
+# If iterations is None every read is streamed (for a directory, up to the first missing file).
+# 'dumps' replaces the campaign's own reads, e.g. with follow_campaign for a campaign still being written.
+def stream_reads(input_dir, iterations=None, first=1, bands=BANDS, grid_sizes=GRID_SIZES, profile=DEFAULT_PROFILE, dumps=None):
+    if dumps is None:
+        dumps = iter_campaign(input_dir, iterations, first, profile)
+    for i, dump in enumerate(dumps, first):
+        with stage('pre_process'):
+            bits = pre_process(dump.bits.ravel(), bands)
+        with stage('block_means'):
+            means = block_means(bits[None, :], grid_sizes, dump.width, dump.height)
+        count('bits_processed', bits.size)
+        yield ReadResult(i, bits, {x: means[x][0] for x in means})
+
+
+# Running per-bit and per-block statistics over a stream of reads
+class CampaignAccumulator:
+    def __init__(self, grid_sizes=GRID_SIZES, num_bits=DEFAULT_PROFILE.num_bits):
+        self.grid_sizes = list(grid_sizes)
+        self.ones = np.zeros(num_bits, dtype=np.uint32)
+        self.bits = Welford(num_bits)
+        self.blocks = {x: Welford(x * x) for x in self.grid_sizes}
+
+    @property
+    def count(self):
+        return self.bits.count
+
+    def add(self, result):
+        self.ones += result.bits
+        self.bits.update(result.bits)
+        for x in self.grid_sizes:
+            self.blocks[x].update(result.means[x])
+
+    def merge(self, other):
+        self.ones += other.ones
+        self.bits.merge(other.bits)
+        for x in self.grid_sizes:
+            self.blocks[x].merge(other.blocks[x])
+
+
+# Worker: accumulates reads first..last of a campaign. Only the accumulator is sent back.
+def accumulate_reads(input_dir, bands, profile, first, last):
+    accumulator = CampaignAccumulator(num_bits=profile.num_bits)
+    for result in stream_reads(input_dir, last, first, bands, profile=profile):
+        accumulator.add(result)
+    return accumulator
+
+
+def write_to_csv(filename, accumulator, profile=DEFAULT_PROFILE):
+    # Open the CSV file for writing
+    with open(filename, 'w', newline='') as csvfile:
+        csvwriter = csv.writer(csvfile)
+
+        # Write the header row
+        csvwriter.writerow(['Block Size', 'Block', 'Reads', 'Mean', 'Standard Deviation'])
+
+        # Loop through data and write each row
+        for x in accumulator.grid_sizes:
+            chunk_size = profile.block_layout(x * x)[0]
+            block = accumulator.blocks[x]
+            stds = block.std()
+            for j in range(x * x):
+                csvwriter.writerow([chunk_size * chunk_size, j, block.count, '{:.6f}'.format(block.mean[j]), '{:.6f}'.format(stds[j])])
+
+
+# Writes the statistics of an accumulator into stats_dir. Each file is written beside the old one and moved over it,
+# so anything reading the outputs while a followed campaign refreshes them never sees half a file.
+def write_outputs(stats_dir, name, accumulator, profile=DEFAULT_PROFILE):
+    filename = os.path.join(stats_dir, name+'_StreamStats.csv')
+    write_to_csv(filename+'.tmp', accumulator, profile)
+    os.replace(filename+'.tmp', filename)
+
+    filename = os.path.join(stats_dir, name+'_BitStats.npz')
+    with open(filename+'.tmp', 'wb') as f:
+        np.savez(f, reads=accumulator.count, ones=accumulator.ones, mean=accumulator.bits.mean, variance=accumulator.bits.variance())
+    os.replace(filename+'.tmp', filename)
+
+
+# Streams every read of one campaign (reads 1..iterations, or all of them) into '<name>Stats'. Returns the accumulator.
+# bands=None inverts the chip's own banding.
+def run_campaign(input_dir, iterations=None, workers=1, bands=None, profile=DEFAULT_PROFILE):
+    # If directory doesn't exist, throw error
+    if not os.path.exists(input_dir):
+        raise FileNotFoundError("This directory does not exist.")
+
+    profile = campaign_profile(input_dir, profile)
+    if bands is None:
+        bands = profile.bands
+
+    if iterations is None:
+        iterations = count_reads(input_dir)
+    if iterations == 0:
+        raise FileNotFoundError("No reads found in "+input_dir+".")
+
+    accumulator = CampaignAccumulator(num_bits=profile.num_bits)
+    for partial in run_reads(accumulate_reads, (os.path.abspath(input_dir), bands, profile), range(1, iterations + 1), workers):
+        accumulator.merge(partial)
+
+    name = campaign_name(input_dir)
+    if not os.path.exists(name+'Stats'):
+        os.mkdir(name+'Stats')
+
+    write_outputs(name+'Stats', name, accumulator, profile)
+
+    return accumulator
+
+
+# Follows a campaign directory while it is being written, taking in each dump as soon as it is complete. Every 'refresh' seconds
+# (and once more at the end) the outputs of run_campaign and the bit distribution of the reads so far are rewritten.
+# Stops after 'iterations' reads, or when no new dump has come in for idle_timeout seconds. Returns the accumulator.
+def follow_run(input_dir, iterations=None, bands=None, profile=DEFAULT_PROFILE, poll=0.5, refresh=5.0, idle_timeout=60.0, output_dir='BITMAPS'):
+    from BitmapMaker import create_bit_distribution
+
+    # If directory doesn't exist, throw error
+    if not os.path.isdir(input_dir):
+        raise FileNotFoundError("This directory does not exist.")
+
+    if bands is None:
+        bands = profile.bands
+
+    name = campaign_name(input_dir)
+    for directory in [name+'Stats', output_dir]:
+        if not os.path.exists(directory):
+            os.mkdir(directory)
+
+    def refresh_outputs():
+        write_outputs(name+'Stats', name, accumulator, profile)
+        image = create_bit_distribution(accumulator.ones, profile.width, profile.height, accumulator.count)
+        filename = os.path.join(output_dir, name+'-bitdistribution.png')
+        image.save(filename+'.tmp', format='PNG')
+        os.replace(filename+'.tmp', filename)
+        print(str(accumulator.count)+" reads in, outputs refreshed")
+
+    accumulator = CampaignAccumulator(num_bits=profile.num_bits)
+    dumps = follow_campaign(input_dir, iterations, 1, profile, poll, idle_timeout)
+    last_refresh = time.monotonic()
+    refreshed = 0
+    for result in stream_reads(input_dir, bands=bands, profile=profile, dumps=dumps):
+        accumulator.add(result)
+        if time.monotonic() - last_refresh >= refresh:
+            refresh_outputs()
+            last_refresh = time.monotonic()
+            refreshed = accumulator.count
+
+    if accumulator.count == 0:
+        raise FileNotFoundError("No reads came in to "+input_dir+".")
+    if accumulator.count != refreshed:
+        refresh_outputs()
+    return accumulator
+
+
+def add_options(parser):
+    parser.add_argument('--reads', type=int, help="number of reads to stream (default: every read found)")
+    add_workers_option(parser)
+    add_band_option(parser)
+    add_chip_option(parser)
+    add_follow_option(parser)
+
+def main():
+    args = build_parser("Constant-memory statistics across every read of a campaign.", add_options).parse_args()
+
+    try:
+        # Batch mode: every campaign matching the pattern(s), no prompts
+        if args.command == 'batch':
+            return run_batch(args.patterns, lambda path: run_campaign(path, args.reads, args.workers, bands_from_args(args), profile_from_args(args)))
+
+        # Get directory
+        if args.command == 'run':
+            input_dir = args.input
+        else:
+            input_dir = input("Enter the input directory (or packed .bscd file): ")
+
+        if args.follow:
+            accumulator = follow_run(input_dir, args.reads, bands_from_args(args), profile_from_args(args), args.poll, args.refresh, args.idle_timeout)
+        else:
+            accumulator = run_campaign(input_dir, args.reads, args.workers, bands_from_args(args), profile_from_args(args))
+        print(str(accumulator.count)+" reads streamed. Statistics placed in directory "+os.path.abspath(campaign_name(input_dir)+'Stats'))
+
+    # Error Handler
+    except Exception as e:
+        print("An error occurred: "+str(e))
+
+if __name__ == "__main__":
+    run_main(main, 'Streaming')
@@ -0,0 +1,127 @@
+# ----------------------------------------------------------------------------------
+# Benchmark for the block engine in BlockEngine.py.
+#
+# Times the original pure-Python calculate_mean_and_dev against
+# BlockEngine.block_means on random reads over the whole grid range 2..20,
+# and the sliding-window averages (BlockEngine.sliding_means) against a
+# direct mean over every window, and the bootstrap intervals of
+# Bootstrap.block_intervals against a loop over the same resamples. That
+# these agree is checked in tests/test_block_engine.py and
+# tests/test_bootstrap.py.
+#
+# Usage (from the repository root): python benchmarks/bench_blocks.py [num_reads]
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import math
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import BlockEngine
+import Bootstrap
+
+
+# The calculate_mean_and_dev the scripts used to carry. Kept here only as the reference to check against.
+def legacy_calculate_mean_and_dev(bitlist, num_of_blocks):
+    chunk_size = int(math.sqrt(len(bitlist) // num_of_blocks))
+    excess_bits = len(bitlist) - (num_of_blocks * chunk_size * chunk_size)
+    row_size = 256 * chunk_size
+    chunks_per_row = int(math.sqrt(num_of_blocks))
+    chunks_per_column = int(math.sqrt(num_of_blocks))
+    x_offset = math.ceil((excess_bits // 511) / 2)
+    y_offset = x_offset * 256
+
+    chunk_averages = []
+    chunk = []
+
+    for i in range(chunks_per_column):
+        for j in range(chunks_per_row):
+            start_idx = i * row_size + j * chunk_size + x_offset + y_offset
+            for k in range(chunk_size):
+                vert_addr = start_idx + k * 256
+                end_idx = vert_addr + chunk_size
+                chunk.append(bitlist[vert_addr:end_idx])
+
+            chunk = [item for sublist in chunk for item in sublist]
+
+            average = statistics.mean(chunk)
+
+            chunk_averages.append(average)
+            chunk.clear()
+
+    avgtotal = statistics.mean(chunk_averages)
+    stddev = statistics.stdev(chunk_averages)
+
+    return chunk_averages, stddev, avgtotal
+
+
+# Bootstrap intervals of the (N, n) block averages 'values', drawing the resamples of Bootstrap.resample_counts one at a time.
+# Kept here only as the reference to check against.
+def looped_intervals(values, resamples):
+    n = values.shape[-1]
+    counts = Bootstrap.resample_counts(n, resamples).astype(int)
+    samples = np.array([[[read[index].mean(), read[index].std()] for index in [np.repeat(np.arange(n), row) for row in counts]] for read in values])
+    return Bootstrap.percentile_interval(samples[:, :, 0]) + Bootstrap.percentile_interval(samples[:, :, 1])
+
+
+def main():
+    num_reads = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rng = np.random.default_rng(0)
+    stack = (rng.random((num_reads, 65536)) < 0.6).astype(np.uint8)
+    bitlists = [row.tolist() for row in stack]
+
+    start = time.perf_counter()
+    legacy = [[legacy_calculate_mean_and_dev(bits, x * x) for x in BlockEngine.GRID_SIZES] for bits in bitlists]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    means = BlockEngine.block_means(stack)
+    summaries = {x: BlockEngine.block_summary(means[x]) for x in means}
+    engine_time = time.perf_counter() - start
+
+    print("Reads x grids           : "+str(num_reads)+" x "+str(len(BlockEngine.GRID_SIZES)))
+    print("legacy calculate_mean_and_dev : {:.1f} ms/read".format(legacy_time * 1000 / num_reads))
+    print("BlockEngine.block_means       : {:.2f} ms/read ({:.0f}x)".format(engine_time * 1000 / num_reads, legacy_time / engine_time))
+
+    # Every 16x16 window at stride 1, against the mean taken window by window
+    grids = stack.reshape(-1, 256, 256)
+    start = time.perf_counter()
+    direct = np.lib.stride_tricks.sliding_window_view(grids, (16, 16), axis=(1, 2)).mean(axis=(3, 4))
+    direct_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sliding = BlockEngine.sliding_means(BlockEngine.summed_area_table(grids), (16, 16))
+    sliding_time = time.perf_counter() - start
+
+    print("16x16 windows, stride 1      : "+str(sliding.shape[1])+" x "+str(sliding.shape[2])+" per read")
+    print("direct window means           : {:.1f} ms/read".format(direct_time * 1000 / num_reads))
+    print("BlockEngine.sliding_means     : {:.2f} ms/read ({:.0f}x)".format(sliding_time * 1000 / num_reads, direct_time / sliding_time))
+
+    # Bootstrap intervals of every grid of every read, against the same resamples drawn one at a time
+    resamples = 500
+    start = time.perf_counter()
+    looped = {x: looped_intervals(means[x], resamples) for x in BlockEngine.GRID_SIZES}
+    looped_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    intervals = Bootstrap.block_intervals(means, resamples)
+    bootstrap_time = time.perf_counter() - start
+
+    print("Bootstrap resamples per grid : "+str(resamples))
+    print("looped resamples              : {:.1f} ms/read".format(looped_time * 1000 / num_reads))
+    print("Bootstrap.block_intervals     : {:.2f} ms/read ({:.0f}x)".format(bootstrap_time * 1000 / num_reads, looped_time / bootstrap_time))
+
+
+if __name__ == "__main__":
+    main()
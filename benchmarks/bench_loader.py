@@ -0,0 +1,101 @@
+# ----------------------------------------------------------------------------------
+# Micro-benchmark for the shared dump loader in DumpLoader.py.
+#
+# Writes a handful of random 8kB dumps in the "Address,Word" format emitted by
+# read100.c / read200.c, then times the original per-script read_csv against
+# DumpLoader.load_dump and DumpLoader.read_csv. The fixed-layout fast path
+# (DumpLoader.parse_fixed) is also timed on its own against the line-by-line
+# DumpLoader.parse_dump. That they all produce the same bits is checked in
+# tests/test_dump_loader.py.
+#
+# Usage (from the repository root): python benchmarks/bench_loader.py [num_files]
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import DumpLoader
+
+NUM_WORDS = 8192
+
+
+# The read_csv that used to be copy-pasted into every script. Kept here only as the reference to time against.
+def legacy_read_csv(filename):
+    addresses = []
+    bit_list = []
+    bits = []
+    with open(filename, 'r') as csvfile:
+        csvreader = csv.reader(csvfile)
+        next(csvreader)
+        for row in csvreader:
+            address, byte = row
+            addresses.append(int(address, 16))
+            bit_list.append(bin(int(byte, 16))[2:].zfill(8))
+
+    for byte in bit_list:
+        for bit in byte:
+            bits.append(bit)
+
+    bits = [int(bit) for bit in bits]
+
+    return addresses, bits
+
+
+def write_dump(filename, words):
+    with open(filename, 'w') as f:
+        f.write('Address,Word\n')
+        f.write(''.join('%04x,%02x\n' % (i, w) for i, w in enumerate(words)))
+
+
+def time_loader(func, files):
+    start = time.perf_counter()
+    for filename in files:
+        func(filename)
+    return (time.perf_counter() - start) / len(files)
+
+
+def main():
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(num_files):
+            filename = os.path.join(tmp, 'BENCH_'+str(i+1)+'.csv')
+            write_dump(filename, rng.integers(0, 256, NUM_WORDS))
+            files.append(filename)
+
+        legacy_time = time_loader(legacy_read_csv, files)
+        dump_time = time_loader(lambda f: DumpLoader.load_dump(f).bits, files)
+        compat_time = time_loader(DumpLoader.read_csv, files)
+
+        texts = []
+        for filename in files:
+            with open(filename, 'rb') as f:
+                texts.append(f.read())
+        tolerant_time = time_loader(lambda data: DumpLoader.parse_dump(data.decode()), texts)
+        fixed_time = time_loader(DumpLoader.parse_fixed, texts)
+
+    print("Files timed             : "+str(num_files))
+    print("legacy read_csv         : {:.2f} ms/file".format(legacy_time * 1000))
+    print("DumpLoader.load_dump    : {:.2f} ms/file ({:.1f}x)".format(dump_time * 1000, legacy_time / dump_time))
+    print("DumpLoader.read_csv     : {:.2f} ms/file ({:.1f}x)".format(compat_time * 1000, legacy_time / compat_time))
+    print("DumpLoader.parse_dump   : {:.2f} ms/file (text already read)".format(tolerant_time * 1000))
+    print("DumpLoader.parse_fixed  : {:.2f} ms/file ({:.1f}x)".format(fixed_time * 1000, tolerant_time / fixed_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# ----------------------------------------------------------------------------------
+# Stage-by-stage benchmark of the analysis pipeline on synthetic campaigns.
+#
+# Generates one synthetic campaign (see synthetic.py) large enough for the
+# biggest read count, then for each read count runs the pipeline stages in a
+# fresh process and records their wall time, throughput and the process's
+# peak RSS (null where neither the resource module nor psutil is available):
+#
+#   parse       load_dump on every dump and stack the bits
+#   preprocess  pre_process (banding inversion) over the stack
+#   blocks      block_means for every grid size 2..20
+#   fit         BlockEngine.block_fit (closed-form Gaussian fit) of every grid of every read
+#   write       FullChipBlockStats.write_to_csv per read
+#   render      BitmapMaker weight accumulation + bit distribution PNG
+#
+# Results are written as JSON, so baselines from two versions can be diffed
+# with --compare.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_pipeline.py [--reads 1 100 200 1000] [--output bench.json] [--compare old.json]
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+STAGES = ['parse', 'preprocess', 'blocks', 'fit', 'write', 'render']
+DEFAULT_READS = [1, 100, 200, 1000]
+
+
+# Peak RSS of this process in MB, or None if the platform cannot tell. resource is Unix-only; psutil covers Windows.
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024.0 * 1024.0)
+
+    # ru_maxrss is in KB on Linux, in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024.0 * 1024.0) if sys.platform == 'darwin' else rss / 1024.0
+
+
+# Runs every stage over reads 1..num_reads of the campaign. Meant to run in a fresh process so peak RSS is its own.
+def run_stages(campaign_dir, num_reads):
+    sys.path.insert(0, ROOT)
+    import BitmapMaker
+    import FullChipBlockStats
+    from BlockEngine import block_means, block_fit
+    from CampaignPack import dump_path
+    from DumpLoader import load_dump
+    from PreProcess import pre_process
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        dumps = [load_dump(dump_path(campaign_dir, i)) for i in range(1, num_reads + 1)]
+        bits = np.stack([dump.bits.ravel() for dump in dumps])
+        timings['parse'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        proc = pre_process(bits)
+        timings['preprocess'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        means = block_means(proc)
+        timings['blocks'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mus, sigmas = block_fit(means)
+        timings['fit'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for n in range(num_reads):
+            FullChipBlockStats.write_to_csv(os.path.join(out_dir, 'BENCH_'+str(n+1)+'Stats.csv'), sigmas[n].tolist(), mus[n].tolist())
+        timings['write'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        weight = BitmapMaker.accumulate_weight(dumps, bits.shape[1])
+        BitmapMaker.create_bit_distribution(weight, 256, 256, num_reads).save(os.path.join(out_dir, 'BENCH.png'))
+        timings['render'] = time.perf_counter() - start
+
+    return timings, peak_rss_mb()
+
+
+def run_scale(campaign_dir, num_reads):
+    # A fresh process per read count, so each peak RSS figure stands on its own
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        timings, peak_rss = pool.apply(run_stages, (campaign_dir, num_reads))
+
+    stages = {}
+    for stage in STAGES:
+        seconds = timings[stage]
+        stages[stage] = {'seconds': seconds, 'reads_per_s': num_reads / seconds if seconds > 0 else None}
+    return {'reads': num_reads, 'total_seconds': sum(timings.values()), 'peak_rss_mb': peak_rss, 'stages': stages}
+
+
+def print_results(results, baseline=None):
+    print('{:>6} {:>11} {:>10} {:>10}'.format('reads', 'stage', 'seconds', 'vs base'))
+    for key, result in results.items():
+        for stage in STAGES + ['total']:
+            if stage == 'total':
+                seconds = result['total_seconds']
+            else:
+                seconds = result['stages'][stage]['seconds']
+
+            ratio = ''
+            if baseline is not None and key in baseline['results']:
+                old = baseline['results'][key]
+                old_seconds = old['total_seconds'] if stage == 'total' else old['stages'][stage]['seconds']
+                ratio = '{:.2f}x'.format(old_seconds / seconds) if seconds > 0 else ''
+            print('{:>6} {:>11} {:>10.4f} {:>10}'.format(key, stage, seconds, ratio))
+        if result['peak_rss_mb'] is None:
+            print('{:>6} {:>11} {:>10}'.format(key, 'peak RSS', 'n/a'))
+        else:
+            print('{:>6} {:>11} {:>10.1f} MB'.format(key, 'peak RSS', result['peak_rss_mb']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage-by-stage benchmark of the analysis pipeline.")
+    parser.add_argument('--reads', type=int, nargs='+', default=DEFAULT_READS, help="read counts to benchmark")
+    parser.add_argument('--output', default='bench.json', help="JSON file to write the results to")
+    parser.add_argument('--compare', help="earlier JSON results to compare against (speedup = old / new)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    import synthetic
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        campaign_dir = os.path.join(tmp, 'BENCH')
+        start = time.perf_counter()
+        synthetic.write_campaign(campaign_dir, max(args.reads), seed=args.seed)
+        print("Synthetic campaign of "+str(max(args.reads))+" reads written in {:.1f} s".format(time.perf_counter() - start))
+
+        for num_reads in args.reads:
+            results[str(num_reads)] = run_scale(campaign_dir, num_reads)
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+
+    print_results(results, baseline)
+    print("Results written to "+args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# ----------------------------------------------------------------------------------
+# Synthetic campaign generator for benchmarks.
+#
+# Writes N dumps named '<name>_<i>.csv' into a campaign directory, in exactly
+# the format read100.c / read200.c emit: an "Address,Word" header followed by
+# one '%04x,%02x' line per address. Each bit powers up as 1 with a probability
+# set per region of the chip, so banding and hot spots can be mimicked.
+#
+# Usage (from the repository root):
+#   python benchmarks/synthetic.py NAME NUM_READS [--bias 0.6] [--region FIRST:LAST:BIAS ...] [--seed 0] [--words 8192]
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import argparse
+import os
+
+import numpy as np
+
+NUM_WORDS = 8192
+WORD_SIZE = 8
+
+# Default layout: ones-bias of 0.6, with the banded section of the 8kB chip biased the other way
+DEFAULT_BIAS = 0.6
+DEFAULT_REGIONS = ((16384, 49150, 0.4),)
+
+WORD_TEXT = ['%02x\n' % word for word in range(256)]
+
+
+# Per-bit probability of powering up as 1. 'regions' is a list of (first bit, last bit, bias), both ends inclusive.
+def bias_map(bias=DEFAULT_BIAS, regions=DEFAULT_REGIONS, num_words=NUM_WORDS):
+    probability = np.full(num_words * WORD_SIZE, bias)
+    for first, last, region_bias in regions:
+        probability[first:last + 1] = region_bias
+    return probability
+
+
+# Text of one dump with the given words
+def dump_text(words):
+    return 'Address,Word\n' + ''.join(['%04x,' % i + WORD_TEXT[w] for i, w in enumerate(words.tolist())])
+
+
+# Words of one random read drawn from a bias map
+def random_words(rng, probability):
+    return np.packbits(rng.random(probability.size) < probability)
+
+
+# Writes reads 1..num_reads of a synthetic campaign into directory/<name>_<i>.csv. Returns the directory.
+def write_campaign(directory, num_reads, bias=DEFAULT_BIAS, regions=DEFAULT_REGIONS, seed=0, num_words=NUM_WORDS):
+    name = os.path.basename(os.path.normpath(directory))
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    rng = np.random.default_rng(seed)
+    probability = bias_map(bias, regions, num_words)
+    for i in range(1, num_reads + 1):
+        with open(os.path.join(directory, name+'_'+str(i)+'.csv'), 'w') as f:
+            f.write(dump_text(random_words(rng, probability)))
+
+    return directory
+
+
+def parse_region(text):
+    first, last, bias = text.split(':')
+    return int(first), int(last), float(bias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic campaign of 'Address,Word' dumps.")
+    parser.add_argument('directory', help="campaign directory to create, e.g. JUL4")
+    parser.add_argument('num_reads', type=int)
+    parser.add_argument('--bias', type=float, default=DEFAULT_BIAS, help="probability of a 1 outside every region")
+    parser.add_argument('--region', action='append', type=parse_region, metavar='FIRST:LAST:BIAS',
+                        help="bit range with its own probability of a 1; repeatable (default 16384:49150:0.4)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--words', type=int, default=NUM_WORDS, help="addresses per dump, e.g. 32768 for a 32kB chip (default 8192)")
+    args = parser.parse_args()
+
+    regions = args.region if args.region else DEFAULT_REGIONS
+    write_campaign(args.directory, args.num_reads, args.bias, regions, args.seed, args.words)
+    print(str(args.num_reads)+" synthetic reads written into "+args.directory+".")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@
 
 uint16_t img_write() {
 
-    uint8_t csv_data[8192];
+    uint8_t csv_data[SPI23X640_MAX_ADDRESS + 1];
     FILE *file =fopen("WrittenImage.csv", "r");
 
     if (file == NULL) {
@@ -20,7 +20,7 @@ uint16_t img_write() {
         return 1;
     }
 
-    for (int i = 0; i < 8192; i++) {
+    for (int i = 0; i <= SPI23X640_MAX_ADDRESS; i++) {
         if (fgets(buffer, sizeof(buffer), file) == NULL) {
             perror("Error reading data");
             fclose(file);
@@ -37,7 +37,11 @@ For example:
 #define SPI23X640_NUMBER_OF_BITS 8
 #define SPI23X640_MAX_SPEED_HZ 20000000 // see datasheet
 #define SPI23X640_DELAY_US 0 // delay in microseconds
+// Last address of the chip: 8191 for the 8kB 23K640. Build with -DSPI23X640_MAX_ADDRESS=32767 for a 32kB 23K256.
+// (Addresses are sent as 2 bytes, so chips past 64kB, e.g. the 23LC1024, also need 3-byte addressing.)
+#ifndef SPI23X640_MAX_ADDRESS
 #define SPI23X640_MAX_ADDRESS 8191
+#endif
 
 typedef struct spi_ioc_transfer spi_ioc_transfer;
 
@@ -0,0 +1,128 @@
+# ----------------------------------------------------------------------------------
+# Tests for the aged vs fresh classifier in AgeClassifier.py.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from AgeClassifier import AgeModel, MIN_SIGMA, input_features, load_training_data, train, score
+from FixedBlockStats import run_file
+
+NUM_READS = 4
+
+# scipy is only needed to fit a model
+HAVE_SCIPY = importlib.util.find_spec('scipy') is not None
+
+
+class AgeModelTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.features = {'Aged': rng.normal(1.0, 0.5, (40, 3)), 'Fresh': rng.normal(-1.0, 0.25, (40, 3))}
+
+    @unittest.skipUnless(HAVE_SCIPY, "scipy is not installed")
+    def test_fit(self):
+        model = AgeModel.fit(self.features)
+        for c, label in enumerate(['Aged', 'Fresh']):
+            self.assertTrue(np.allclose(model.mu[c], self.features[label].mean(axis=0)))
+            self.assertTrue(np.allclose(model.sigma[c], self.features[label].std(axis=0)))
+
+    @unittest.skipUnless(HAVE_SCIPY, "scipy is not installed")
+    def test_score_is_log_likelihood_ratio(self):
+        from scipy.stats import norm
+        model = AgeModel.fit(self.features)
+        rows = np.concatenate([self.features['Aged'][:5], self.features['Fresh'][:5]])
+        expected = norm.logpdf(rows, model.mu[0], model.sigma[0]).sum(axis=1) - norm.logpdf(rows, model.mu[1], model.sigma[1]).sum(axis=1)
+        self.assertTrue(np.allclose(model.score(rows), expected))
+        self.assertEqual(model.classify(rows).tolist(), ['Aged'] * 5 + ['Fresh'] * 5)
+
+    @unittest.skipUnless(HAVE_SCIPY, "scipy is not installed")
+    def test_sigma_floor(self):
+        features = {'Aged': np.ones((3, 2)), 'Fresh': np.zeros((3, 2))}
+        self.assertTrue((AgeModel.fit(features).sigma == MIN_SIGMA).all())
+
+    def test_needs_two_reads_per_class(self):
+        with self.assertRaises(ValueError):
+            AgeModel.fit({'Aged': self.features['Aged'], 'Fresh': self.features['Fresh'][:1]})
+        with self.assertRaises(ValueError):
+            AgeModel.fit({'Aged': self.features['Aged']})
+
+    def test_save_and_load(self):
+        model = AgeModel(np.zeros((2, 38)), np.ones((2, 38)), 0.5, profile='32kB')
+        with tempfile.TemporaryDirectory() as tmp:
+            model.save(os.path.join(tmp, 'model.json'))
+            loaded = AgeModel.load(os.path.join(tmp, 'model.json'))
+        self.assertEqual((loaded.threshold, loaded.profile.name, loaded.names), (0.5, '32kB', model.names))
+        self.assertTrue(np.array_equal(loaded.mu, model.mu) and np.array_equal(loaded.sigma, model.sigma))
+
+
+class TrainingDataTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.aged = synthetic.write_campaign(os.path.join(self.tmp.name, 'AGED'), NUM_READS, bias=0.6, seed=1)
+        self.fresh = synthetic.write_campaign(os.path.join(self.tmp.name, 'FRESH'), NUM_READS, bias=0.5, regions=(), seed=2)
+        self.training_dir = os.path.join(self.tmp.name, 'TRAINING_DATA')
+
+        # One directory per dump, as 'FixedBlockStats.py batch' lays them out
+        for label, campaign in [('Aged', self.aged), ('Fresh', self.fresh)]:
+            for i in range(1, NUM_READS + 1):
+                name = os.path.basename(campaign)+'_'+str(i)
+                run_file(os.path.join(campaign, name+'.csv'), label, os.path.join(self.training_dir, name))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_full_precision_features(self):
+        # Not the 4 decimal places of the .csv files
+        features = load_training_data(self.training_dir)
+        self.assertTrue(np.allclose(features['Aged'], input_features(self.aged), rtol=0, atol=1e-12))
+        self.assertTrue(np.allclose(features['Fresh'], input_features(self.fresh), rtol=0, atol=1e-12))
+
+    def test_other_chip_refused(self):
+        with self.assertRaises(ValueError):
+            load_training_data(self.training_dir, profile='32kB')
+
+    def test_rounded_only_directory_refused(self):
+        os.remove(os.path.join(self.training_dir, 'AGED_1', 'AgedFeatures.json'))
+        with self.assertRaises(ValueError):
+            load_training_data(self.training_dir)
+
+    @unittest.skipUnless(HAVE_SCIPY, "scipy is not installed")
+    def test_train_and_score(self):
+        model_file = os.path.join(self.tmp.name, 'model.json')
+        scores_file = os.path.join(self.tmp.name, 'scores.csv')
+        model, counts = train(self.training_dir, model_file=model_file)
+        self.assertEqual(counts, {'Aged': NUM_READS, 'Fresh': NUM_READS})
+
+        results = score([self.aged, self.fresh], model_file, scores_file)
+        self.assertEqual(results[0][2].tolist(), ['Aged'] * NUM_READS)
+        self.assertEqual(results[1][2].tolist(), ['Fresh'] * NUM_READS)
+        with open(scores_file, 'r') as f:
+            self.assertEqual(len(f.readlines()), 1 + 2 * NUM_READS)
+
+    def test_empty_campaign(self):
+        os.mkdir(os.path.join(self.tmp.name, 'EMPTY'))
+        with self.assertRaises(FileNotFoundError):
+            input_features(os.path.join(self.tmp.name, 'EMPTY'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# ----------------------------------------------------------------------------------
+# Regression tests for the block engine in BlockEngine.py: the block means
+# against the calculate_mean_and_dev every script used to carry (kept in
+# benchmarks/bench_blocks.py), and the rectangle and sliding-window means
+# against a direct mean over the bits.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from bench_blocks import legacy_calculate_mean_and_dev
+import BlockEngine
+
+NUM_READS = 2
+
+
+# Synthetic reads, as a (N, 65536) stack of bits
+def synthetic_bits(num_reads=NUM_READS, seed=0):
+    rng = np.random.default_rng(seed)
+    probability = synthetic.bias_map()
+    return np.stack([np.unpackbits(synthetic.random_words(rng, probability)) for i in range(num_reads)])
+
+
+class LegacyBlockTest(unittest.TestCase):
+    def setUp(self):
+        self.stack = synthetic_bits()
+
+    def test_block_means_match_legacy(self):
+        # Same blocks (same chunk_size / x_offset / y_offset centring) with exactly the same averages
+        means = BlockEngine.block_means(self.stack)
+        for n, bits in enumerate(self.stack.tolist()):
+            for x in BlockEngine.GRID_SIZES:
+                averages, stddev, avgtotal = legacy_calculate_mean_and_dev(bits, x * x)
+                self.assertEqual(means[x][n].tolist(), averages, "grid "+str(x)+" read "+str(n))
+
+    def test_summary_matches_legacy(self):
+        means = BlockEngine.block_means(self.stack)
+        for n, bits in enumerate(self.stack.tolist()):
+            for x in BlockEngine.GRID_SIZES:
+                averages, stddev, avgtotal = legacy_calculate_mean_and_dev(bits, x * x)
+                summary = BlockEngine.block_summary(means[x])
+                self.assertTrue(math.isclose(summary[0][n], avgtotal, rel_tol=1e-12))
+                self.assertTrue(math.isclose(summary[1][n], stddev, rel_tol=1e-9))
+
+
+class SlidingWindowTest(unittest.TestCase):
+    def setUp(self):
+        self.grids = synthetic_bits().reshape(-1, 256, 256)
+        self.table = BlockEngine.summed_area_table(self.grids)
+
+    def test_sliding_means_match_direct_means(self):
+        direct = np.lib.stride_tricks.sliding_window_view(self.grids, (16, 16), axis=(1, 2)).mean(axis=(3, 4))
+        sliding = BlockEngine.sliding_means(self.table, (16, 16))
+        self.assertEqual(sliding.shape, direct.shape)
+        self.assertTrue(np.allclose(sliding, direct, rtol=0, atol=1e-12))
+
+    def test_strided_windows(self):
+        # A 10x6 window every (7, 5) bits; the windows that would hang over the edge are left out
+        sliding = BlockEngine.sliding_means(self.table, (10, 6), (7, 5))
+        direct = np.lib.stride_tricks.sliding_window_view(self.grids, (10, 6), axis=(1, 2))[:, ::7, ::5].mean(axis=(3, 4))
+        self.assertEqual(sliding.shape, (NUM_READS, (256 - 10) // 7 + 1, (256 - 6) // 5 + 1))
+        self.assertTrue(np.allclose(sliding, direct, rtol=0, atol=1e-12))
+
+    def test_rect_means(self):
+        means = BlockEngine.rect_means(self.table, 3, 17, 40, 9)
+        self.assertTrue(np.allclose(means, self.grids[:, 3:43, 17:26].mean(axis=(1, 2)), rtol=0, atol=1e-12))
+
+
+if __name__ == '__main__':
+    unittest.main()
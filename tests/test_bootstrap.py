@@ -0,0 +1,79 @@
+# ----------------------------------------------------------------------------------
+# Regression tests for the bootstrap intervals in Bootstrap.py, against the
+# same resamples drawn one at a time (kept in benchmarks/bench_blocks.py).
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from bench_blocks import looped_intervals
+import Bootstrap
+import BlockEngine
+
+NUM_READS = 2
+RESAMPLES = 200
+GRID_SIZES = [2, 5, 20]
+
+
+class BlockIntervalsTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        probability = synthetic.bias_map()
+        bits = np.stack([np.unpackbits(synthetic.random_words(rng, probability)) for i in range(NUM_READS)])
+        self.means = BlockEngine.block_means(bits, GRID_SIZES)
+
+    def test_matches_looped_resamples(self):
+        intervals = Bootstrap.block_intervals(self.means, RESAMPLES)
+        for x in GRID_SIZES:
+            self.assertTrue(np.allclose(intervals[x], looped_intervals(self.means[x], RESAMPLES), rtol=0, atol=1e-9), "grid "+str(x))
+
+    def test_same_resamples_for_any_split(self):
+        # One read on its own gets the same interval as in the whole campaign
+        whole = Bootstrap.block_intervals(self.means, RESAMPLES)
+        single = Bootstrap.block_intervals({x: self.means[x][1] for x in GRID_SIZES}, RESAMPLES)
+        for x in GRID_SIZES:
+            self.assertTrue(np.allclose(np.array(whole[x])[:, 1], np.array(single[x]), rtol=0, atol=1e-12))
+
+    def test_intervals_hold_the_estimate(self):
+        for x, (mean_low, mean_high, std_low, std_high) in Bootstrap.block_intervals(self.means, RESAMPLES).items():
+            means, stds = BlockEngine.block_summary(self.means[x])
+            self.assertTrue((mean_low <= means).all() and (means <= mean_high).all())
+            self.assertTrue((std_low <= std_high).all())
+
+    def test_too_few_values(self):
+        with self.assertRaises(ValueError):
+            Bootstrap.bootstrap_ci([0.5], RESAMPLES, ddof=1)
+
+
+class ReadIntervalsTest(unittest.TestCase):
+    def test_matches_looped_resamples(self):
+        rng = np.random.default_rng(1)
+        mu = rng.random((6, 3))
+        sigma = rng.random((6, 3))
+        average, average_low, average_high, std, std_low, std_high = Bootstrap.read_intervals(mu, sigma, RESAMPLES)
+        self.assertTrue(np.allclose(average, mu.mean(axis=0)) and np.allclose(std, sigma.mean(axis=0)))
+
+        # Only the mean of the resamples counts here, so the looped mean interval is the one to match
+        self.assertTrue(np.allclose((average_low, average_high), looped_intervals(mu.T, RESAMPLES)[:2], rtol=0, atol=1e-12))
+        self.assertTrue(np.allclose((std_low, std_high), looped_intervals(sigma.T, RESAMPLES)[:2], rtol=0, atol=1e-12))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# ----------------------------------------------------------------------------------
+# Tests for the packed campaign format in CampaignPack.py.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from CampaignPack import (PACK_MAGIC, HEADER_SIZE, MAX_BANDS, V1_HEADER_FORMAT, PackHeader, PackedCampaign,
+                          pack_campaign, load_words, count_reads, campaign_profile)
+from DumpLoader import load_dump
+from ChipProfile import DEFAULT_PROFILE
+
+NUM_READS = 4
+
+
+class PackRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.campaign = synthetic.write_campaign(os.path.join(self.tmp.name, 'SYN'), NUM_READS)
+        self.packed = os.path.join(self.tmp.name, 'SYN.bscd')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reads_survive_packing(self):
+        header = pack_campaign(self.campaign, self.packed, chip_id='CHIP-7')
+        self.assertEqual(header.read_count, NUM_READS)
+        self.assertEqual(os.path.getsize(self.packed), HEADER_SIZE + NUM_READS * DEFAULT_PROFILE.read_bytes)
+        self.assertEqual(count_reads(self.packed), NUM_READS)
+        self.assertTrue(np.array_equal(load_words(self.packed), load_words(self.campaign)))
+
+        packed = PackedCampaign(self.packed)
+        for i in range(1, NUM_READS + 1):
+            dump = load_dump(os.path.join(self.campaign, 'SYN_'+str(i)+'.csv'))
+            self.assertTrue(np.array_equal(packed.read(i).bits, dump.bits))
+        with self.assertRaises(FileNotFoundError):
+            packed.read(NUM_READS + 1)
+
+    def test_header_keeps_chip_and_bands(self):
+        bands = [(0, 9), (100, 199), (4000, 4999)]
+        pack_campaign(self.campaign, self.packed, chip_id='CHIP-7', bands=bands)
+        header = PackedCampaign(self.packed).header
+        self.assertEqual(header.chip_id, 'CHIP-7')
+        self.assertEqual(header.bands, tuple(bands))
+        profile = campaign_profile(self.packed)
+        self.assertEqual((profile.width, profile.height), (DEFAULT_PROFILE.width, DEFAULT_PROFILE.height))
+        self.assertEqual(profile.bands, tuple(bands))
+
+    def test_empty_directory(self):
+        os.mkdir(os.path.join(self.tmp.name, 'EMPTY'))
+        words = load_words(os.path.join(self.tmp.name, 'EMPTY'), 0)
+        self.assertEqual(words.shape, (0, DEFAULT_PROFILE.read_bytes))
+
+
+class PackHeaderTest(unittest.TestCase):
+    def test_round_trip(self):
+        header = PackHeader(256, 256, 8, 200, 'A1', [(16384, 49150)])
+        data = header.to_bytes()
+        self.assertEqual(len(data), HEADER_SIZE)
+        read = PackHeader.from_bytes(data)
+        self.assertEqual((read.width, read.height, read.word_size, read.read_count), (256, 256, 8, 200))
+        self.assertEqual(read.chip_id, 'A1')
+        self.assertEqual(read.bands, ((16384, 49150),))
+
+    def test_no_bands(self):
+        self.assertEqual(PackHeader.from_bytes(PackHeader(256, 256, 8, 1, bands=[]).to_bytes()).bands, ())
+
+    def test_version_1(self):
+        data = struct.pack(V1_HEADER_FORMAT, PACK_MAGIC, 1, 256, 256, 8, 100, b'OLD', 16384, 49150).ljust(HEADER_SIZE, b'\0')
+        header = PackHeader.from_bytes(data)
+        self.assertEqual((header.read_count, header.chip_id, header.bands), (100, 'OLD', ((16384, 49150),)))
+
+        # Version 1 stored "no band" as last < first
+        data = struct.pack(V1_HEADER_FORMAT, PACK_MAGIC, 1, 256, 256, 8, 100, b'', 1, 0).ljust(HEADER_SIZE, b'\0')
+        self.assertEqual(PackHeader.from_bytes(data).bands, ())
+
+    def test_rejects_bad_headers(self):
+        with self.assertRaises(ValueError):
+            PackHeader.from_bytes(b'NOPE'.ljust(HEADER_SIZE, b'\0'))
+        with self.assertRaises(ValueError):
+            PackHeader.from_bytes(struct.pack('<4sH', PACK_MAGIC, 99).ljust(HEADER_SIZE, b'\0'))
+        with self.assertRaises(ValueError):
+            PackHeader(256, 256, 8, 1, 'X' * 17)
+        with self.assertRaises(ValueError):
+            PackHeader(256, 256, 8, 1, bands=[(k, k) for k in range(MAX_BANDS + 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# ----------------------------------------------------------------------------------
+# Tests for the consolidated statistics tables in ColumnarStats.py.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from ColumnarStats import COLUMNS, INTERVAL_COLUMNS, make_table, merge_tables, update_table, read_table, table_name
+from BlockEngine import block_means
+
+GRID_SIZES = [2, 3]
+NUM_READS = 4
+
+
+# Block rows of reads first..last of a synthetic campaign; 'seed' stands in for a changed dump
+def read_rows(first, last, seed=0):
+    rng = np.random.default_rng(seed)
+    probability = synthetic.bias_map()
+    bits = np.stack([np.unpackbits(synthetic.random_words(rng, probability)) for i in range(first, last + 1)])
+    means = block_means(bits, GRID_SIZES)
+    tables = []
+    for n, i in enumerate(range(first, last + 1)):
+        for x in GRID_SIZES:
+            tables.append(make_table(np.full(x * x, i), np.full(x * x, x), np.arange(x * x), means[x][n], np.full(x * x, np.nan)))
+    return tables
+
+
+def rows_of(table, i):
+    return table['mean'][table['read'] == i]
+
+
+class TableTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, table_name('SYN', 'BlockStats'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_and_read(self):
+        table = update_table(self.filename, read_rows(1, NUM_READS), range(1, NUM_READS + 1), ['1', '1', '2', '2'])
+        read = read_table(self.filename)
+        self.assertEqual(list(read), COLUMNS)
+        for column in COLUMNS:
+            self.assertTrue(np.array_equal(read[column], table[column], equal_nan=column not in ['chip']))
+        self.assertEqual(read['chip'][read['read'] == 3].tolist(), ['2'] * 13)
+        self.assertTrue(np.isnan(read['mean_ci_low']).all())
+
+    def test_update_replaces_only_new_reads(self):
+        reads = range(1, NUM_READS + 1)
+        labels = ['1'] * NUM_READS
+        old = update_table(self.filename, read_rows(1, NUM_READS), reads, labels)
+        changed = read_rows(2, 2, seed=5)
+        new = update_table(self.filename, changed, reads, labels)
+
+        self.assertEqual(len(new['read']), len(old['read']))
+        self.assertTrue(np.array_equal(rows_of(new, 2), np.concatenate([table['mean'] for table in changed])))
+        for i in [1, 3, 4]:
+            self.assertTrue(np.array_equal(rows_of(new, i), rows_of(old, i)))
+
+        # Sorted by read, grid, block
+        order = np.lexsort((new['block'], new['grid'], new['read']))
+        self.assertTrue(np.array_equal(order, np.arange(len(order))))
+
+    def test_merge_drops_reads_no_longer_there(self):
+        old = merge_tables(None, make_table([1, 2, 3], [2, 2, 2], [0, 0, 0], [0.1, 0.2, 0.3], [0, 0, 0]), [1, 2, 3])
+        new = merge_tables(old, make_table([3], [2], [0], [0.5], [0]), [1, 3])
+        self.assertEqual(new['read'].tolist(), [1, 3])
+        self.assertEqual(new['mean'].tolist(), [0.1, 0.5])
+
+    def test_old_table_without_intervals(self):
+        table = make_table([1], [2], [-1], [0.5], [0.1], intervals=[[0.4], [0.6], [0.05], [0.15]])
+        with open(self.filename, 'wb') as f:
+            np.savez(f, **{column: table[column] for column in COLUMNS if column not in INTERVAL_COLUMNS})
+        read = read_table(self.filename)
+        self.assertEqual(read['mean'].tolist(), [0.5])
+        self.assertTrue(all(np.isnan(read[column]).all() for column in INTERVAL_COLUMNS))
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow') is not None, "pyarrow is not installed")
+    def test_parquet(self):
+        filename = os.path.join(self.tmp.name, table_name('SYN', 'BlockStats', 'parquet'))
+        table = update_table(filename, read_rows(1, 2), range(1, 3), ['1', '2'])
+        read = read_table(filename)
+        for column in COLUMNS:
+            self.assertTrue(np.array_equal(read[column], table[column], equal_nan=column not in ['chip']))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            table_name('SYN', 'BlockStats', 'csv')
+        with self.assertRaises(FileNotFoundError):
+            read_table(os.path.join(self.tmp.name, 'missing.npz'))
+
+
+if __name__ == '__main__':
+    unittest.main()
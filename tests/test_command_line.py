@@ -0,0 +1,75 @@
+# ----------------------------------------------------------------------------------
+# Tests for the shared command line in CommandLine.py.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from CommandLine import build_parser, add_two_chips_option, add_chip_map_option, add_workers_option, add_band_option
+
+
+def add_options(parser):
+    add_two_chips_option(parser)
+    add_workers_option(parser)
+    add_band_option(parser)
+    add_chip_map_option(parser)
+
+
+class BuildParserTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = build_parser("test", add_options)
+
+    def test_defaults(self):
+        for argv in ([], ['run', 'JUL4'], ['batch', 'JUL*']):
+            args = self.parser.parse_args(argv)
+            self.assertEqual(args.workers, 1)
+            self.assertFalse(args.two_chips)
+            self.assertIsNone(args.band)
+            self.assertIsNone(args.chip_map)
+            self.assertIsNone(args.report)
+
+    def test_flags_before_subcommand(self):
+        args = self.parser.parse_args(['--workers', '4', '--two-chips', '--report', 'r.json', 'run', 'JUL4'])
+        self.assertEqual(args.command, 'run')
+        self.assertEqual(args.input, 'JUL4')
+        self.assertEqual(args.workers, 4)
+        self.assertTrue(args.two_chips)
+        self.assertEqual(args.report, 'r.json')
+
+    def test_flags_after_subcommand(self):
+        args = self.parser.parse_args(['batch', '--workers', '3', '--band', '0:7', 'JUL*', 'AUG*'])
+        self.assertEqual(args.command, 'batch')
+        self.assertEqual(args.patterns, ['JUL*', 'AUG*'])
+        self.assertEqual(args.workers, 3)
+        self.assertEqual(args.band, [(0, 7)])
+        self.assertFalse(args.two_chips)
+
+    def test_flags_on_both_sides(self):
+        args = self.parser.parse_args(['--workers', '4', 'run', '--two-chips', 'JUL4'])
+        self.assertEqual(args.workers, 4)
+        self.assertTrue(args.two_chips)
+
+    def test_flag_after_subcommand_wins(self):
+        args = self.parser.parse_args(['--workers', '4', 'run', '--workers', '2', 'JUL4'])
+        self.assertEqual(args.workers, 2)
+
+    def test_chip_map_with_two_chips(self):
+        args = self.parser.parse_args(['--chip-map', 'chips.csv', 'run', '--two-chips', 'JUL4'])
+        self.assertEqual(args.chip_map, 'chips.csv')
+        self.assertTrue(args.two_chips)
+
+
+if __name__ == '__main__':
+    unittest.main()
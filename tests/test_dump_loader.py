@@ -0,0 +1,106 @@
+# ----------------------------------------------------------------------------------
+# Regression tests for the shared dump loader in DumpLoader.py, against the
+# read_csv every script used to carry (kept in benchmarks/bench_loader.py),
+# and of the fixed-layout fast path (parse_fixed) against parse_dump.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from bench_loader import legacy_read_csv
+import DumpLoader
+
+NUM_READS = 3
+
+
+class LegacyLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        campaign = synthetic.write_campaign(os.path.join(self.tmp.name, 'SYN'), NUM_READS)
+        self.files = [os.path.join(campaign, 'SYN_'+str(i)+'.csv') for i in range(1, NUM_READS + 1)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_read_csv_matches_legacy(self):
+        for filename in self.files:
+            self.assertEqual(DumpLoader.read_csv(filename), legacy_read_csv(filename))
+
+    def test_load_dump_matches_legacy(self):
+        for filename in self.files:
+            dump = DumpLoader.load_dump(filename)
+            addresses, bits = legacy_read_csv(filename)
+            self.assertEqual(dump.addresses.tolist(), addresses)
+            self.assertEqual(dump.bits.ravel().tolist(), bits)
+            self.assertEqual(dump.bits.shape, (DumpLoader.CHIP_HEIGHT, DumpLoader.CHIP_WIDTH))
+
+
+class FixedLayoutTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.words = synthetic.random_words(rng, synthetic.bias_map())
+        self.data = synthetic.dump_text(self.words).encode()
+
+    def assert_same_parse(self, data):
+        fixed = DumpLoader.parse_fixed(data)
+        tolerant = DumpLoader.parse_dump(data.decode())
+        self.assertIsNotNone(fixed)
+        self.assertTrue(np.array_equal(fixed[0], tolerant[0]) and np.array_equal(fixed[1], tolerant[1]))
+        self.assertTrue(np.array_equal(fixed[1], self.words))
+
+    def test_matches_parse_dump(self):
+        self.assert_same_parse(self.data)
+        self.assertEqual(len(self.data), DumpLoader.fixed_dump_size(self.words.size))
+
+    def test_windows_line_endings(self):
+        self.assert_same_parse(self.data.replace(b'\n', b'\r\n'))
+
+    def test_other_layouts_fall_back(self):
+        # Each of these has to go through parse_dump instead
+        lines = self.data.split(b'\n')
+        others = [
+            self.data[len(b'Address,Word\n'):],                   # no header
+            b'\n'.join(lines[:2] + lines[3:]),                     # an address missing
+            self.data.replace(b'0001,', b'1,', 1),                 # a short address
+            self.data.replace(b'\n0002,', b'\n0002,0', 1),         # a 3-digit word
+            self.data[:-1],                                        # no newline at the end
+        ]
+        for data in others:
+            self.assertIsNone(DumpLoader.parse_fixed(data))
+
+        # The tolerant parser still reads a dump with no header line
+        addresses, words = DumpLoader.parse_dump(others[0].decode())
+        self.assertTrue(np.array_equal(words, self.words))
+
+    def test_load_dump_takes_either_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fixed = os.path.join(tmp, 'fixed.csv')
+            with open(fixed, 'wb') as f:
+                f.write(self.data)
+            loose = os.path.join(tmp, 'loose.csv')
+            with open(loose, 'wb') as f:
+                f.write(self.data.replace(b'\n0000,', b'\n0,', 1))
+            self.assertTrue(np.array_equal(DumpLoader.load_dump(fixed).bits, DumpLoader.load_dump(loose).bits))
+            self.assertEqual(DumpLoader.read_csv(fixed), legacy_read_csv(fixed))
+
+
+if __name__ == '__main__':
+    unittest.main()
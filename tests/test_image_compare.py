@@ -0,0 +1,106 @@
+# ----------------------------------------------------------------------------------
+# Tests for the written-image comparison in ImageCompare.py, against
+# brute-force counts over the unpacked bits.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+import ImageCompare
+from ImageCompare import load_reference, image_errors, block_error_rates, run_campaign
+from BlockEngine import block_means
+from CampaignPack import load_words
+from ChipProfile import DEFAULT_PROFILE
+
+NUM_READS = 5
+
+
+class ImageErrorsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+        # The reference is one more synthetic read, so every read differs from it a little
+        self.reference_file = 'Reference.csv'
+        rng = np.random.default_rng(7)
+        with open(self.reference_file, 'w') as f:
+            f.write(synthetic.dump_text(synthetic.random_words(rng, synthetic.bias_map())))
+        self.campaign = synthetic.write_campaign('SYN', NUM_READS)
+
+        self.reference = load_reference(self.reference_file)
+        self.words = np.asarray(load_words(self.campaign))
+        self.wrong = np.unpackbits(self.words, axis=1) != np.unpackbits(self.reference)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_matches_brute_force(self):
+        read_errors, read_image_errors, row_errors, bit_errors = image_errors(self.words, self.reference)
+        rows = self.wrong.reshape(NUM_READS, DEFAULT_PROFILE.height, DEFAULT_PROFILE.width)
+        self.assertTrue(np.array_equal(read_errors, self.wrong.sum(axis=1)))
+        self.assertTrue(np.array_equal(read_image_errors, rows[:, :DEFAULT_PROFILE.image_height].sum(axis=(1, 2))))
+        self.assertTrue(np.array_equal(row_errors, rows.sum(axis=(0, 2))))
+        self.assertTrue(np.array_equal(bit_errors, self.wrong.sum(axis=0)))
+
+    def test_chunks(self):
+        whole = image_errors(self.words, self.reference)
+        chunk_reads = ImageCompare.CHUNK_READS
+        ImageCompare.CHUNK_READS = 2
+        try:
+            chunked = image_errors(self.words, self.reference)
+        finally:
+            ImageCompare.CHUNK_READS = chunk_reads
+        for a, b in zip(whole, chunked):
+            self.assertTrue(np.array_equal(a, b))
+
+    def test_no_errors(self):
+        read_errors, read_image_errors, row_errors, bit_errors = image_errors(np.stack([self.reference] * 2), self.reference)
+        self.assertFalse(read_errors.any() or read_image_errors.any() or row_errors.any() or bit_errors.any())
+
+    def test_block_error_rates(self):
+        bit_errors = self.wrong.sum(axis=0)
+        rates = block_error_rates(bit_errors, NUM_READS, [2, 5])
+        means = block_means(self.wrong.astype(np.uint8), [2, 5])
+        for x in [2, 5]:
+            self.assertTrue(np.allclose(rates[x], means[x].mean(axis=0), rtol=0, atol=1e-12))
+
+    def test_short_reference(self):
+        with open('Short.csv', 'w') as f:
+            f.write(synthetic.dump_text(np.zeros(100, dtype=np.uint8)))
+        with self.assertRaises(ValueError):
+            load_reference('Short.csv')
+        with self.assertRaises(FileNotFoundError):
+            load_reference('Missing.csv')
+
+    def test_run_campaign(self):
+        summary = run_campaign(self.campaign, self.reference_file, chips=2)
+        self.assertEqual(summary['Reads'], NUM_READS)
+        self.assertAlmostEqual(summary['Bit Error Rate'], self.wrong.mean())
+        self.assertAlmostEqual(summary['Bits Ever Wrong Fraction'], self.wrong.any(axis=0).mean())
+        for name in ['SYN_ImageSummary.csv', 'SYN_ImageReads.csv', 'SYN_ImageRows.csv', 'SYN_ImageBlocks.csv', 'SYN_ImageErrors.npz']:
+            self.assertTrue(os.path.exists(os.path.join('SYNStats', name)))
+        self.assertTrue(os.path.exists(os.path.join('BITMAPS', 'SYN-imageerrors.png')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+# ----------------------------------------------------------------------------------
+# Tests for the per-bit stability and PUF metrics and the all-pairs Hamming
+# distance matrix in PufMetrics.py, against brute-force counts over the
+# unpacked bits.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import itertools
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+import PufMetrics
+from PufMetrics import puf_metrics, hamming_matrix, chip_distances
+from CampaignPack import chip_labels, chip_reads
+
+NUM_READS = 9
+NUM_WORDS = 64
+
+
+# Synthetic reads with a stable-0 stretch, a stable-1 stretch and noisy bits elsewhere, as a (N, NUM_WORDS) uint8 stack
+def synthetic_words(num_reads=NUM_READS, seed=0):
+    rng = np.random.default_rng(seed)
+    probability = synthetic.bias_map(0.5, ((0, 63, 0.0), (64, 127, 1.0), (128, 191, 0.9)), NUM_WORDS)
+    return np.stack([synthetic.random_words(rng, probability) for i in range(num_reads)])
+
+
+class PufMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.words = synthetic_words()
+        self.bits = np.unpackbits(self.words, axis=1).astype(np.int64)
+
+    def test_per_bit_counts(self):
+        arrays, summary = puf_metrics(self.words)
+        ones = self.bits.sum(axis=0)
+        self.assertTrue(np.array_equal(arrays['ones'], ones))
+        self.assertTrue(np.array_equal(arrays['flips'], (self.bits[1:] != self.bits[:-1]).sum(axis=0)))
+        self.assertTrue(np.array_equal(arrays['stable_0'], ones == 0))
+        self.assertTrue(np.array_equal(arrays['stable_1'], ones == NUM_READS))
+        self.assertTrue(arrays['stable_0'][:64].all() and arrays['stable_1'][64:128].all())
+
+    def test_golden_and_distances(self):
+        arrays, summary = puf_metrics(self.words)
+        golden = (2 * self.bits.sum(axis=0) > NUM_READS).astype(np.int64)
+        self.assertTrue(np.array_equal(np.unpackbits(arrays['golden']), golden))
+        self.assertTrue(np.array_equal(arrays['hamming_to_golden'], (self.bits != golden).sum(axis=1)))
+        self.assertAlmostEqual(summary['Bit Error Rate'], (self.bits != golden).mean())
+
+    def test_pairwise_distance(self):
+        arrays, summary = puf_metrics(self.words)
+        pairs = [(self.bits[a] != self.bits[b]).sum() for a, b in itertools.combinations(range(NUM_READS), 2)]
+        self.assertAlmostEqual(summary['Mean Intra-Chip Hamming Distance'], np.mean(pairs) / self.bits.shape[1])
+
+    def test_flips_across_chunks(self):
+        whole = puf_metrics(self.words)[0]['flips']
+        chunk_reads = PufMetrics.CHUNK_READS
+        PufMetrics.CHUNK_READS = 2
+        try:
+            chunked = puf_metrics(self.words)[0]['flips']
+        finally:
+            PufMetrics.CHUNK_READS = chunk_reads
+        self.assertTrue(np.array_equal(chunked, whole))
+
+    def test_single_read(self):
+        arrays, summary = puf_metrics(self.words[:1])
+        self.assertEqual(summary['Bit Error Rate'], 0)
+        self.assertTrue(np.isnan(summary['Mean Intra-Chip Hamming Distance']))
+        self.assertFalse(arrays['flips'].any())
+
+
+# Hamming distance of every pair of rows, one pair at a time
+def brute_force_matrix(a, b):
+    a = np.unpackbits(a, axis=1)
+    b = np.unpackbits(b, axis=1)
+    return np.array([[int((row_a != row_b).sum()) for row_b in b] for row_a in a])
+
+
+class HammingMatrixTest(unittest.TestCase):
+    def setUp(self):
+        self.words = synthetic_words()
+        self.other = synthetic_words(4, seed=1)
+
+    def test_matches_brute_force(self):
+        matrix = hamming_matrix(self.words)
+        self.assertTrue(np.array_equal(matrix, brute_force_matrix(self.words, self.words)))
+        self.assertTrue(np.array_equal(hamming_matrix(self.words, self.other), brute_force_matrix(self.words, self.other)))
+
+    def test_odd_width_and_small_blocks(self):
+        # 63 bytes per read cannot be viewed as uint64, and a tiny block limit forces one row at a time
+        words = self.words[:, :63]
+        block_bytes = PufMetrics.MATRIX_BLOCK_BYTES
+        PufMetrics.MATRIX_BLOCK_BYTES = 1
+        try:
+            matrix = hamming_matrix(words)
+        finally:
+            PufMetrics.MATRIX_BLOCK_BYTES = block_bytes
+        self.assertTrue(np.array_equal(matrix, brute_force_matrix(words, words)))
+
+    def test_chip_distances(self):
+        labels = chip_labels(NUM_READS, 2)
+        self.assertEqual(list(chip_reads(labels)), ['1', '2'])
+        matrix = brute_force_matrix(self.words, self.words)
+        num_bits = self.words.shape[1] * 8
+        rows = {(row[0], row[1]): row[2:] for row in chip_distances(hamming_matrix(self.words), labels, num_bits)}
+
+        for chip_a, chip_b in [('1', '1'), ('1', '2'), ('2', '2')]:
+            reads_a = [i - 1 for i in chip_reads(labels)[chip_a]]
+            reads_b = [i - 1 for i in chip_reads(labels)[chip_b]]
+            if chip_a == chip_b:
+                pairs = [matrix[a, b] for a, b in itertools.combinations(reads_a, 2)]
+            else:
+                pairs = [matrix[a, b] for a in reads_a for b in reads_b]
+            count, mean, low, high = rows[(chip_a, chip_b)]
+            self.assertEqual(count, len(pairs))
+            self.assertAlmostEqual(mean, np.mean(pairs) / num_bits)
+            self.assertAlmostEqual(low, min(pairs) / num_bits)
+            self.assertAlmostEqual(high, max(pairs) / num_bits)
+
+    def test_chip_map(self):
+        labels = chip_labels(4, chip_map={1: 'A', 2: 'B', 3: 'A', 4: 'B'})
+        self.assertEqual(chip_reads(labels), {'A': [1, 3], 'B': [2, 4]})
+        with self.assertRaises(ValueError):
+            chip_labels(5, chip_map={1: 'A', 2: 'B', 3: 'A', 4: 'B'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# ----------------------------------------------------------------------------------
+# Tests for the SQLite results store in ResultsStore.py.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from ResultsStore import (SCHEMA_VERSION, open_store, campaign_date, store_params, is_stored, store_reads, store_campaign,
+                          read_stats, read_blocks, trend, block_trend)
+from Campaign import Campaign
+from StatsCache import input_hashes
+from ChipProfile import DEFAULT_PROFILE
+
+NUM_READS = 4
+
+
+class ResultsStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store_file = os.path.join(self.tmp.name, 'results.db')
+        self.campaign = Campaign(synthetic.write_campaign(os.path.join(self.tmp.name, 'JUL4'), NUM_READS), chips=2)
+        self.connection = open_store(self.store_file)
+
+    def tearDown(self):
+        self.connection.close()
+        self.tmp.cleanup()
+
+    def test_store_reads_round_trip(self):
+        mu, sigma = self.campaign.fits
+        hashes = input_hashes(self.campaign.path, 1, NUM_READS)
+        params = store_params(self.campaign.bands, DEFAULT_PROFILE, blocks=True)
+        store_reads(self.connection, self.campaign.path, '2026-07-04', DEFAULT_PROFILE, params, self.campaign.labels, hashes,
+                    mu, sigma, self.campaign.block_means)
+
+        for g, x in enumerate(self.campaign.grid_sizes):
+            reads, chips, means, stds = read_stats(self.connection, self.campaign.path, x)
+            self.assertEqual(reads.tolist(), list(range(1, NUM_READS + 1)))
+            self.assertEqual(chips.tolist(), ['1', '1', '2', '2'])
+            self.assertTrue(np.array_equal(means, mu[:, g]) and np.array_equal(stds, sigma[:, g]))
+
+            reads, blocks = read_blocks(self.connection, 'JUL4', x)
+            self.assertTrue(np.array_equal(blocks, self.campaign.block_means[x]))
+
+        names, dates, blocks = block_trend(self.connection, 3)
+        self.assertEqual(names.tolist(), ['JUL4'])
+        self.assertTrue(np.allclose(blocks[0], self.campaign.block_means[3].mean(axis=0)))
+        names, dates, chips, reads, means, stds = trend(self.connection, 3, chip=2)
+        self.assertEqual((chips.tolist(), reads.tolist()), (['2'], [2]))
+        self.assertAlmostEqual(means[0], mu[2:, 1].mean())
+
+    def test_store_campaign_skips_unchanged(self):
+        self.assertTrue(store_campaign(self.connection, self.campaign))
+        self.assertFalse(store_campaign(self.connection, self.campaign))
+        self.assertTrue(store_campaign(self.connection, self.campaign, force=True))
+        self.assertEqual(self.connection.execute('SELECT COUNT(*) FROM campaigns').fetchone()[0], 1)
+
+        # A changed dump, or other parameters, no longer count as stored
+        hashes = input_hashes(self.campaign.path, 1, NUM_READS)
+        date = campaign_date(self.campaign.path, 'JUL4')
+        params = store_params(self.campaign.bands, DEFAULT_PROFILE, blocks=True)
+        self.assertTrue(is_stored(self.connection, self.campaign.path, params, date, hashes, self.campaign.labels))
+        self.assertFalse(is_stored(self.connection, self.campaign.path, params, date, {**hashes, 2: '0' * 32}, self.campaign.labels))
+        self.assertFalse(is_stored(self.connection, self.campaign.path, store_params([], DEFAULT_PROFILE), date, hashes, self.campaign.labels))
+
+    def test_without_blocks(self):
+        store_campaign(self.connection, self.campaign, blocks=False)
+        self.assertEqual(read_stats(self.connection, 'JUL4', 2)[0].tolist(), list(range(1, NUM_READS + 1)))
+        with self.assertRaises(ValueError):
+            read_blocks(self.connection, 'JUL4', 2)
+
+    def test_date_from_name(self):
+        self.assertEqual(campaign_date(self.campaign.path, 'JUL4')[5:], '07-04')
+        self.assertEqual(campaign_date(self.campaign.path, 'JUL4', '2024-01-02'), '2024-01-02')
+
+    def test_user_version(self):
+        self.assertEqual(self.connection.execute('PRAGMA user_version').fetchone()[0], SCHEMA_VERSION)
+        self.connection.close()
+
+        # Reopening a store of this version is fine, one of an older version is refused
+        open_store(self.store_file).close()
+        connection = sqlite3.connect(self.store_file)
+        connection.execute('PRAGMA user_version = '+str(SCHEMA_VERSION - 1))
+        connection.close()
+        with self.assertRaises(ValueError):
+            open_store(self.store_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# ----------------------------------------------------------------------------------
+# Tests for the incremental statistics manifest in StatsCache.py.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from CampaignPack import pack_campaign
+from StatsCache import StatsManifest, input_hashes
+
+NUM_READS = 3
+PARAMS = {'grids': [2, 20], 'version': 1}
+
+
+def output_name(i):
+    return 'SYN_'+str(i)+'Stats.csv'
+
+
+class StatsManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.campaign = synthetic.write_campaign(os.path.join(self.tmp.name, 'SYN'), NUM_READS)
+        self.output_dir = os.path.join(self.tmp.name, 'SYNStats')
+        os.mkdir(self.output_dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # Writes the output file of every read and records the reads as done
+    def record_all(self, params=PARAMS):
+        hashes = input_hashes(self.campaign, 1, NUM_READS)
+        for i in hashes:
+            open(os.path.join(self.output_dir, output_name(i)), 'w').close()
+        StatsManifest(self.output_dir, 'Test', params).record(hashes, output_name)
+        return hashes
+
+    def test_new_manifest_is_all_stale(self):
+        hashes = input_hashes(self.campaign, 1, NUM_READS)
+        self.assertEqual(StatsManifest(self.output_dir, 'Test', PARAMS).stale_reads(hashes, output_name), [1, 2, 3])
+
+    def test_recorded_reads_are_fresh(self):
+        hashes = self.record_all()
+        self.assertEqual(StatsManifest(self.output_dir, 'Test', PARAMS).stale_reads(hashes, output_name), [])
+
+    def test_changed_dump(self):
+        self.record_all()
+        with open(os.path.join(self.campaign, 'SYN_2.csv'), 'a') as f:
+            f.write('2000,ff\n')
+        hashes = input_hashes(self.campaign, 1, NUM_READS)
+        self.assertEqual(StatsManifest(self.output_dir, 'Test', PARAMS).stale_reads(hashes, output_name), [2])
+
+    def test_missing_output(self):
+        hashes = self.record_all()
+        os.remove(os.path.join(self.output_dir, output_name(3)))
+        self.assertEqual(StatsManifest(self.output_dir, 'Test', PARAMS).stale_reads(hashes, output_name), [3])
+
+    def test_changed_params(self):
+        hashes = self.record_all()
+        params = dict(PARAMS, version=2)
+        self.assertEqual(StatsManifest(self.output_dir, 'Test', params).stale_reads(hashes, output_name), [1, 2, 3])
+
+        # Recording again under the new parameters makes the reads fresh again
+        self.record_all(params)
+        self.assertEqual(StatsManifest(self.output_dir, 'Test', params).stale_reads(hashes, output_name), [])
+
+    def test_values_kept_on_re_record(self):
+        hashes = input_hashes(self.campaign, 1, NUM_READS)
+        manifest = StatsManifest(self.output_dir, 'Test', PARAMS)
+        manifest.record(hashes, lambda i: None, {i: [i, i * 0.5] for i in hashes})
+
+        # Only read 2 gets a new value; the others keep theirs
+        manifest = StatsManifest(self.output_dir, 'Test', PARAMS)
+        self.assertEqual(manifest.stale_reads(hashes, lambda i: None), [])
+        manifest.record({2: hashes[2]}, lambda i: None, {2: [7, 7.5]})
+        manifest = StatsManifest(self.output_dir, 'Test', PARAMS)
+        self.assertEqual([manifest.value(i) for i in hashes], [[1, 0.5], [7, 7.5], [3, 1.5]])
+
+    def test_sections_do_not_clobber_each_other(self):
+        hashes = input_hashes(self.campaign, 1, NUM_READS)
+        first = StatsManifest(self.output_dir, 'First', PARAMS)
+        second = StatsManifest(self.output_dir, 'Second', PARAMS)
+        first.record(hashes, lambda i: None)
+        second.record(hashes, lambda i: None)
+        self.assertEqual(StatsManifest(self.output_dir, 'First', PARAMS).stale_reads(hashes, lambda i: None), [])
+        self.assertEqual(StatsManifest(self.output_dir, 'Second', PARAMS).stale_reads(hashes, lambda i: None), [])
+
+    def test_packed_hashes_follow_the_words(self):
+        packed = os.path.join(self.tmp.name, 'SYN.bscd')
+        pack_campaign(self.campaign, packed)
+        hashes = input_hashes(packed, 1, NUM_READS)
+        self.assertEqual(len(set(hashes.values())), NUM_READS)
+        self.assertEqual(hashes, input_hashes(packed, 1, NUM_READS))
+
+    def test_missing_dump(self):
+        with self.assertRaises(FileNotFoundError):
+            input_hashes(self.campaign, 1, NUM_READS + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# ----------------------------------------------------------------------------------
+# Tests for the running (Welford) statistics in Streaming.py.
+#
+# Usage (from the repository root): python -m pytest tests
+#                               or: python -m unittest discover tests
+#
+# Author : Gaines Odom
+# Email : gaines.a.odom@gmail.com
+# Inst. : Auburn University
+# Advisor : Dr. Ujjwal Guin
+#
+# Created On : 10/18/2026
+# Last Edited On: 10/18/2026
+# ----------------------------------------------------------------------------------
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+import synthetic
+from Streaming import Welford, CampaignAccumulator, stream_reads, accumulate_reads
+from BlockEngine import block_means
+from CampaignPack import load_words
+from PreProcess import BANDS, pre_process
+from ChipProfile import DEFAULT_PROFILE
+
+NUM_READS = 5
+
+
+class WelfordTest(unittest.TestCase):
+    def setUp(self):
+        self.samples = np.random.default_rng(0).random((50, 7)) * 10 + 1e6
+
+    def test_update_matches_numpy(self):
+        welford = Welford(7)
+        for sample in self.samples:
+            welford.update(sample)
+        self.assertEqual(welford.count, 50)
+        self.assertTrue(np.allclose(welford.mean, self.samples.mean(axis=0), rtol=1e-12))
+        self.assertTrue(np.allclose(welford.variance(), np.var(self.samples, axis=0, ddof=1), rtol=1e-9))
+        self.assertTrue(np.allclose(welford.variance(ddof=0), np.var(self.samples, axis=0), rtol=1e-9))
+
+    def test_merge_matches_numpy(self):
+        # Uneven chunks, one of them empty, merged in any order
+        parts = []
+        for chunk in np.split(self.samples, [3, 3, 20, 41]):
+            part = Welford(7)
+            if len(chunk):
+                part.update_batch(chunk)
+            parts.append(part)
+
+        merged = Welford(7)
+        for part in reversed(parts):
+            merged.merge(part)
+        self.assertEqual(merged.count, 50)
+        self.assertTrue(np.allclose(merged.mean, self.samples.mean(axis=0), rtol=1e-12))
+        self.assertTrue(np.allclose(merged.variance(), np.var(self.samples, axis=0, ddof=1), rtol=1e-9))
+
+    def test_too_few_samples(self):
+        welford = Welford(3)
+        self.assertTrue(np.isnan(welford.variance()).all())
+        welford.update(np.ones(3))
+        self.assertTrue(np.isnan(welford.std()).all())
+        self.assertTrue(np.array_equal(welford.variance(ddof=0), np.zeros(3)))
+
+
+class CampaignAccumulatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.campaign = synthetic.write_campaign(os.path.join(self.tmp.name, 'SYN'), NUM_READS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stream_matches_whole_stack(self):
+        accumulator = CampaignAccumulator()
+        for result in stream_reads(self.campaign):
+            accumulator.add(result)
+
+        bits = pre_process(np.unpackbits(np.asarray(load_words(self.campaign)), axis=1), BANDS)
+        means = block_means(bits)
+        self.assertEqual(accumulator.count, NUM_READS)
+        self.assertTrue(np.array_equal(accumulator.ones, bits.sum(axis=0)))
+        self.assertTrue(np.allclose(accumulator.bits.variance(), np.var(bits, axis=0, ddof=1), rtol=0, atol=1e-12))
+        for x in accumulator.grid_sizes:
+            self.assertTrue(np.allclose(accumulator.blocks[x].mean, means[x].mean(axis=0), rtol=0, atol=1e-12))
+            self.assertTrue(np.allclose(accumulator.blocks[x].variance(), np.var(means[x], axis=0, ddof=1), rtol=0, atol=1e-12))
+
+    def test_chunks_merge_to_the_whole(self):
+        whole = accumulate_reads(self.campaign, BANDS, DEFAULT_PROFILE, 1, NUM_READS)
+        merged = accumulate_reads(self.campaign, BANDS, DEFAULT_PROFILE, 1, 2)
+        merged.merge(accumulate_reads(self.campaign, BANDS, DEFAULT_PROFILE, 3, NUM_READS))
+        self.assertEqual(merged.count, NUM_READS)
+        self.assertTrue(np.array_equal(merged.ones, whole.ones))
+        self.assertTrue(np.allclose(merged.bits.variance(), whole.bits.variance(), rtol=0, atol=1e-12))
+        for x in whole.grid_sizes:
+            self.assertTrue(np.allclose(merged.blocks[x].variance(), whole.blocks[x].variance(), rtol=0, atol=1e-12))
+
+
+if __name__ == '__main__':
+    unittest.main()